@@ -0,0 +1,109 @@
+"""
+Asyncio orchestration of many learning sessions at once.
+
+Each (spec, user_prompt) session is an ordinary `run_learning_session` loop,
+with its pre-validation, store write-through and convergence check, running
+on a thread pool while its scripts execute on the warm executor pool. While
+one session waits for the LLM, another's pytest run proceeds, so a suite's
+wall-clock scales with concurrency rather than with scenario count.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+from constraint_model import APIConstraintModel
+from constraint_store import SQLiteConstraintStore
+from executor import get_executor_pool
+from main import LearningSessionResult, run_learning_session, safe_constraint_model_initialization
+
+
+@dataclass
+class LearningSession:
+    spec_data: Dict[str, Any]
+    user_prompt: str
+    name: Optional[str] = None
+    max_attempts: int = 5
+
+
+class LearningOrchestrator:
+    """Drives many learning sessions concurrently against shared constraint models"""
+
+    def __init__(self, constraint_model: Optional[APIConstraintModel] = None,
+                 max_concurrency: Optional[int] = None, executor_workers: Optional[int] = None,
+                 constraint_store: Optional[SQLiteConstraintStore] = None, warm_start: bool = True):
+        self.constraint_model = constraint_model
+        self.max_concurrency = max_concurrency or int(os.getenv('ORCHESTRATOR_CONCURRENCY', '4'))
+        self.executor_workers = executor_workers
+        self.constraint_store = constraint_store
+        self.warm_start = warm_start
+        self._models: Dict[int, APIConstraintModel] = {}
+
+    def _model_for(self, spec_data: Dict[str, Any]) -> Optional[APIConstraintModel]:
+        """The shared model, or one model per distinct spec when none was given"""
+        if self.constraint_model is not None:
+            return self.constraint_model
+        key = id(spec_data)
+        if key not in self._models:
+            self._models[key] = safe_constraint_model_initialization(spec_data)
+        return self._models[key]
+
+    async def run(self, sessions: List[LearningSession]) -> List[Dict[str, Any]]:
+        """
+        Run every session and return their results in input order.
+
+        A session that raises is reported in its own result under 'error'
+        and does not affect the others.
+        """
+        loop = asyncio.get_running_loop()
+        # One pool per run, so the orchestrator can be run again afterwards
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='learning-session') as threads:
+            # Start the warm workers once, off the event loop
+            await loop.run_in_executor(threads, get_executor_pool, self.executor_workers)
+
+            return await asyncio.gather(*(
+                self._run_session(threads, index, session) for index, session in enumerate(sessions, 1)
+            ))
+
+    async def _run_session(self, threads: ThreadPoolExecutor, index: int,
+                           session: LearningSession) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        label = session.name or f"session-{index}"
+        try:
+            constraint_model = self._model_for(session.spec_data)
+            if constraint_model is None:
+                print(f"⚠️ [{label}] No constraint model available, skipping session")
+                result = LearningSessionResult(user_prompt=session.user_prompt, constraint_model=None,
+                                               error="Constraint model could not be initialized")
+            else:
+                result = await loop.run_in_executor(threads, lambda: run_learning_session(
+                    session.spec_data, session.user_prompt, session.max_attempts,
+                    constraint_model=constraint_model,
+                    session_tag=f"s{index}",
+                    constraint_store=self.constraint_store,
+                    warm_start=self.warm_start,
+                    executor_backend='pool'
+                ))
+        except Exception as e:
+            print(f"❌ [{label}] Session failed: {e}")
+            result = LearningSessionResult(user_prompt=session.user_prompt, constraint_model=None, error=str(e))
+
+        return {
+            'session': label,
+            'user_prompt': session.user_prompt,
+            'attempts': result.learning_attempts,
+            'successful_attempts': result.successful_attempts,
+            'converged': result.converged,
+            'duration': result.duration,
+            'constraint_model': result.constraint_model,
+            'error': result.error
+        }
+
+
+def run_learning_sessions(sessions: List[LearningSession], constraint_model: Optional[APIConstraintModel] = None,
+                          max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Synchronous entry point: run all sessions concurrently and wait for them"""
+    orchestrator = LearningOrchestrator(constraint_model=constraint_model, max_concurrency=max_concurrency)
+    return asyncio.run(orchestrator.run(sessions))
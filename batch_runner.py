@@ -0,0 +1,110 @@
+"""
+In-process batch execution of learning scenarios.
+
+Replaces the per-scenario `python main.py` launches in the test harnesses:
+each spec is parsed once, every scenario gets its own deep copy and
+constraint model, and results come back as LearningSessionResult objects
+instead of being read from learned_model.json. The first-attempt scripts of
+scenarios sharing a spec are generated up front in batched LLM requests and
+reach their sessions through the script cache.
+"""
+
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+from main import (
+    LearningSessionResult, load_spec_with_error_handling, load_default_spec, run_learning_session,
+    safe_constraint_model_initialization
+)
+from scribe import GENERATION_BATCH_SIZE, generate_test_scripts_batch
+from script_cache import script_cache
+
+
+@dataclass
+class Scenario:
+    spec_path: str
+    user_prompt: str
+    name: Optional[str] = None
+    max_attempts: Optional[int] = None
+
+
+def _as_scenario(item) -> Scenario:
+    if isinstance(item, Scenario):
+        return item
+    if isinstance(item, dict):
+        return Scenario(
+            spec_path=item['spec_path'],
+            user_prompt=item['user_prompt'],
+            name=item.get('name'),
+            max_attempts=item.get('max_attempts')
+        )
+    spec_path, user_prompt = item
+    return Scenario(spec_path=spec_path, user_prompt=user_prompt)
+
+
+def _prefetch_first_scripts(scenarios: List[Scenario], specs: Dict[str, Dict[str, Any]]):
+    """
+    Generate every scenario's first script in batched requests, per spec.
+
+    Each session starts from a fresh constraint model of its spec, so its
+    first generate_test_script call computes the same fingerprint and replays
+    the prefetched script from the script cache.
+    """
+    if GENERATION_BATCH_SIZE <= 1 or not script_cache.enabled or not os.getenv('GOOGLE_API_KEY'):
+        return
+
+    prompts: Dict[str, List[str]] = {}
+    for scenario in scenarios:
+        spec_prompts = prompts.setdefault(scenario.spec_path, [])
+        if scenario.user_prompt not in spec_prompts:
+            spec_prompts.append(scenario.user_prompt)
+
+    for spec_path, user_prompts in prompts.items():
+        if len(user_prompts) < 2:
+            continue
+        try:
+            spec_data = copy.deepcopy(specs[spec_path])
+            generate_test_scripts_batch(spec_data, user_prompts, safe_constraint_model_initialization(spec_data))
+        except Exception as e:
+            # Sessions generate their own scripts when prefetching fails
+            print(f"⚠️ Batched script prefetch failed for {spec_path}: {e}")
+
+
+def run_scenario_batch(scenarios: List[Any], parallelism: Optional[int] = None,
+                       max_attempts: int = 2) -> List[LearningSessionResult]:
+    """
+    Run every scenario's learning session and return results in input order.
+
+    Scenarios may be Scenario objects, dicts with spec_path/user_prompt keys,
+    or (spec_path, user_prompt) tuples. parallelism defaults to the
+    BATCH_PARALLELISM environment variable.
+    """
+    scenarios = [_as_scenario(item) for item in scenarios]
+    parallelism = parallelism or int(os.getenv('BATCH_PARALLELISM', '1'))
+
+    # Parse each distinct spec once
+    specs: Dict[str, Dict[str, Any]] = {}
+    for scenario in scenarios:
+        if scenario.spec_path not in specs:
+            specs[scenario.spec_path] = load_spec_with_error_handling(scenario.spec_path) or load_default_spec()
+    _prefetch_first_scripts(scenarios, specs)
+
+    def run(index: int, scenario: Scenario) -> LearningSessionResult:
+        try:
+            return run_learning_session(
+                copy.deepcopy(specs[scenario.spec_path]),
+                scenario.user_prompt,
+                scenario.max_attempts or max_attempts,
+                session_tag=f"b{index}" if parallelism > 1 else None
+            )
+        except Exception as e:
+            return LearningSessionResult(user_prompt=scenario.user_prompt, constraint_model=None, error=str(e))
+
+    if parallelism <= 1:
+        return [run(i, scenario) for i, scenario in enumerate(scenarios, 1)]
+
+    with ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix='scenario') as pool:
+        return list(pool.map(run, range(1, len(scenarios) + 1), scenarios))
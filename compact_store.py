@@ -0,0 +1,214 @@
+"""
+Columnar storage for large sets of learned constraints.
+
+LearnedConstraint objects cost several hundred bytes each once their
+datetime, lists and dicts are counted. CompactConstraintStore keeps bulk
+constraint sets as parallel typed arrays instead: constraint types become
+one-byte enum codes; endpoint and parameter names, descriptions and
+canonical-JSON formal constraints become ids into a shared string table; and
+the rarely-populated rule objects live in sparse side tables. Items are read
+back through ConstraintView, which exposes the same attribute API as
+LearnedConstraint.
+"""
+
+import json
+import math
+from array import array
+from datetime import datetime
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+
+from constraint_model import ConstraintType, LearnedConstraint
+
+CONSTRAINT_TYPES = list(ConstraintType)
+TYPE_CODES = {constraint_type: code for code, constraint_type in enumerate(CONSTRAINT_TYPES)}
+
+# Fields that are usually empty and are only stored when set
+SPARSE_FIELDS = ('conditional_rule', 'exclusivity_rule', 'format_dependency',
+                 'business_rule', 'rate_limit_rule', 'context_tags')
+SPARSE_DEFAULTS = {'context_tags': list}
+
+
+def _encode_formal(value: Optional[Dict[str, Any]]) -> str:
+    # Formal constraints are small and highly repetitive, so they share the
+    # string table as canonical JSON
+    return json.dumps(value or {}, sort_keys=True, default=str)
+
+
+def _timestamp(value: Optional[datetime]) -> float:
+    return value.timestamp() if value else math.nan
+
+
+def _datetime(value: float) -> Optional[datetime]:
+    return None if math.isnan(value) else datetime.fromtimestamp(value)
+
+
+class CompactConstraintStore:
+    """Append-only columnar store of learned constraints"""
+
+    def __init__(self, constraints: Iterable[LearnedConstraint] = ()):
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+        self._types = array('B')
+        self._endpoints = array('I')
+        self._parameters = array('I')
+        self._descriptions = array('I')
+        self._formal = array('I')
+        self._confidence = array('d')
+        self._success = array('I')
+        self._failure = array('I')
+        self._discovered_at = array('d')
+        self._last_validated = array('d')
+        self._sparse: Dict[str, Dict[int, Any]] = {name: {} for name in SPARSE_FIELDS}
+
+        self.extend(constraints)
+
+    def _string_id(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def append(self, constraint: LearnedConstraint) -> int:
+        """Store one constraint and return its index"""
+        index = len(self._types)
+        self._types.append(TYPE_CODES[constraint.constraint_type])
+        self._endpoints.append(self._string_id(constraint.endpoint_path))
+        self._parameters.append(self._string_id(constraint.affected_parameter))
+        self._descriptions.append(self._string_id(constraint.rule_description))
+        self._formal.append(self._string_id(_encode_formal(constraint.formal_constraint)))
+        self._confidence.append(constraint.confidence_score)
+        self._success.append(constraint.success_count)
+        self._failure.append(constraint.failure_count)
+        self._discovered_at.append(_timestamp(constraint.discovered_at))
+        self._last_validated.append(_timestamp(constraint.last_validated))
+
+        for name in SPARSE_FIELDS:
+            value = getattr(constraint, name)
+            if value:
+                self._sparse[name][index] = value
+        return index
+
+    def extend(self, constraints: Iterable[LearnedConstraint]):
+        for constraint in constraints:
+            self.append(constraint)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __getitem__(self, index: int) -> 'ConstraintView':
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ConstraintView(self, index)
+
+    def __iter__(self) -> Iterator['ConstraintView']:
+        for index in range(len(self)):
+            yield ConstraintView(self, index)
+
+    def to_constraint(self, index: int) -> LearnedConstraint:
+        """Materialize one stored constraint as a regular LearnedConstraint"""
+        view = self[index]
+        return LearnedConstraint(
+            constraint_type=view.constraint_type,
+            affected_parameter=view.affected_parameter,
+            endpoint_path=view.endpoint_path,
+            rule_description=view.rule_description,
+            formal_constraint=view.formal_constraint,
+            confidence_score=view.confidence_score,
+            success_count=view.success_count,
+            failure_count=view.failure_count,
+            conditional_rule=view.conditional_rule,
+            exclusivity_rule=view.exclusivity_rule,
+            format_dependency=view.format_dependency,
+            business_rule=view.business_rule,
+            rate_limit_rule=view.rate_limit_rule,
+            discovered_at=view.discovered_at,
+            last_validated=view.last_validated,
+            context_tags=view.context_tags
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            'constraints': len(self),
+            'distinct_strings': len(self._strings),
+            'sparse_entries': sum(len(values) for values in self._sparse.values())
+        }
+
+
+def _column_property(column: str, encode=None, decode=None):
+    def getter(view):
+        value = getattr(view._store, column)[view._index]
+        return decode(view._store, value) if decode else value
+
+    def setter(view, value):
+        getattr(view._store, column)[view._index] = encode(view._store, value) if encode else value
+
+    return property(getter, setter)
+
+
+def _sparse_property(name: str):
+    def getter(view):
+        values = view._store._sparse[name]
+        if view._index not in values and name in SPARSE_DEFAULTS:
+            # Materialize mutable defaults so in-place edits are kept
+            values[view._index] = SPARSE_DEFAULTS[name]()
+        return values.get(view._index)
+
+    def setter(view, value):
+        view._store._sparse[name][view._index] = value
+
+    return property(getter, setter)
+
+
+class ConstraintView:
+    """A LearnedConstraint-compatible window onto one row of a CompactConstraintStore"""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: CompactConstraintStore, index: int):
+        self._store = store
+        self._index = index
+
+    constraint_type = _column_property(
+        '_types', lambda store, value: TYPE_CODES[value], lambda store, code: CONSTRAINT_TYPES[code]
+    )
+    endpoint_path = _column_property(
+        '_endpoints', lambda store, value: store._string_id(value), lambda store, sid: store._strings[sid]
+    )
+    affected_parameter = _column_property(
+        '_parameters', lambda store, value: store._string_id(value), lambda store, sid: store._strings[sid]
+    )
+    rule_description = _column_property(
+        '_descriptions', lambda store, value: store._string_id(value), lambda store, sid: store._strings[sid]
+    )
+    # Decoded on every read: assign a new dict rather than editing it in place
+    formal_constraint = _column_property(
+        '_formal', lambda store, value: store._string_id(_encode_formal(value)),
+        lambda store, sid: json.loads(store._strings[sid])
+    )
+    confidence_score = _column_property('_confidence')
+    success_count = _column_property('_success')
+    failure_count = _column_property('_failure')
+    discovered_at = _column_property(
+        '_discovered_at', lambda store, value: _timestamp(value), lambda store, value: _datetime(value)
+    )
+    last_validated = _column_property(
+        '_last_validated', lambda store, value: _timestamp(value), lambda store, value: _datetime(value)
+    )
+
+    conditional_rule = _sparse_property('conditional_rule')
+    exclusivity_rule = _sparse_property('exclusivity_rule')
+    format_dependency = _sparse_property('format_dependency')
+    business_rule = _sparse_property('business_rule')
+    rate_limit_rule = _sparse_property('rate_limit_rule')
+    context_tags = _sparse_property('context_tags')
+
+    update_confidence = LearnedConstraint.update_confidence
+
+    def __repr__(self) -> str:
+        return (f"ConstraintView({self.constraint_type.value}, {self.endpoint_path!r}, "
+                f"{self.affected_parameter!r}, confidence={self.confidence_score:.2f})")
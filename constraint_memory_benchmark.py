@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Constraint Memory Benchmark
+Reports bytes per constraint for the original dict-backed dataclass layout,
+the slotted LearnedConstraint and the columnar CompactConstraintStore.
+
+Usage: python constraint_memory_benchmark.py [constraint_count]
+"""
+
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from compact_store import CompactConstraintStore
+from constraint_model import LearnedConstraint, ConstraintType, MutualExclusivityRule
+
+ENDPOINTS = [f"/api/v1/resource{i}" for i in range(300)]
+PARAMETERS = ['name', 'email', 'age', 'phone', 'country', 'plan', 'address', 'username']
+TYPES = list(ConstraintType)
+
+
+@dataclass
+class DictBackedExclusivityRule:
+    """MutualExclusivityRule as it was before slots"""
+    exclusive_fields: List[str]
+    min_required: int = 1
+    max_allowed: int = 1
+
+
+@dataclass
+class DictBackedConstraint:
+    """
+    LearnedConstraint as it was before slots: an independent plain dataclass
+    with a per-instance __dict__ and no string interning
+    """
+    constraint_type: ConstraintType
+    affected_parameter: str
+    endpoint_path: str
+    rule_description: str
+    formal_constraint: Dict[str, Any]
+    confidence_score: float = 1.0
+    success_count: int = 0
+    failure_count: int = 0
+    conditional_rule: Optional[Any] = None
+    exclusivity_rule: Optional[Any] = None
+    format_dependency: Optional[Any] = None
+    business_rule: Optional[Any] = None
+    rate_limit_rule: Optional[Any] = None
+    discovered_at: datetime = field(default_factory=datetime.now)
+    last_validated: Optional[datetime] = None
+    context_tags: List[str] = field(default_factory=list)
+
+
+def _make(cls, i: int, exclusivity_cls=MutualExclusivityRule):
+    # Build fresh strings per constraint, as parsing LLM responses does
+    endpoint = (ENDPOINTS[i % len(ENDPOINTS)] + '/')[:-1]
+    parameter = (PARAMETERS[i % len(PARAMETERS)] + '_')[:-1]
+    constraint = cls(
+        constraint_type=TYPES[i % len(TYPES)],
+        affected_parameter=parameter,
+        endpoint_path=endpoint,
+        rule_description=f"{parameter} is required for {endpoint}",
+        formal_constraint={'required': True},
+        confidence_score=0.9,
+        discovered_at=datetime.now()
+    )
+    if i % 10 == 0:
+        constraint.exclusivity_rule = exclusivity_cls([parameter, 'phone'])
+    return constraint
+
+
+def measure(build, count: int) -> float:
+    """Bytes allocated per constraint while building and holding `count` constraints"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    held = build(count)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return (after - before) / count
+
+
+def run_benchmark(count: int = 100000):
+    print("🧮 CONSTRAINT MEMORY BENCHMARK")
+    print("=" * 50)
+    print(f"Constraints per layout: {count:,}")
+
+    results = {
+        'dict-backed dataclass (before)': measure(
+            lambda n: [_make(DictBackedConstraint, i, DictBackedExclusivityRule) for i in range(n)], count
+        ),
+        'slotted + interned': measure(lambda n: [_make(LearnedConstraint, i) for i in range(n)], count),
+        'columnar store': measure(lambda n: CompactConstraintStore(_make(LearnedConstraint, i) for i in range(n)), count),
+    }
+
+    baseline = results['dict-backed dataclass (before)']
+    for layout, bytes_per_constraint in results.items():
+        print(f"   {layout:<32} {bytes_per_constraint:8.0f} bytes/constraint "
+              f"({bytes_per_constraint / baseline:.0%} of before)")
+    return results
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
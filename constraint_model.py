@@ -1,9 +1,12 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Set, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
+import copy
 import json
 import yaml
 import re
+import sys
+import threading
 from datetime import datetime, timedelta
 
 class ConstraintType(Enum):
@@ -16,7 +19,7 @@ class ConstraintType(Enum):
     RATE_LIMITING = "rate_limiting"                      # NEW
     VALUE_CONSTRAINT = "value_constraint"
 
-@dataclass
+@dataclass(slots=True)
 class ConditionalRule:
     """Represents conditional logic: if condition then requirement"""
     condition_field: str
@@ -25,14 +28,14 @@ class ConditionalRule:
     required_field: str
     required_value: Optional[Union[str, int, float, bool]] = None
 
-@dataclass
+@dataclass(slots=True)
 class MutualExclusivityRule:
     """Represents mutual exclusivity: only one of these fields can be present"""
     exclusive_fields: List[str]
     min_required: int = 1  # At least this many must be present
     max_allowed: int = 1   # At most this many can be present
 
-@dataclass
+@dataclass(slots=True)
 class FormatDependencyRule:
     """Represents format that depends on another field's value"""
     dependent_field: str
@@ -40,7 +43,7 @@ class FormatDependencyRule:
     dependency_value: Union[str, int, float, bool]
     required_format: str  # "email", "url", "uuid", "date", "phone", etc.
 
-@dataclass
+@dataclass(slots=True)
 class BusinessRule:
     """Represents business logic constraints"""
     field: str
@@ -48,7 +51,7 @@ class BusinessRule:
     constraint_value: Union[str, int, float, Dict[str, Any]]
     error_message: str
 
-@dataclass
+@dataclass(slots=True)
 class RateLimitRule:
     """Represents rate limiting constraints"""
     endpoint_pattern: str
@@ -56,7 +59,7 @@ class RateLimitRule:
     time_window_seconds: int
     scope: str = "per_user"  # "per_user", "per_ip", "global"
 
-@dataclass
+@dataclass(slots=True)
 class LearnedConstraint:
     constraint_type: ConstraintType
     affected_parameter: str
@@ -79,6 +82,13 @@ class LearnedConstraint:
     last_validated: Optional[datetime] = None
     context_tags: List[str] = field(default_factory=list)
     
+    def __post_init__(self):
+        # Endpoint and parameter names repeat across thousands of constraints
+        if type(self.endpoint_path) is str:
+            self.endpoint_path = sys.intern(self.endpoint_path)
+        if type(self.affected_parameter) is str:
+            self.affected_parameter = sys.intern(self.affected_parameter)
+    
     def update_confidence(self, success: bool):
         if success:
             self.success_count += 1
@@ -101,14 +111,79 @@ class APIConstraintModel:
         self.conditional_dependencies: Dict[str, List[str]] = {}  # field -> list of dependent constraints
         self.format_dependencies: Dict[str, List[str]] = {}
         self.business_rules_index: Dict[str, List[str]] = {}  # field -> business rules
+        self.field_index: Dict[str, Dict[str, List[str]]] = {}  # field -> endpoint -> related constraints
         
         # Rate limiting tracking
         self.rate_limit_tracker: Dict[str, Dict[str, Any]] = {}
         
+        # Guards the model when concurrent learning sessions share it
+        self._lock = threading.RLock()
+        
+        # Copy-on-write overlays: endpoint -> (applied constraint ids, enhanced path item).
+        # Only path items with applied constraints are copied; the rest of the
+        # enhanced schema shares nodes with base_spec.
+        self._path_overlays: Dict[str, Any] = {}
+        self._schema_cache: Dict[Optional[str], Dict[str, Any]] = {}
+        
+        # Optional durable store (see constraint_store.SQLiteConstraintStore) and the
+        # ids of constraints changed since they were last written to it
+        self._store = None
+        self._dirty: Set[str] = set()
+        
     def add_constraint(self, constraint: LearnedConstraint) -> str:
-        """Add a learned constraint with enhanced indexing"""
-        constraint_id = self._generate_constraint_id(constraint)
+        """Add a learned constraint with enhanced indexing, merging it into an existing identical rule"""
+        return self.upsert_constraint(constraint)[0]
+    
+    def upsert_constraint(self, constraint: LearnedConstraint, merge: bool = True) -> Tuple[str, bool]:
+        """
+        Insert a constraint, or fold it into the one already stored under its id.
+        
+        With merge=False an existing constraint is replaced instead. Returns
+        (constraint_id, created).
+        """
+        with self._lock:
+            constraint_id = self._generate_constraint_id(constraint)
+            created = constraint_id not in self.learned_constraints
+            if created:
+                self._add_constraint(constraint_id, constraint)
+            elif merge:
+                self._merge_constraint(constraint_id, constraint)
+            else:
+                self._remove_constraint(constraint_id)
+                self._add_constraint(constraint_id, constraint)
+            self._persist(constraint_id)
+            return constraint_id, created
+    
+    def merge_constraint(self, constraint_id: str, other: LearnedConstraint) -> LearnedConstraint:
+        """Merge another observation of a stored rule into it"""
+        with self._lock:
+            merged = self._merge_constraint(constraint_id, other)
+            self._persist(constraint_id)
+            return merged
+    
+    def _merge_constraint(self, constraint_id: str, other: LearnedConstraint) -> LearnedConstraint:
+        existing = self.learned_constraints[constraint_id]
+        self._dirty.add(constraint_id)
+        was_applied = existing.confidence_score > 0.7
+        
+        existing.success_count += other.success_count
+        existing.failure_count += other.failure_count
+        total_attempts = existing.success_count + existing.failure_count
+        if total_attempts > 0:
+            existing.confidence_score = existing.success_count / total_attempts
+        else:
+            # Re-learning the same rule corroborates it
+            existing.confidence_score = max(existing.confidence_score, other.confidence_score)
+        existing.last_validated = datetime.now()
+        for tag in other.context_tags:
+            if tag not in existing.context_tags:
+                existing.context_tags.append(tag)
         
+        if (existing.confidence_score > 0.7) != was_applied:
+            self._invalidate_endpoint(existing.endpoint_path)
+        return existing
+    
+    def _add_constraint(self, constraint_id: str, constraint: LearnedConstraint) -> str:
         # Store the constraint
         self.learned_constraints[constraint_id] = constraint
         
@@ -124,9 +199,105 @@ class APIConstraintModel:
         
         # Update specialized indexes
         self._update_specialized_indexes(constraint_id, constraint)
+        self._index_fields(constraint_id, constraint)
         
+        self._invalidate_endpoint(constraint.endpoint_path)
         return constraint_id
     
+    def update_confidence(self, constraint_id: str, success: bool):
+        """Record a validation outcome, refreshing the enhanced schema if the constraint crossed the threshold"""
+        with self._lock:
+            constraint = self.learned_constraints[constraint_id]
+            was_applied = constraint.confidence_score > 0.7
+            constraint.update_confidence(success)
+            if (constraint.confidence_score > 0.7) != was_applied:
+                self._invalidate_endpoint(constraint.endpoint_path)
+            self._persist(constraint_id)
+    
+    def remove_constraint(self, constraint_id: str) -> Optional[LearnedConstraint]:
+        """Remove a learned constraint and drop it from every index"""
+        with self._lock:
+            constraint = self._remove_constraint(constraint_id)
+            self._dirty.discard(constraint_id)
+            if constraint is not None and self._store is not None:
+                try:
+                    self._store.delete(constraint_id)
+                except Exception as e:
+                    print(f"⚠️ Could not delete stored constraint {constraint_id}: {e}")
+            return constraint
+    
+    def attach_store(self, store, load: bool = True) -> int:
+        """
+        Persist every future change to `store`, first loading the constraints
+        it already holds when `load` is set. Only constraints learned or
+        changed since they were last stored are written, so re-attaching a
+        store (one session after another) does not rewrite it. Returns the
+        number loaded.
+        """
+        with self._lock:
+            loaded = 0
+            if load:
+                for constraint_id, constraint in store.load_all().items():
+                    if constraint_id not in self.learned_constraints:
+                        self._add_constraint(constraint_id, constraint)
+                        loaded += 1
+            
+            self._store = store
+            # Constraints learned or changed while no store was attached
+            self._flush()
+            return loaded
+    
+    def _persist(self, constraint_id: str):
+        """Mark one constraint changed and write it through to the attached store, if any"""
+        self._dirty.add(constraint_id)
+        self._flush()
+    
+    def _flush(self):
+        """Write every changed constraint to the attached store; failed writes stay pending"""
+        if self._store is None:
+            return
+        for constraint_id in list(self._dirty):
+            constraint = self.learned_constraints.get(constraint_id)
+            if constraint is not None:
+                try:
+                    self._store.save(constraint_id, constraint)
+                except Exception as e:
+                    print(f"⚠️ Could not persist constraint {constraint_id}: {e}")
+                    continue
+            self._dirty.discard(constraint_id)
+    
+    def _remove_constraint(self, constraint_id: str) -> Optional[LearnedConstraint]:
+        constraint = self.learned_constraints.pop(constraint_id, None)
+        if constraint is None:
+            return None
+        
+        self._remove_from_index(self.endpoint_rules, constraint.endpoint_path, constraint_id)
+        self._remove_from_index(self.constraints_by_type, constraint.constraint_type, constraint_id)
+        if constraint.conditional_rule:
+            self._remove_from_index(self.conditional_dependencies, constraint.conditional_rule.condition_field, constraint_id)
+        if constraint.format_dependency:
+            self._remove_from_index(self.format_dependencies, constraint.format_dependency.dependency_field, constraint_id)
+        if constraint.business_rule:
+            self._remove_from_index(self.business_rules_index, constraint.business_rule.field, constraint_id)
+        self._unindex_fields(constraint_id, constraint)
+        
+        self._invalidate_endpoint(constraint.endpoint_path)
+        return constraint
+    
+    @staticmethod
+    def _remove_from_index(index: Dict[Any, List[str]], key: Any, constraint_id: str):
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids[:] = [existing for existing in ids if existing != constraint_id]
+        if not ids:
+            del index[key]
+    
+    def _invalidate_endpoint(self, endpoint_path: str):
+        self._path_overlays.pop(endpoint_path, None)
+        self._schema_cache.pop(endpoint_path, None)
+        self._schema_cache.pop(None, None)
+    
     def _generate_constraint_id(self, constraint: LearnedConstraint) -> str:
         """Generate unique constraint ID"""
         base_id = f"{constraint.endpoint_path}_{constraint.affected_parameter}_{constraint.constraint_type.value}"
@@ -165,71 +336,113 @@ class APIConstraintModel:
                 self.business_rules_index[field] = []
             self.business_rules_index[field].append(constraint_id)
     
+    @staticmethod
+    def _related_fields(constraint: LearnedConstraint) -> List[str]:
+        """Every field a constraint mentions, as matched by get_related_constraints"""
+        fields = [constraint.affected_parameter]
+        if constraint.conditional_rule:
+            fields += [constraint.conditional_rule.condition_field, constraint.conditional_rule.required_field]
+        if constraint.format_dependency:
+            fields += [constraint.format_dependency.dependent_field, constraint.format_dependency.dependency_field]
+        if constraint.exclusivity_rule:
+            fields += constraint.exclusivity_rule.exclusive_fields
+        return list(dict.fromkeys(fields))
+    
+    def _index_fields(self, constraint_id: str, constraint: LearnedConstraint):
+        for field_name in self._related_fields(constraint):
+            ids = self.field_index.setdefault(field_name, {}).setdefault(constraint.endpoint_path, [])
+            if constraint_id not in ids:
+                ids.append(constraint_id)
+    
+    def _unindex_fields(self, constraint_id: str, constraint: LearnedConstraint):
+        for field_name in self._related_fields(constraint):
+            by_endpoint = self.field_index.get(field_name)
+            if by_endpoint is None:
+                continue
+            self._remove_from_index(by_endpoint, constraint.endpoint_path, constraint_id)
+            if not by_endpoint:
+                del self.field_index[field_name]
+    
     def get_enhanced_schema(self, endpoint_path: str = None) -> Dict[str, Any]:
-        """Return spec enhanced with learned constraints"""
-        enhanced_spec = self.base_spec.copy()
+        """
+        Return spec enhanced with learned constraints.
+        
+        The result is memoized and shares unmodified nodes with base_spec,
+        so callers must treat it as read-only.
+        """
+        with self._lock:
+            if endpoint_path not in self._schema_cache:
+                self._schema_cache[endpoint_path] = self._build_enhanced_schema(endpoint_path)
+            return self._schema_cache[endpoint_path]
+    
+    def _build_enhanced_schema(self, endpoint_path: str = None) -> Dict[str, Any]:
+        enhanced_spec = dict(self.base_spec)
         
         # Add learned rules to the spec
-        if 'x-learned-rules' not in enhanced_spec:
-            enhanced_spec['x-learned-rules'] = {}
+        enhanced_spec['x-learned-rules'] = dict(enhanced_spec.get('x-learned-rules') or {})
         
-        # Get constraints to apply
-        constraints_to_apply = []
-        if endpoint_path:
-            constraints_to_apply = self.endpoint_rules.get(endpoint_path, [])
-        else:
-            constraints_to_apply = list(self.learned_constraints.keys())
+        base_paths = self.base_spec.get('paths') or {}
+        endpoints = [endpoint_path] if endpoint_path else list(self.endpoint_rules.keys())
         
-        # Apply high-confidence constraints
-        for constraint_id in constraints_to_apply:
-            constraint = self.learned_constraints[constraint_id]
-            if constraint.confidence_score > 0.7:
-                self._apply_constraint_to_spec(enhanced_spec, constraint)
+        enhanced_paths = None
+        for endpoint in endpoints:
+            if endpoint not in base_paths:
+                continue
+            overlay = self._get_path_overlay(endpoint)
+            if overlay is not None:
+                if enhanced_paths is None:
+                    enhanced_paths = dict(base_paths)
+                enhanced_paths[endpoint] = overlay
+        
+        if enhanced_paths is not None:
+            enhanced_spec['paths'] = enhanced_paths
         
         return enhanced_spec
     
-    def get_related_constraints(self, field_name: str, endpoint_path: str = None) -> List[LearnedConstraint]:
-        """Get all constraints related to a specific field"""
-        related_constraints = []
+    def _get_path_overlay(self, endpoint_path: str) -> Optional[Dict[str, Any]]:
+        """Copy of one path item with its high-confidence constraints applied, or None if none apply"""
+        # Apply high-confidence constraints
+        applied = tuple(
+            constraint_id for constraint_id in self.endpoint_rules.get(endpoint_path, [])
+            if self.learned_constraints[constraint_id].confidence_score > 0.7
+        )
+        cached = self._path_overlays.get(endpoint_path)
+        if cached and cached[0] == applied:
+            return cached[1]
         
-        for constraint_id, constraint in self.learned_constraints.items():
-            if endpoint_path and constraint.endpoint_path != endpoint_path:
-                continue
-            
-            # Direct field match
-            if constraint.affected_parameter == field_name:
-                related_constraints.append(constraint)
-            
-            # Conditional dependencies
-            if (constraint.conditional_rule and 
-                (constraint.conditional_rule.condition_field == field_name or 
-                 constraint.conditional_rule.required_field == field_name)):
-                related_constraints.append(constraint)
-            
-            # Format dependencies
-            if (constraint.format_dependency and
-                (constraint.format_dependency.dependent_field == field_name or
-                 constraint.format_dependency.dependency_field == field_name)):
-                related_constraints.append(constraint)
-            
-            # Mutual exclusivity
-            if (constraint.exclusivity_rule and
-                field_name in constraint.exclusivity_rule.exclusive_fields):
-                related_constraints.append(constraint)
+        overlay = None
+        if applied:
+            overlay = copy.deepcopy(self.base_spec['paths'][endpoint_path])
+            for constraint_id in applied:
+                self._apply_constraint_to_path_item(overlay, self.learned_constraints[constraint_id])
         
-        return related_constraints
+        self._path_overlays[endpoint_path] = (applied, overlay)
+        return overlay
+    
+    def get_related_constraints(self, field_name: str, endpoint_path: str = None) -> List[LearnedConstraint]:
+        """Get all constraints related to a specific field"""
+        with self._lock:
+            by_endpoint = self.field_index.get(field_name, {})
+            if endpoint_path:
+                constraint_ids = by_endpoint.get(endpoint_path, [])
+            else:
+                constraint_ids = [cid for ids in by_endpoint.values() for cid in ids]
+            return [self.learned_constraints[cid] for cid in constraint_ids]
+    
     def _apply_constraint_to_spec(self, spec: Dict[str, Any], constraint: LearnedConstraint):
         """Apply a learned constraint to the OpenAPI spec"""
+        paths = spec.get('paths', {})
+        if constraint.endpoint_path in paths:
+            self._apply_constraint_to_path_item(paths[constraint.endpoint_path], constraint)
+    
+    def _apply_constraint_to_path_item(self, path_item: Dict[str, Any], constraint: LearnedConstraint):
+        """Apply a learned constraint to every operation of one path item"""
         try:
-            paths = spec.get('paths', {})
-            if constraint.endpoint_path not in paths:
-                return
-            
-            for method in paths[constraint.endpoint_path]:
+            for method in path_item:
                 if method not in ['get', 'post', 'put', 'patch', 'delete']:
                     continue
                 
-                operation = paths[constraint.endpoint_path][method]
+                operation = path_item[method]
                 
                 # Apply different constraint types
                 if constraint.constraint_type == ConstraintType.REQUIRED_FIELD:
@@ -0,0 +1,137 @@
+"""
+Durable storage for learned constraints.
+
+Constraints are kept in a SQLite database, one row per (namespace,
+constraint_id), so an APIConstraintModel can be reloaded at startup and each
+change is written as a single-row upsert instead of rewriting the whole
+model. Namespaces keep models for different specs apart.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from constraint_model import (
+    LearnedConstraint, ConstraintType, ConditionalRule, MutualExclusivityRule,
+    FormatDependencyRule, BusinessRule, RateLimitRule
+)
+
+RULE_CLASSES = {
+    'conditional_rule': ConditionalRule,
+    'exclusivity_rule': MutualExclusivityRule,
+    'format_dependency': FormatDependencyRule,
+    'business_rule': BusinessRule,
+    'rate_limit_rule': RateLimitRule,
+}
+
+
+def constraint_to_dict(constraint: LearnedConstraint) -> Dict[str, Any]:
+    """JSON-safe representation of a constraint, rule sub-objects included"""
+    data = {
+        'rule_description': constraint.rule_description,
+        'constraint_type': constraint.constraint_type.value,
+        'affected_parameter': constraint.affected_parameter,
+        'endpoint_path': constraint.endpoint_path,
+        'confidence_score': constraint.confidence_score,
+        'success_count': constraint.success_count,
+        'failure_count': constraint.failure_count,
+        'formal_constraint': constraint.formal_constraint,
+        'discovered_at': constraint.discovered_at.isoformat() if constraint.discovered_at else None,
+        'last_validated': constraint.last_validated.isoformat() if constraint.last_validated else None,
+        'context_tags': list(constraint.context_tags),
+    }
+    for name in RULE_CLASSES:
+        rule = getattr(constraint, name)
+        data[name] = asdict(rule) if rule is not None else None
+    return data
+
+
+def constraint_from_dict(data: Dict[str, Any]) -> LearnedConstraint:
+    """Inverse of constraint_to_dict"""
+    constraint = LearnedConstraint(
+        constraint_type=ConstraintType(data['constraint_type']),
+        affected_parameter=data['affected_parameter'],
+        endpoint_path=data['endpoint_path'],
+        rule_description=data['rule_description'],
+        formal_constraint=data.get('formal_constraint') or {},
+        confidence_score=data.get('confidence_score', 1.0),
+        success_count=data.get('success_count', 0),
+        failure_count=data.get('failure_count', 0),
+        context_tags=list(data.get('context_tags') or [])
+    )
+    if data.get('discovered_at'):
+        constraint.discovered_at = datetime.fromisoformat(data['discovered_at'])
+    if data.get('last_validated'):
+        constraint.last_validated = datetime.fromisoformat(data['last_validated'])
+    for name, rule_class in RULE_CLASSES.items():
+        if data.get(name):
+            setattr(constraint, name, rule_class(**data[name]))
+    return constraint
+
+
+class SQLiteConstraintStore:
+    """Row-per-constraint SQLite store, safe to share between threads"""
+
+    def __init__(self, db_path: Optional[str] = None, namespace: str = 'default'):
+        self.db_path = db_path or os.getenv('CONSTRAINT_STORE_PATH', 'learned_constraints.db')
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS constraints ('
+            ' namespace TEXT NOT NULL,'
+            ' constraint_id TEXT NOT NULL,'
+            ' data TEXT NOT NULL,'
+            ' updated_at REAL NOT NULL,'
+            ' PRIMARY KEY (namespace, constraint_id))'
+        )
+
+    def save(self, constraint_id: str, constraint: LearnedConstraint):
+        """Insert or update one constraint"""
+        data = json.dumps(constraint_to_dict(constraint), default=str)
+        with self._lock:
+            self._connection.execute(
+                'INSERT INTO constraints (namespace, constraint_id, data, updated_at) VALUES (?, ?, ?, ?)'
+                ' ON CONFLICT (namespace, constraint_id) DO UPDATE SET data = excluded.data,'
+                ' updated_at = excluded.updated_at',
+                (self.namespace, constraint_id, data, time.time())
+            )
+
+    def delete(self, constraint_id: str):
+        with self._lock:
+            self._connection.execute(
+                'DELETE FROM constraints WHERE namespace = ? AND constraint_id = ?',
+                (self.namespace, constraint_id)
+            )
+
+    def load_all(self) -> Dict[str, LearnedConstraint]:
+        """Every constraint in this namespace, in the order first stored"""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT constraint_id, data FROM constraints WHERE namespace = ? ORDER BY rowid',
+                (self.namespace,)
+            ).fetchall()
+
+        constraints = {}
+        for constraint_id, data in rows:
+            try:
+                constraints[constraint_id] = constraint_from_dict(json.loads(data))
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"⚠️ Skipping unreadable stored constraint {constraint_id}: {e}")
+        return constraints
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM constraints WHERE namespace = ?', (self.namespace,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,301 @@
+"""
+Local evaluation of learned constraints against candidate request bodies.
+
+The rule objects on LearnedConstraint (ConditionalRule, MutualExclusivityRule,
+FormatDependencyRule, BusinessRule) plus the formal constraints of required
+field, format and value rules are compiled into small check functions. A
+request body that breaks a known rule can then be rejected before it costs
+an execution and an interpretation call.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, List, Optional, Tuple
+
+from constraint_model import APIConstraintModel, ConstraintType, LearnedConstraint
+
+# Same threshold the enhanced schema and prompt context use for "active" rules
+MIN_CONFIDENCE = 0.7
+
+FORMAT_PATTERNS = {
+    'email': re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'),
+    'url': re.compile(r'^https?://[^\s/$.?#].[^\s]*$', re.IGNORECASE),
+    'uri': re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*:[^\s]*$'),
+    'uuid': re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$'),
+    'date': re.compile(r'^\d{4}-\d{2}-\d{2}$'),
+    'date-time': re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?$'),
+    'phone': re.compile(r'^\+?[\d\s().-]{7,20}$'),
+}
+
+JSON_TYPES = {
+    'string': str,
+    'integer': int,
+    'number': (int, float),
+    'boolean': bool,
+    'array': list,
+    'object': dict,
+}
+
+Check = Callable[[Dict[str, Any]], Optional[str]]
+
+
+@dataclass
+class ConstraintViolation:
+    constraint_id: str
+    field: str
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.field}: {self.message}"
+
+
+def _same_value(actual: Any, expected: Any) -> bool:
+    """Rule values are often learned as strings ("true", "18"), so compare loosely"""
+    return actual == expected or str(actual).lower() == str(expected).lower()
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_error(value: Any, required_format: str) -> Optional[str]:
+    pattern = FORMAT_PATTERNS.get(str(required_format).lower())
+    if pattern is None:
+        return None  # Unknown formats are only checked for presence
+    if not isinstance(value, str) or not pattern.match(value):
+        return f"must be a valid {required_format}"
+    return None
+
+
+def _condition_holds(value: Any, operator: str, expected: Any) -> bool:
+    if operator == 'not_equals':
+        return not _same_value(value, expected)
+    if operator in ('greater_than', 'less_than'):
+        actual, bound = _as_number(value), _as_number(expected)
+        if actual is None or bound is None:
+            return False
+        return actual > bound if operator == 'greater_than' else actual < bound
+    if operator == 'contains':
+        return isinstance(value, (str, list)) and expected in value
+    return _same_value(value, expected)
+
+
+def _compile_required(constraint: LearnedConstraint) -> Optional[Check]:
+    field_name = constraint.affected_parameter
+    if constraint.formal_constraint.get('required') is False:
+        return None
+
+    def check(body):
+        if field_name not in body:
+            return "is required"
+        return None
+    return check
+
+
+def _compile_conditional(constraint: LearnedConstraint) -> Optional[Check]:
+    rule = constraint.conditional_rule
+    if rule is None:
+        return None
+
+    def check(body):
+        if rule.condition_field not in body:
+            return None
+        if not _condition_holds(body[rule.condition_field], rule.condition_operator, rule.condition_value):
+            return None
+        if rule.required_field not in body:
+            return f"is required when {rule.condition_field} is {rule.condition_value!r}"
+        if rule.required_value is not None and not _same_value(body[rule.required_field], rule.required_value):
+            return f"must be {rule.required_value!r} when {rule.condition_field} is {rule.condition_value!r}"
+        return None
+    return check
+
+
+def _compile_exclusivity(constraint: LearnedConstraint) -> Optional[Check]:
+    rule = constraint.exclusivity_rule
+    if rule is None:
+        return None
+
+    def check(body):
+        present = [field_name for field_name in rule.exclusive_fields if body.get(field_name) is not None]
+        if len(present) < rule.min_required:
+            return f"at least {rule.min_required} of {rule.exclusive_fields} must be provided"
+        if len(present) > rule.max_allowed:
+            return f"at most {rule.max_allowed} of {rule.exclusive_fields} may be provided, got {present}"
+        return None
+    return check
+
+
+def _compile_format_dependency(constraint: LearnedConstraint) -> Optional[Check]:
+    rule = constraint.format_dependency
+    if rule is None:
+        return None
+
+    def check(body):
+        if not _same_value(body.get(rule.dependency_field), rule.dependency_value):
+            return None
+        if rule.dependent_field not in body:
+            return f"is required when {rule.dependency_field} is {rule.dependency_value!r}"
+        return _format_error(body[rule.dependent_field], rule.required_format)
+    return check
+
+
+def _compile_format(constraint: LearnedConstraint) -> Optional[Check]:
+    field_name = constraint.affected_parameter
+    required_format = constraint.formal_constraint.get('format')
+    if not required_format:
+        return None
+
+    def check(body):
+        if field_name not in body:
+            return None
+        return _format_error(body[field_name], required_format)
+    return check
+
+
+def _bounds_check(field_name: str, bounds: Dict[str, Any]) -> Optional[Check]:
+    """Check for minimum/maximum/exclusive bounds, length limits, type and enum"""
+    bounds = {key: value for key, value in bounds.items() if value is not None}
+    known = {'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum',
+             'minLength', 'maxLength', 'type', 'enum', 'pattern'}
+    if not known & set(bounds):
+        return None
+    pattern = re.compile(bounds['pattern']) if isinstance(bounds.get('pattern'), str) else None
+
+    def check(body):
+        if field_name not in body:
+            return None
+        value = body[field_name]
+        expected_type = JSON_TYPES.get(bounds.get('type'))
+        if expected_type and (not isinstance(value, expected_type) or
+                              (isinstance(value, bool) and bounds['type'] != 'boolean')):
+            return f"must be of type {bounds['type']}"
+        if 'enum' in bounds and value not in bounds['enum']:
+            return f"must be one of {bounds['enum']}"
+
+        number = _as_number(value) if not isinstance(value, str) else None
+        if number is not None:
+            if 'minimum' in bounds and number < bounds['minimum']:
+                return f"must be at least {bounds['minimum']}"
+            if 'exclusiveMinimum' in bounds and number <= bounds['exclusiveMinimum']:
+                return f"must be greater than {bounds['exclusiveMinimum']}"
+            if 'maximum' in bounds and number > bounds['maximum']:
+                return f"must be at most {bounds['maximum']}"
+            if 'exclusiveMaximum' in bounds and number >= bounds['exclusiveMaximum']:
+                return f"must be less than {bounds['exclusiveMaximum']}"
+        if isinstance(value, str):
+            if 'minLength' in bounds and len(value) < bounds['minLength']:
+                return f"must be at least {bounds['minLength']} characters"
+            if 'maxLength' in bounds and len(value) > bounds['maxLength']:
+                return f"must be at most {bounds['maxLength']} characters"
+            if pattern and not pattern.search(value):
+                return f"must match {bounds['pattern']}"
+        return None
+    return check
+
+
+def _compile_business(constraint: LearnedConstraint) -> Optional[Check]:
+    rule = constraint.business_rule
+    if rule is None:
+        return _bounds_check(constraint.affected_parameter, constraint.formal_constraint)
+
+    if rule.rule_type == 'min_value':
+        bounds = {'minimum': _as_number(rule.constraint_value)}
+    elif rule.rule_type == 'max_value':
+        bounds = {'maximum': _as_number(rule.constraint_value)}
+    elif rule.rule_type == 'range' and isinstance(rule.constraint_value, dict):
+        bounds = {'minimum': _as_number(rule.constraint_value.get('min')),
+                  'maximum': _as_number(rule.constraint_value.get('max'))}
+    elif rule.rule_type == 'pattern' and isinstance(rule.constraint_value, str):
+        bounds = {'pattern': rule.constraint_value}
+    else:
+        return None
+    # Learned "greater than" rules keep their exclusive bound in the formal constraint
+    for key in ('exclusiveMinimum', 'exclusiveMaximum'):
+        if key in constraint.formal_constraint:
+            bounds = {key: constraint.formal_constraint[key]}
+    return _bounds_check(rule.field, bounds)
+
+
+COMPILERS: Dict[ConstraintType, Callable[[LearnedConstraint], Optional[Check]]] = {
+    ConstraintType.REQUIRED_FIELD: _compile_required,
+    ConstraintType.CONDITIONAL_REQUIREMENT: _compile_conditional,
+    ConstraintType.MUTUAL_EXCLUSIVITY: _compile_exclusivity,
+    ConstraintType.FORMAT_DEPENDENCY: _compile_format_dependency,
+    ConstraintType.FORMAT_VALIDATION: _compile_format,
+    ConstraintType.BUSINESS_RULE: _compile_business,
+    ConstraintType.VALUE_CONSTRAINT: lambda c: _bounds_check(c.affected_parameter, c.formal_constraint),
+}
+
+
+def _path_pattern(endpoint_path: str) -> re.Pattern:
+    """/users/{id} matches /users/42 as well as itself"""
+    parts = re.split(r'(\{[^}/]+\})', endpoint_path.rstrip('/') or '/')
+    regex = ''.join('[^/]+' if part.startswith('{') else re.escape(part) for part in parts)
+    return re.compile(f'^{regex}/?$')
+
+
+class ConstraintValidator:
+    """
+    Checks request bodies against the active learned constraints of a model.
+
+    Each constraint is compiled once into a check function; a constraint that
+    is replaced in the model is recompiled on the next validation.
+    """
+
+    def __init__(self, constraint_model: APIConstraintModel, min_confidence: float = MIN_CONFIDENCE):
+        self.constraint_model = constraint_model
+        self.min_confidence = min_confidence
+        self._checks: Dict[str, Tuple[LearnedConstraint, Optional[Check]]] = {}
+        self._path_patterns: Dict[str, re.Pattern] = {}
+
+    def _check_for(self, constraint_id: str, constraint: LearnedConstraint) -> Optional[Check]:
+        cached = self._checks.get(constraint_id)
+        if cached is None or cached[0] is not constraint:
+            compiler = COMPILERS.get(constraint.constraint_type)
+            cached = (constraint, compiler(constraint) if compiler else None)
+            self._checks[constraint_id] = cached
+        return cached[1]
+
+    def _endpoint_constraint_ids(self, endpoint_path: str) -> List[str]:
+        constraint_ids = []
+        for template, ids in list(self.constraint_model.endpoint_rules.items()):
+            pattern = self._path_patterns.get(template)
+            if pattern is None:
+                pattern = self._path_patterns[template] = _path_pattern(template)
+            if template == endpoint_path or pattern.match(endpoint_path):
+                constraint_ids.extend(ids)
+        return constraint_ids
+
+    def active_constraints(self, endpoint_path: str) -> List[Tuple[str, LearnedConstraint]]:
+        """(id, constraint) pairs above the confidence threshold that apply to an endpoint"""
+        constraints = self.constraint_model.learned_constraints
+        active = []
+        for constraint_id in self._endpoint_constraint_ids(endpoint_path):
+            constraint = constraints.get(constraint_id)
+            if constraint is not None and constraint.confidence_score > self.min_confidence:
+                active.append((constraint_id, constraint))
+        return active
+
+    def validate(self, endpoint_path: str, body: Any) -> List[ConstraintViolation]:
+        """Return every active constraint for the endpoint that the body breaks"""
+        if not isinstance(body, dict):
+            return []
+
+        violations = []
+        for constraint_id, constraint in self.active_constraints(endpoint_path):
+            check = self._check_for(constraint_id, constraint)
+            message = check(body) if check else None
+            if message:
+                violations.append(ConstraintViolation(constraint_id, constraint.affected_parameter, message))
+        return violations
+
+
+def validate_request_body(constraint_model: APIConstraintModel, endpoint_path: str,
+                          body: Any) -> List[ConstraintViolation]:
+    """Check one request body against a model's learned constraints"""
+    return ConstraintValidator(constraint_model).validate(endpoint_path, body)
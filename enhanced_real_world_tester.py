@@ -4,12 +4,9 @@ Enhanced Real-World API Testing with Multiple Public APIs
 Tests Echidna against various real APIs with different constraint patterns
 """
 
-import os
 import json
 import time
 import requests
-import subprocess
-import sys
 from datetime import datetime
 
 class EnhancedRealWorldTester:
@@ -265,90 +262,38 @@ paths:
     
     def _run_api_tests(self, api_name, spec_file, scenarios):
         """Run tests for a specific API"""
+        from batch_runner import Scenario, run_scenario_batch
+        
+        sessions = run_scenario_batch(
+            [Scenario(spec_file, scenario['prompt']) for scenario in scenarios], max_attempts=1
+        )
+        
         results = []
         
-        for i, scenario in enumerate(scenarios, 1):
+        for i, (scenario, session) in enumerate(zip(scenarios, sessions), 1):
             print(f"   🧪 {api_name} Test {i}: {scenario['prompt'][:50]}...")
             
-            # Clean up
-            for file in ['learned_model.json', 'pattern_analysis.json']:
-                if os.path.exists(file):
-                    os.remove(file)
+            if session.error:
+                print(f"      ❌ Error: {session.error[:30]}")
             
-            # Set environment
-            env = os.environ.copy()
-            env.update({
-                'SPEC_PATH': spec_file,
-                'MAX_ATTEMPTS': '1',
-                'USER_PROMPT': scenario['prompt'],
-                'PYTHONIOENCODING': 'utf-8'
-            })
+            # Check for learning
+            constraints = session.to_dict()['constraints']
+            constraint_learned = bool(constraints)
+            learned_details = next(iter(constraints.values())) if constraints else {}
             
-            start_time = time.time()
-            try:
-                result = subprocess.run(
-                    [sys.executable, 'main.py'],
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    timeout=120,
-                    encoding='utf-8',
-                    errors='replace'
-                )
-                
-                duration = time.time() - start_time
-                
-                # Check for learning
-                constraint_learned = False
-                learned_details = {}
-                
-                if os.path.exists('learned_model.json'):
-                    try:
-                        with open('learned_model.json', 'r') as f:
-                            data = json.load(f)
-                        if data.get('total_constraints', 0) > 0:
-                            constraint_learned = True
-                            constraints = data.get('constraints', {})
-                            if constraints:
-                                key = list(constraints.keys())[0]
-                                learned_details = constraints[key]
-                    except:
-                        pass
-                
-                if constraint_learned:
-                    print(f"      ✅ Learned: {learned_details.get('constraint_type', 'unknown')}")
-                else:
-                    print(f"      ❌ No constraint learned")
-                
-                results.append({
-                    'api': api_name,
-                    'scenario': scenario['prompt'][:30] + '...',
-                    'success': constraint_learned,
-                    'duration': duration,
-                    'learned_details': learned_details,
-                    'expected': scenario['expected']
-                })
-                
-            except subprocess.TimeoutExpired:
-                print(f"      ⏰ Timeout")
-                results.append({
-                    'api': api_name,
-                    'scenario': scenario['prompt'][:30] + '...',
-                    'success': False,
-                    'duration': 120,
-                    'learned_details': {},
-                    'expected': scenario['expected']
-                })
-            except Exception as e:
-                print(f"      ❌ Error: {str(e)[:30]}")
-                results.append({
-                    'api': api_name,
-                    'scenario': scenario['prompt'][:30] + '...',
-                    'success': False,
-                    'duration': 0,
-                    'learned_details': {},
-                    'expected': scenario['expected']
-                })
+            if constraint_learned:
+                print(f"      ✅ Learned: {learned_details.get('constraint_type', 'unknown')}")
+            else:
+                print(f"      ❌ No constraint learned")
+            
+            results.append({
+                'api': api_name,
+                'scenario': scenario['prompt'][:30] + '...',
+                'success': constraint_learned,
+                'duration': session.duration,
+                'learned_details': learned_details,
+                'expected': scenario['expected']
+            })
         
         return {'success': True, 'results': results}
     
@@ -374,7 +319,6 @@ paths:
                 result = test_func()
                 if result.get('success') and 'results' in result:
                     all_results.extend(result['results'])
-                time.sleep(1)  # Brief pause between API tests
             except Exception as e:
                 print(f"   ❌ {api_name} test failed: {str(e)}")
         
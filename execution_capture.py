@@ -0,0 +1,269 @@
+"""
+Structured capture of what a generated test script actually did.
+
+While a script runs, every call made through `requests` is recorded as an
+HttpExchange (method, URL, request body, status, JSON payload, timing) and
+every test outcome as an AssertionOutcome. The executor hands the resulting
+ExecutionRecord to the interpreter in memory, so failures are read from the
+real responses instead of being scraped back out of pytest's text output.
+
+The record crosses the process boundary (pytest subprocess or warm worker) as
+a single marker line on stdout, which the executor strips again.
+"""
+
+import json
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlparse
+
+from failure_parser import FailureDetails
+
+RECORD_MARKER = '@@EXECUTION_RECORD@@ '
+
+# Response bodies beyond this are cut; error payloads are always far smaller
+MAX_BODY_CHARS = 4000
+
+ERROR_KEYS = ('error', 'message', 'detail')
+
+
+@dataclass
+class HttpExchange:
+    method: str
+    url: str
+    request_json: Any = None
+    request_params: Any = None
+    status_code: Optional[int] = None
+    response_json: Any = None
+    response_text: str = ''
+    elapsed_ms: float = 0.0
+    test_name: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def endpoint_path(self) -> str:
+        return urlparse(self.url).path or '/'
+
+    @property
+    def is_client_error(self) -> bool:
+        return self.status_code is not None and 400 <= self.status_code < 500
+
+    @property
+    def error_message(self) -> Optional[str]:
+        if isinstance(self.response_json, dict):
+            for key in ERROR_KEYS:
+                if isinstance(self.response_json.get(key), str):
+                    return self.response_json[key]
+        return None
+
+
+@dataclass
+class AssertionOutcome:
+    test_name: str
+    outcome: str
+    message: Optional[str] = None
+    duration_ms: float = 0.0
+
+
+@dataclass
+class ExecutionRecord:
+    exchanges: List[HttpExchange] = field(default_factory=list)
+    assertions: List[AssertionOutcome] = field(default_factory=list)
+
+    @property
+    def failed_assertions(self) -> List[AssertionOutcome]:
+        return [outcome for outcome in self.assertions if outcome.outcome == 'failed']
+
+    @property
+    def request_latencies_ms(self) -> List[float]:
+        return [exchange.elapsed_ms for exchange in self.exchanges]
+
+    def failing_exchange(self) -> Optional[HttpExchange]:
+        """The last 4xx response, or the last response when none was a client error"""
+        client_errors = [exchange for exchange in self.exchanges if exchange.is_client_error]
+        if client_errors:
+            return client_errors[-1]
+        return self.exchanges[-1] if self.exchanges else None
+
+    def failure_details(self) -> Optional[FailureDetails]:
+        """Failure details read from the recorded responses, or None when no request was made"""
+        exchange = self.failing_exchange()
+        return self._details_for(exchange) if exchange else None
+
+    def all_failure_details(self) -> List[FailureDetails]:
+        """
+        Details for every distinct client error in the run, plus every failed
+        test whose requests all succeeded, in the order they happened
+        """
+        selected = {id(exchange) for exchange in self.exchanges if exchange.is_client_error}
+        tests_with_errors = {exchange.test_name for exchange in self.exchanges if exchange.is_client_error}
+        for outcome in self.failed_assertions:
+            if outcome.test_name in tests_with_errors:
+                continue
+            own = [exchange for exchange in self.exchanges if exchange.test_name == outcome.test_name]
+            if own:
+                selected.add(id(own[-1]))
+
+        details, seen = [], set()
+        for exchange in self.exchanges:
+            if id(exchange) not in selected:
+                continue
+            item = self._details_for(exchange)
+            key = (item.http_method, item.endpoint_path, item.error_message)
+            if key not in seen:
+                seen.add(key)
+                details.append(item)
+        return details
+
+    def _details_for(self, exchange: HttpExchange) -> FailureDetails:
+        failed = [outcome for outcome in self.failed_assertions
+                  if exchange.test_name is None or outcome.test_name == exchange.test_name]
+        assertion_message = failed[0].message if failed else None
+        return FailureDetails(
+            http_method=exchange.method,
+            endpoint_path=exchange.endpoint_path,
+            url=exchange.url,
+            status_code=str(exchange.status_code) if exchange.status_code is not None else None,
+            error_json=exchange.response_json if isinstance(exchange.response_json, dict) else None,
+            error_message=exchange.error_message or assertion_message,
+            assertion_message=assertion_message
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExecutionRecord':
+        return cls(
+            exchanges=[HttpExchange(**item) for item in data.get('exchanges', [])],
+            assertions=[AssertionOutcome(**item) for item in data.get('assertions', [])]
+        )
+
+
+def _json_safe(value: Any) -> Any:
+    try:
+        json.dumps(value)
+        return value
+    except (TypeError, ValueError):
+        return repr(value)
+
+
+class RequestRecorder:
+    """
+    Records every requests.Session.request call into an ExecutionRecord.
+
+    Module-level helpers (requests.get, requests.post, ...) all go through
+    Session.request, so patching it once covers every generated script.
+    """
+
+    def __init__(self, record: Optional[ExecutionRecord] = None):
+        self.record = record or ExecutionRecord()
+        self.current_test: Optional[str] = None
+        self._original = None
+
+    def start(self):
+        import requests
+
+        if self._original is not None:
+            return
+        self._original = requests.Session.request
+        recorder = self
+
+        def recording_request(session, method, url, *args, **kwargs):
+            exchange = HttpExchange(
+                method=str(method).upper(),
+                url=str(url),
+                request_json=_json_safe(kwargs.get('json')),
+                request_params=_json_safe(kwargs.get('params')),
+                test_name=recorder.current_test
+            )
+            start_time = time.perf_counter()
+            try:
+                response = recorder._original(session, method, url, *args, **kwargs)
+            except Exception as e:
+                exchange.error = f"{type(e).__name__}: {e}"
+                raise
+            else:
+                exchange.status_code = response.status_code
+                exchange.response_text = response.text[:MAX_BODY_CHARS]
+                try:
+                    exchange.response_json = response.json()
+                except ValueError:
+                    pass
+                return response
+            finally:
+                exchange.elapsed_ms = round((time.perf_counter() - start_time) * 1000, 3)
+                recorder.record.exchanges.append(exchange)
+
+        requests.Session.request = recording_request
+
+    def stop(self):
+        import requests
+
+        if self._original is not None:
+            requests.Session.request = self._original
+            self._original = None
+
+    def add_outcome(self, test_name: str, outcome: str, message: Optional[str] = None, duration_ms: float = 0.0):
+        self.record.assertions.append(AssertionOutcome(test_name, outcome, message, round(duration_ms, 3)))
+
+    def __enter__(self) -> 'RequestRecorder':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def encode_record(record: ExecutionRecord) -> str:
+    """Serialize a record as the single stdout marker line"""
+    return RECORD_MARKER + json.dumps(record.to_dict(), default=repr)
+
+
+def extract_record(stdout: str) -> Tuple[str, Optional[ExecutionRecord]]:
+    """Split the marker line out of captured stdout, returning (clean stdout, record)"""
+    position = stdout.rfind(RECORD_MARKER)
+    if position == -1:
+        return stdout, None
+
+    end = stdout.find('\n', position)
+    end = len(stdout) if end == -1 else end + 1
+    payload = stdout[position + len(RECORD_MARKER):end]
+    try:
+        record = ExecutionRecord.from_dict(json.loads(payload))
+    except (ValueError, TypeError):
+        record = None
+    return stdout[:position] + stdout[end:], record
+
+
+class CapturePlugin:
+    """pytest plugin recording requests and per-test outcomes"""
+
+    def __init__(self):
+        self.recorder = RequestRecorder()
+
+    def pytest_sessionstart(self, session):
+        self.recorder.start()
+
+    def pytest_runtest_logstart(self, nodeid, location):
+        self.recorder.current_test = nodeid.split('::')[-1]
+
+    def pytest_runtest_logreport(self, report):
+        # Setup failures (missing fixtures) count as failed tests too
+        if report.when == 'call' or (report.when == 'setup' and not report.passed):
+            message = None
+            if report.failed:
+                crash = getattr(report.longrepr, 'reprcrash', None)
+                message = crash.message if crash else str(report.longrepr)
+            test_name = report.nodeid.split('::')[-1]
+            self.recorder.add_outcome(test_name, report.outcome, message, report.duration * 1000)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        self.recorder.stop()
+        terminalreporter.write_line(encode_record(self.recorder.record))
+
+
+def pytest_configure(config):
+    """Entry point when loaded with `-p execution_capture`"""
+    if not config.pluginmanager.has_plugin('execution-capture'):
+        config.pluginmanager.register(CapturePlugin(), 'execution-capture')
@@ -1,100 +1,207 @@
 import subprocess
 import os
 import tempfile
-from typing import Dict, Any
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Tuple, Callable, List
 
-def execute_test_script(script_file: str) -> Dict[str, Any]:
+from execution_capture import extract_record
+from output_capture import CapturedOutput, bound_text, read_bounded, tail_text
+
+TEST_TIMEOUT = int(os.getenv('TEST_TIMEOUT', '30'))
+
+# Number of pre-started warm workers; setting it opts into the pool backend
+EXECUTOR_WORKERS = int(os.getenv('EXECUTOR_WORKERS', '0'))
+
+# "subprocess" starts a fresh pytest interpreter per script (the original
+# behaviour); "warm" reuses a long-lived worker that has pytest and requests
+# already imported; "pool" spreads scripts over EXECUTOR_WORKERS warm workers.
+EXECUTOR_BACKEND = os.getenv('EXECUTOR_BACKEND', 'pool' if EXECUTOR_WORKERS else 'subprocess')
+
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _run_in_subprocess(script_file: str) -> Tuple[int, str, str]:
+    """Run the script with a brand-new `python -m pytest` interpreter"""
+    # The capture plugin lives next to this module, wherever the script runs
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [_MODULE_DIR, env.get('PYTHONPATH')]))
+    # Output goes to anonymous temp files, so only its bounded head and tail is ever read into memory
+    with tempfile.TemporaryFile() as stdout_file, tempfile.TemporaryFile() as stderr_file:
+        result = subprocess.run(
+            ['python', '-m', 'pytest', script_file, '-v', '--tb=short', '-p', 'execution_capture'],
+            stdout=stdout_file,
+            stderr=stderr_file,
+            env=env,
+            timeout=TEST_TIMEOUT
+        )
+        # Decoded as UTF-8, replacing invalid characters instead of crashing
+        return result.returncode, read_bounded(stdout_file), read_bounded(stderr_file)
+
+def _run_in_warm_worker(script_file: str) -> Tuple[int, str, str]:
+    """Run the script inside the process-wide warm worker"""
+    from warm_executor import get_warm_worker
+    
+    result = get_warm_worker(timeout=TEST_TIMEOUT).run(script_file, timeout=TEST_TIMEOUT)
+    return result['return_code'], result['stdout'], result['stderr']
+
+def _run_in_pool(script_file: str) -> Tuple[int, str, str]:
+    """Run the script on the next idle worker of the shared executor pool"""
+    result = get_executor_pool().run(script_file, timeout=TEST_TIMEOUT)
+    return result['return_code'], result['stdout'], result['stderr']
+
+_BACKENDS: Dict[str, Callable[[str], Tuple[int, str, str]]] = {
+    'subprocess': _run_in_subprocess,
+    'warm': _run_in_warm_worker,
+    'pool': _run_in_pool,
+}
+
+def get_executor_pool(workers: Optional[int] = None):
+    """Return the shared pool of warm pytest workers (EXECUTOR_WORKERS by default)"""
+    from warm_executor import get_executor_pool as _get_pool
+    
+    return _get_pool(workers=workers, timeout=TEST_TIMEOUT, default_workers=EXECUTOR_WORKERS or None)
+
+def execute_test_script(script_file: str, backend: Optional[str] = None) -> Dict[str, Any]:
     """
     Execute a pytest script and return the results
+    
+    The backend ("subprocess", "warm" or "pool") defaults to EXECUTOR_BACKEND;
+    all of them return the same result dictionary. Its 'output' entry is the
+    bounded CapturedOutput of the run, 'stdout'/'stderr' keep only their last
+    OUTPUT_TAIL_CHARS characters, and 'execution' is the ExecutionRecord of
+    requests made and test outcomes, when captured.
+    """
+    runner = _BACKENDS.get(backend or EXECUTOR_BACKEND, _run_in_subprocess)
+    return _execute_with_runner(script_file, runner)
+
+def submit_test_script(script_file: str) -> Future:
+    """
+    Queue a script on the shared executor pool.
+    
+    The returned Future resolves to the same dictionary execute_test_script
+    returns.
     """
+    result_future: Future = Future()
+    
+    if not os.path.exists(script_file):
+        result_future.set_result(_execute_with_runner(script_file, _run_in_subprocess))
+        return result_future
+    
+    def unwrap(raw_future: Future) -> Tuple[int, str, str]:
+        result = raw_future.result()
+        return result['return_code'], result['stdout'], result['stderr']
+    
+    def on_done(raw_future: Future):
+        result_future.set_result(_execute_with_runner(script_file, lambda _: unwrap(raw_future)))
+    
+    _ensure_conftest()
+    get_executor_pool().submit(script_file, timeout=TEST_TIMEOUT).add_done_callback(on_done)
+    return result_future
+
+def execute_test_scripts(script_files: List[str]) -> List[Dict[str, Any]]:
+    """Execute several scripts in parallel on the executor pool, preserving order"""
+    futures = [submit_test_script(script_file) for script_file in script_files]
+    return [future.result() for future in futures]
+
+def _ensure_conftest():
+    """Create conftest.py if it doesn't exist (for the api_base_url fixture)"""
+    conftest_content = '''
+import pytest
+
+@pytest.fixture
+def api_base_url():
+    return "http://localhost:5000"
+'''
+    
+    if not os.path.exists('conftest.py'):
+        with open('conftest.py', 'w') as f:
+            f.write(conftest_content)
+
+def _execute_with_runner(script_file: str, runner: Callable[[str], Tuple[int, str, str]]) -> Dict[str, Any]:
+    """Run a script with the given backend and package its output"""
     
     # Check if the script file exists
     if not os.path.exists(script_file):
         return {
             'success': False,
+            'output': None,
             'output_file': None,
             'error': f"Script file not found: {script_file}",
             'stdout': '',
-            'stderr': ''
+            'stderr': '',
+            'execution': None
         }
     
-    # Create a temporary file to capture the output
-    with tempfile.NamedTemporaryFile(mode='w+', suffix='.txt', delete=False) as temp_file:
-        output_file = temp_file.name
-    
     try:
-        # Create conftest.py if it doesn't exist (for the api_base_url fixture)
-        conftest_content = '''
-import pytest
-
-@pytest.fixture
-def api_base_url():
-    return "http://localhost:5000"
-'''
+        _ensure_conftest()
         
-        if not os.path.exists('conftest.py'):
-            with open('conftest.py', 'w') as f:
-                f.write(conftest_content)
+        # Execute the pytest script with the selected backend
+        return_code, stdout, stderr = runner(script_file)
+        stdout, execution = extract_record(stdout)
+        stdout, stderr = bound_text(stdout), bound_text(stderr)
         
-        # Execute the pytest script with proper encoding
-        result = subprocess.run(
-            ['python', '-m', 'pytest', script_file, '-v', '--tb=short'],
-            capture_output=True,
-            text=True,
-            timeout=30,  # 30 second timeout
-            encoding='utf-8',  # Force UTF-8 encoding
-            errors='replace'   # Replace invalid characters instead of crashing
+        # The full output lives only in the CapturedOutput, in memory or spilled to a temp file
+        output = CapturedOutput(
+            "=== PYTEST EXECUTION RESULTS ===\n"
+            f"Return code: {return_code}\n"
+            "=== STDOUT ===\n"
+            f"{stdout}"
+            "\n=== STDERR ===\n"
+            f"{stderr}"
+            "\n=== END RESULTS ===\n"
         )
         
-        # Write output to the temporary file with proper encoding
-        with open(output_file, 'w', encoding='utf-8', errors='replace') as f:
-            f.write("=== PYTEST EXECUTION RESULTS ===\n")
-            f.write(f"Return code: {result.returncode}\n")
-            f.write("=== STDOUT ===\n")
-            f.write(result.stdout)
-            f.write("\n=== STDERR ===\n")
-            f.write(result.stderr)
-            f.write("\n=== END RESULTS ===\n")
-        
         # Determine if the test was successful
-        success = result.returncode == 0
+        success = return_code == 0
         
         return {
             'success': success,
-            'output_file': output_file,
-            'stdout': result.stdout,
-            'stderr': result.stderr,
-            'return_code': result.returncode
+            'output': output,
+            'output_file': output.path if output.spilled else None,
+            'stdout': tail_text(stdout),
+            'stderr': tail_text(stderr),
+            'return_code': return_code,
+            'execution': execution
         }
         
     except subprocess.TimeoutExpired:
         # Handle timeout
-        with open(output_file, 'w', encoding='utf-8', errors='replace') as f:
-            f.write("=== TIMEOUT ERROR ===\n")
-            f.write("Test execution timed out after 30 seconds\n")
-        
         return {
             'success': False,
-            'output_file': output_file,
+            'output': CapturedOutput(
+                "=== TIMEOUT ERROR ===\n"
+                f"Test execution timed out after {TEST_TIMEOUT} seconds\n"
+            ),
+            'output_file': None,
             'error': 'Test execution timed out',
             'stdout': '',
-            'stderr': 'Timeout after 30 seconds'
+            'stderr': f'Timeout after {TEST_TIMEOUT} seconds',
+            'execution': None
         }
         
     except Exception as e:
         # Handle other execution errors
-        with open(output_file, 'w', encoding='utf-8', errors='replace') as f:
-            f.write("=== EXECUTION ERROR ===\n")
-            f.write(f"Error executing test: {str(e)}\n")
-        
         return {
             'success': False,
-            'output_file': output_file,
+            'output': CapturedOutput(
+                "=== EXECUTION ERROR ===\n"
+                f"Error executing test: {str(e)}\n"
+            ),
+            'output_file': None,
             'error': str(e),
             'stdout': '',
-            'stderr': str(e)
+            'stderr': str(e),
+            'execution': None
         }
 
+def release_execution_result(execution_result: Optional[Dict[str, Any]]):
+    """Delete any temp file behind an execution result once it has been interpreted"""
+    if not execution_result:
+        return
+    output = execution_result.get('output')
+    if output is not None:
+        output.cleanup()
+    execution_result['output_file'] = None
+
 def cleanup_temp_files(file_pattern: str = "generated_test_*.py"):
     """
     Clean up temporary test files
@@ -174,14 +281,11 @@ def test_simple_request(api_base_url):
     
     print("Execution Result:")
     print(f"Success: {result['success']}")
-    print(f"Output file: {result['output_file']}")
     
-    if result['output_file'] and os.path.exists(result['output_file']):
-        with open(result['output_file'], 'r') as f:
-            print("Output:")
-            print(f.read())
+    if result['output'] is not None:
+        print("Output:")
+        print(result['output'].read())
     
     # Cleanup
     cleanup_temp_files("test_executor.py")
-    if result['output_file']:
-        os.remove(result['output_file'])
+    release_execution_result(result)
@@ -0,0 +1,164 @@
+"""
+Deterministic classification of API error messages into learned constraints.
+
+Most validation errors follow a handful of templates ("X field is required",
+"X is required when Y is 'Z'", "Cannot specify both A and B", ...). Those are
+mapped straight to LearnedConstraint objects here, so the interpreter only
+calls the LLM for messages no template recognizes.
+"""
+
+import re
+from typing import Callable, List, Optional, Tuple
+
+from constraint_model import (
+    LearnedConstraint, ConstraintType, ConditionalRule,
+    MutualExclusivityRule, FormatDependencyRule, BusinessRule, RateLimitRule
+)
+
+# Template matches are exact readings of the server's message
+TEMPLATE_CONFIDENCE = 0.95
+
+TIME_UNITS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+Template = Tuple[re.Pattern, Callable[[re.Match, str, str], LearnedConstraint]]
+
+
+def _constraint(constraint_type: ConstraintType, parameter: str, endpoint_path: str,
+                description: str, formal_constraint: dict) -> LearnedConstraint:
+    return LearnedConstraint(
+        constraint_type=constraint_type,
+        affected_parameter=parameter,
+        endpoint_path=endpoint_path,
+        rule_description=description,
+        formal_constraint=formal_constraint,
+        confidence_score=TEMPLATE_CONFIDENCE,
+        context_tags=['template']
+    )
+
+
+def _number(text: str):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def _conditional_requirement(match, message, endpoint_path):
+    required_field, condition_field, condition_value = match.group(1, 2, 3)
+    constraint = _constraint(
+        ConstraintType.CONDITIONAL_REQUIREMENT, required_field, endpoint_path, message,
+        {'required': required_field, 'when': {condition_field: condition_value}}
+    )
+    constraint.conditional_rule = ConditionalRule(
+        condition_field=condition_field,
+        condition_value=condition_value,
+        condition_operator='equals',
+        required_field=required_field
+    )
+    return constraint
+
+
+def _format_dependency(match, message, endpoint_path):
+    required_format, dependency_field, dependency_value = match.group(1, 2, 3)
+    constraint = _constraint(
+        ConstraintType.FORMAT_DEPENDENCY, required_format, endpoint_path, message,
+        {'format': required_format, 'when': {dependency_field: dependency_value}}
+    )
+    constraint.format_dependency = FormatDependencyRule(
+        dependent_field=required_format,
+        dependency_field=dependency_field,
+        dependency_value=dependency_value,
+        required_format=required_format
+    )
+    return constraint
+
+
+def _required_field(match, message, endpoint_path):
+    # The required-field variants capture the field in different groups
+    field_name = next(group for group in match.groups() if group)
+    return _constraint(ConstraintType.REQUIRED_FIELD, field_name, endpoint_path, message, {'required': True})
+
+
+def _mutual_exclusivity(match, message, endpoint_path):
+    fields = [match.group(1), match.group(2)]
+    constraint = _constraint(
+        ConstraintType.MUTUAL_EXCLUSIVITY, fields[0], endpoint_path, message, {'exactly_one_of': fields}
+    )
+    constraint.exclusivity_rule = MutualExclusivityRule(exclusive_fields=fields, min_required=1, max_allowed=1)
+    return constraint
+
+
+def _business_rule(rule_type: str, formal_key: str):
+    def build(match, message, endpoint_path):
+        field_name, value = match.group(1), _number(match.group(2))
+        constraint = _constraint(
+            ConstraintType.BUSINESS_RULE, field_name, endpoint_path, message, {formal_key: value}
+        )
+        constraint.business_rule = BusinessRule(
+            field=field_name, rule_type=rule_type, constraint_value=value, error_message=message
+        )
+        return constraint
+    return build
+
+
+def _length_range(match, message, endpoint_path):
+    field_name, minimum, maximum = match.group(1), int(match.group(2)), int(match.group(3))
+    return _constraint(
+        ConstraintType.VALUE_CONSTRAINT, field_name, endpoint_path, message,
+        {'minLength': minimum, 'maxLength': maximum}
+    )
+
+
+def _format_validation(match, message, endpoint_path):
+    field_name, required_format = match.group(1), match.group(2).lower()
+    if required_format in ('number', 'integer'):
+        return _constraint(
+            ConstraintType.VALUE_CONSTRAINT, field_name, endpoint_path, message, {'type': required_format}
+        )
+    return _constraint(
+        ConstraintType.FORMAT_VALIDATION, field_name, endpoint_path, message, {'format': required_format}
+    )
+
+
+def _rate_limit(match, message, endpoint_path):
+    max_requests = int(match.group(1))
+    window = int(match.group(2) or 1) * TIME_UNITS[match.group(3).lower()]
+    constraint = _constraint(
+        ConstraintType.RATE_LIMITING, 'requests', endpoint_path, message,
+        {'max_requests': max_requests, 'time_window_seconds': window}
+    )
+    constraint.rate_limit_rule = RateLimitRule(
+        endpoint_pattern=endpoint_path, max_requests=max_requests, time_window_seconds=window
+    )
+    return constraint
+
+
+FIELD = r"['\"]?(\w+)['\"]?"
+NUMBER = r"(-?\d+(?:\.\d+)?)"
+
+# Checked in order; more specific templates come first
+TEMPLATES: List[Template] = [
+    (re.compile(r"rate limit exceeded.*?maximum (\d+) \w+ per (?:(\d+) )?(second|minute|hour|day)s?", re.I), _rate_limit),
+    (re.compile(rf"valid (\w+) format (?:is )?required when {FIELD} is ['\"]?([^'\"]+?)['\"]?$", re.I), _format_dependency),
+    (re.compile(rf"{FIELD} (?:field )?is required when {FIELD} is ['\"]?([^'\"]+?)['\"]?$", re.I), _conditional_requirement),
+    (re.compile(rf"cannot specify both {FIELD} and {FIELD}", re.I), _mutual_exclusivity),
+    (re.compile(rf"either {FIELD} or {FIELD} must be provided", re.I), _mutual_exclusivity),
+    (re.compile(rf"{FIELD} must be at least {NUMBER}(?!\s*characters)", re.I), _business_rule('min_value', 'minimum')),
+    (re.compile(rf"{FIELD} must be greater than {NUMBER}", re.I), _business_rule('min_value', 'exclusiveMinimum')),
+    (re.compile(rf"{FIELD} must be at most {NUMBER}(?!\s*characters)", re.I), _business_rule('max_value', 'maximum')),
+    (re.compile(rf"{FIELD} must be less than {NUMBER}", re.I), _business_rule('max_value', 'exclusiveMaximum')),
+    (re.compile(rf"{FIELD} must be (\d+)\s*-\s*(\d+) characters", re.I), _length_range),
+    (re.compile(rf"{FIELD} must be a valid (\w+)", re.I), _format_validation),
+    (re.compile(rf"missing required field:? {FIELD}|{FIELD} field is required|\b(?<!request ){FIELD} is required$", re.I), _required_field),
+]
+
+
+def classify_failure(error_message: str, endpoint_path: str) -> Optional[LearnedConstraint]:
+    """Map an API error message to a constraint, or None when no template matches"""
+    if not error_message:
+        return None
+    message = error_message.strip().rstrip('.')
+
+    for pattern, build in TEMPLATES:
+        match = pattern.search(message)
+        if match:
+            return build(match, message, endpoint_path)
+    return None
@@ -0,0 +1,141 @@
+"""
+Single-pass extraction of failure details from executor output.
+
+The output files written by executor.execute_test_script can run to several
+MB for verbose tests. Instead of running a dozen regexes over the whole text,
+the output is walked once, line by line, with precompiled per-line patterns
+guarded by cheap substring checks. The first hit of each kind is kept and the
+kinds are ranked afterwards, so cost stays linear in the output size.
+"""
+
+import ast
+import json
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+SECTION_MARKER = re.compile(r'^=== ([A-Z ]+) ===$')
+
+# Script patterns: the script is small, so these run over it directly
+REQUEST_CALL = re.compile(
+    r'requests\.(get|post|put|patch|delete)\(\s*f?["\']([^"\']*)["\']'
+)
+REQUEST_METHOD = re.compile(r'requests\.(get|post|put|patch|delete)')
+QUOTED_PATH = re.compile(r'f?["\'][^"\'\n]*?/([\w/\-]+)["\']')
+
+# Output patterns, each applied to a single line
+STATUS_PATTERNS = [
+    ('got', re.compile(r'got\s+(\d{3})')),
+    ('<Response', re.compile(r'<Response\s*\[(\d{3})')),
+    ('status_code', re.compile(r'status_code\D{0,40}?(\d{3})[^{]*\{')),
+]
+ERROR_PATTERNS = [
+    ('"error"', re.compile(r'"error":\s*"([^"]*)"', re.IGNORECASE)),
+    ("'error'", re.compile(r"'error':\s*'([^']*)'", re.IGNORECASE)),
+    ('{', re.compile(r'\{[^}]*"(?:error|message|detail)":\s*"([^"]*)"[^}]*\}', re.IGNORECASE)),
+]
+ASSERTION_PATTERNS = [
+    ('AssertionError', re.compile(r'AssertionError:\s*(.+)')),
+    ('assert', re.compile(r'assert\s+.*?,\s*f?"([^"]*)"')),
+]
+JSON_OBJECT = re.compile(r'\{[^{}]*\}')
+
+
+@dataclass
+class FailureDetails:
+    http_method: str = "POST"
+    endpoint_path: str = "/users"
+    url: Optional[str] = None
+    status_code: Optional[str] = None
+    error_json: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    assertion_message: Optional[str] = None
+
+    def as_tuple(self) -> tuple:
+        """(method, endpoint, status, error message), as interpret_failure expects"""
+        return self.http_method, self.endpoint_path, self.status_code, self.error_message
+
+
+def _parse_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Parse a JSON object or a Python dict repr, as pytest prints either"""
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            value = parse(text)
+        except (ValueError, SyntaxError):
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+
+def _parse_script(details: FailureDetails, failed_script: str):
+    call = REQUEST_CALL.search(failed_script)
+    if call:
+        details.http_method = call.group(1).upper()
+        details.url = call.group(2)
+        path = re.sub(r'^\{[^}]*\}|^https?://[^/]+', '', details.url)
+        if path.startswith('/'):
+            details.endpoint_path = path.split('?')[0]
+            return
+
+    method = REQUEST_METHOD.search(failed_script)
+    if method:
+        details.http_method = method.group(1).upper()
+    quoted = QUOTED_PATH.search(failed_script)
+    if quoted:
+        details.endpoint_path = "/" + quoted.group(1)
+    elif '/users' in failed_script:
+        details.endpoint_path = "/users"
+
+
+def parse_failure_output(failure_output: str, failed_script: str = "") -> FailureDetails:
+    """Extract method, URL, status, error JSON and assertion message in one pass over the output"""
+    details = FailureDetails()
+    _parse_script(details, failed_script or "")
+
+    statuses: Dict[int, str] = {}
+    errors: Dict[int, str] = {}
+    assertions: Dict[int, str] = {}
+    section = None
+
+    for line in failure_output.splitlines():
+        marker = SECTION_MARKER.match(line)
+        if marker:
+            section = marker.group(1)
+            continue
+        if section == 'PYTEST EXECUTION RESULTS':
+            # Header lines ("Return code: 1") carry no failure details
+            continue
+
+        for rank, (needle, pattern) in enumerate(STATUS_PATTERNS):
+            if rank not in statuses and needle in line:
+                match = pattern.search(line)
+                if match:
+                    statuses[rank] = match.group(1)
+
+        lowered = line.lower()
+        for rank, (needle, pattern) in enumerate(ERROR_PATTERNS):
+            if rank not in errors and needle in lowered:
+                match = pattern.search(line)
+                if match:
+                    errors[rank] = match.group(1)
+                    if details.error_json is None:
+                        obj = JSON_OBJECT.search(line)
+                        if obj:
+                            details.error_json = _parse_json_object(obj.group())
+
+        for rank, (needle, pattern) in enumerate(ASSERTION_PATTERNS):
+            if rank not in assertions and needle in line:
+                match = pattern.search(line)
+                if match:
+                    assertions[rank] = match.group(1).strip()
+
+    if statuses:
+        details.status_code = statuses[min(statuses)]
+    if assertions:
+        details.assertion_message = assertions[min(assertions)]
+    if errors:
+        details.error_message = errors[min(errors)]
+    else:
+        details.error_message = details.assertion_message
+    return details
@@ -1,10 +1,6 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-import os
-import google.generativeai as genai
-import threading
-import time
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional, List, Union
 import json
@@ -13,31 +9,11 @@ from constraint_model import (
     LearnedConstraint, ConstraintType, ConditionalRule, 
     MutualExclusivityRule, FormatDependencyRule, BusinessRule, RateLimitRule
 )
-
-def llm_call_with_timeout(model, prompt, timeout=60):
-    """Call LLM with timeout using threading"""
-    result = [None]
-    exception = [None]
-    
-    def target():
-        try:
-            result[0] = model.generate_content(prompt)
-        except Exception as e:
-            exception[0] = e
-    
-    thread = threading.Thread(target=target)
-    thread.daemon = True
-    thread.start()
-    thread.join(timeout)
-    
-    if thread.is_alive():
-        # Thread is still running, timeout occurred
-        raise TimeoutError(f"LLM request timed out after {timeout} seconds")
-    
-    if exception[0]:
-        raise exception[0]
-    
-    return result[0]
+from llm_client import get_model, llm_call
+from failure_classifier import classify_failure
+from failure_parser import FailureDetails, parse_failure_output
+from execution_capture import ExecutionRecord
+from output_capture import CapturedOutput
 
 class EnhancedInferredRule(BaseModel):
     rule_description: str = Field(description="Clear description of the inferred API rule")
@@ -55,62 +31,180 @@ class EnhancedInferredRule(BaseModel):
     business_rule_info: Optional[Dict[str, Any]] = Field(description="Business rule specifics", default=None)
     rate_limit_info: Optional[Dict[str, Any]] = Field(description="Rate limiting details", default=None)
 
-def interpret_failure(user_prompt: str, failed_script: str, request_details: Dict[str, Any], failure_context_path: str) -> Optional[LearnedConstraint]:
+def interpret_failures(user_prompt: str, failed_script: str, request_details: Dict[str, Any],
+                       failure_context: Union[str, CapturedOutput, None],
+                       execution: Optional[ExecutionRecord] = None) -> List[LearnedConstraint]:
     """
     Enhanced failure interpretation that extracts sophisticated constraints
+    from every failure of a run
+    
+    failure_context is the executor's CapturedOutput or a path to an output
+    file. When the executor captured an ExecutionRecord, each failing response
+    and failed test is read from it directly; otherwise the output is parsed
+    for a single failure. Failures matching a known error template are
+    classified locally and the rest share one LLM request.
     """
     
     print(f"🔍 DEBUG: Starting enhanced failure analysis...")
-    print(f"   Failure file: {failure_context_path}")
     
-    # Read failure details
-    try:
-        with open(failure_context_path, 'r') as f:
-            failure_output = f.read()
-        print(f"✅ Successfully read failure output ({len(failure_output)} chars)")
-    except FileNotFoundError:
-        print(f"❌ Failure context file not found: {failure_context_path}")
-        return None
-    except Exception as e:
-        print(f"❌ Error reading failure file: {e}")
-        return None
+    failures = execution.all_failure_details() if execution else []
+    if failures:
+        print(f"✅ Using captured execution record ({len(execution.exchanges)} requests, "
+              f"{len(failures)} failures)")
+    else:
+        # Read failure details
+        try:
+            if isinstance(failure_context, CapturedOutput):
+                failure_output = failure_context.read()
+            else:
+                print(f"   Failure file: {failure_context}")
+                with open(failure_context, 'r') as f:
+                    failure_output = f.read()
+            print(f"✅ Successfully read failure output ({len(failure_output)} chars)")
+        except FileNotFoundError:
+            print(f"❌ Failure context file not found: {failure_context}")
+            return []
+        except Exception as e:
+            print(f"❌ Error reading failure file: {e}")
+            return []
 
-    print(f"🔍 DEBUG: Failure output preview:")
-    print("=" * 50)
-    print(failure_output[:1000])  # Show first 1000 characters
-    print("=" * 50)
-    
-    # Extract HTTP request and response details
-    http_method, endpoint_path, status_code, error_message = _extract_failure_details(failure_output, failed_script)
-    
-    print(f"🔍 DEBUG: Extracted details:")
-    print(f"   Method: {http_method}")
-    print(f"   Endpoint: {endpoint_path}")
-    print(f"   Status: {status_code}")
-    print(f"   Error: {error_message}")
-    
-    if not error_message:
-        print("❌ No analyzable error message found")
-        return None
-    
-    # Only proceed with 4xx errors (client errors)
-    if status_code and not status_code.startswith('4'):
-        print(f"⚠️ Skipping non-client error (status: {status_code})")
-        return None
-    
-    print(f"✅ Found analyzable error message: {error_message}")
-    
+        print(f"🔍 DEBUG: Failure output preview:")
+        print("=" * 50)
+        print(failure_output[:1000])  # Show first 1000 characters
+        print("=" * 50)
+        
+        # Extract HTTP request and response details
+        failures = [parse_failure_output(failure_output, failed_script)]
+    
+    constraints = []
+    unmatched = []
+    for details in failures:
+        http_method, endpoint_path, status_code, error_message = details.as_tuple()
+        print(f"🔍 DEBUG: Extracted details:")
+        print(f"   Method: {http_method}")
+        print(f"   Endpoint: {endpoint_path}")
+        print(f"   Status: {status_code}")
+        print(f"   Error: {error_message}")
+        
+        if not error_message:
+            print("❌ No analyzable error message found")
+            continue
+        
+        # Only proceed with 4xx errors (client errors)
+        if status_code and not status_code.startswith('4'):
+            print(f"⚠️ Skipping non-client error (status: {status_code})")
+            continue
+        
+        print(f"✅ Found analyzable error message: {error_message}")
+        
+        # Known error templates map straight to constraints without an LLM round trip
+        template_constraint = classify_failure(error_message, endpoint_path)
+        if template_constraint:
+            print(f"⚡ Matched known error template: {template_constraint.rule_description}")
+            print(f"   🎯 Constraint Type: {template_constraint.constraint_type.value}")
+            constraints.append(template_constraint)
+        else:
+            unmatched.append(details)
+    
+    if unmatched:
+        constraints.extend(_interpret_with_llm(user_prompt, request_details, unmatched))
+    return constraints
+
+def interpret_failure(user_prompt: str, failed_script: str, request_details: Dict[str, Any],
+                      failure_context: Union[str, CapturedOutput, None],
+                      execution: Optional[ExecutionRecord] = None) -> Optional[LearnedConstraint]:
+    """The first constraint interpret_failures finds, for callers that learn one rule per run"""
+    constraints = interpret_failures(user_prompt, failed_script, request_details, failure_context,
+                                     execution=execution)
+    return constraints[0] if constraints else None
+
+def _interpret_with_llm(user_prompt: str, request_details: Dict[str, Any],
+                        failures: List[FailureDetails]) -> List[LearnedConstraint]:
+    """Ask the LLM for the constraints behind the failures, in one request however many there are"""
     # Configure Gemini
     try:
-        genai.configure(api_key=os.getenv('GOOGLE_API_KEY'))
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        get_model()
         print("✅ Gemini configured successfully")
     except Exception as e:
         print(f"❌ Error configuring Gemini: {e}")
+        return []
+    
+    if len(failures) == 1:
+        inferred = _request_rules(_single_failure_prompt(user_prompt, request_details, failures[0]), dict)
+        inferred = [inferred] if inferred is not None else []
+    else:
+        inferred = _request_rules(_batch_failure_prompt(user_prompt, request_details, failures), list)
+        if inferred is None or len(inferred) != len(failures):
+            # The answers cannot be matched to their failures, so ask about each one alone
+            print(f"⚠️ Batched interpretation did not return {len(failures)} rules; interpreting failures one by one")
+            return [constraint for details in failures
+                    for constraint in _interpret_with_llm(user_prompt, request_details, [details])]
+    
+    constraints = []
+    for inferred_data in inferred:
+        if not isinstance(inferred_data, dict):
+            continue
+        try:
+            learned_constraint = _constraint_from_inferred(inferred_data)
+        except Exception as e:
+            print(f"❌ Error during enhanced failure interpretation: {e}")
+            continue
+        if learned_constraint:
+            constraints.append(learned_constraint)
+    return constraints
+
+def _request_rules(prompt: str, expected_type: type) -> Any:
+    """Send one interpretation prompt and return its parsed JSON object/array, or None"""
+    try:
+        print("🤖 Sending enhanced prompt to Gemini...")
+        response_text = llm_call(prompt, timeout=60)  # 60 second timeout
+    except Exception as e:
+        print(f"❌ Error during enhanced failure interpretation: {e}")
         return None
     
+    print(f"🤖 LLM Response received ({len(response_text)} chars):")
+    print("=" * 30)
+    print(response_text[:500])
+    print("=" * 30)
+    
+    inferred = _parse_json_response(response_text, expected_type)
+    if inferred is None:
+        print("❌ No JSON found in LLM response")
+        print(f"Raw response: {response_text}")
+    return inferred
+
+def _parse_json_response(response_text: str, expected_type: type) -> Any:
+    """
+    The JSON value of the expected type in an LLM response: the whole
+    (fence-stripped) response when it parses, else the first complete value
+    starting at a top-level bracket
+    """
+    text = re.sub(r'^\s*```(?:json)?\s*|\s*```\s*$', '', response_text.strip())
+    try:
+        value = json.loads(text)
+        if isinstance(value, expected_type):
+            return value
+    except ValueError:
+        pass
+    
+    opener = '[' if expected_type is list else '{'
+    decoder = json.JSONDecoder()
+    position = text.find(opener)
+    while position != -1:
+        try:
+            value, _ = decoder.raw_decode(text, position)
+            if isinstance(value, expected_type):
+                return value
+        except ValueError:
+            pass
+        position = text.find(opener, position + 1)
+    return None
+
+def _single_failure_prompt(user_prompt: str, request_details: Dict[str, Any], details: FailureDetails) -> str:
+    http_method, endpoint_path, status_code, error_message = details.as_tuple()
+    
     # Create enhanced analysis prompt for sophisticated constraint detection
-    prompt = f"""
+    return f"""
     You are an expert API constraint analyst. Analyze this API test failure and extract a specific, sophisticated constraint rule.
 
     **CONTEXT:**
@@ -119,13 +213,47 @@ def interpret_failure(user_prompt: str, failed_script: str, request_details: Dic
     **REQUEST DETAILS:**
     HTTP Method: {http_method}
     Endpoint: {endpoint_path}
-    Request Data: {json.dumps(request_details.get('request_body', {}), indent=2)}
+    Request Data: {json.dumps(_request_body_for(request_details, http_method, endpoint_path), indent=2, default=str)}
     
     **FAILURE DETAILS:**
     HTTP Status: {status_code}
     Error Message: {error_message}
     
-    **ANALYSIS TASK:**
+{_analysis_instructions(endpoint_path, "Return a JSON object with this structure:")}    """
+
+def _batch_failure_prompt(user_prompt: str, request_details: Dict[str, Any],
+                          failures: List[FailureDetails]) -> str:
+    sections = []
+    for number, details in enumerate(failures, 1):
+        http_method, endpoint_path, status_code, error_message = details.as_tuple()
+        request_body = _request_body_for(request_details, http_method, endpoint_path)
+        sections.append(f"""
+    **FAILURE {number}:**
+    HTTP Method: {http_method}
+    Endpoint: {endpoint_path}
+    Request Data: {json.dumps(request_body, indent=2, default=str)}
+    HTTP Status: {status_code}
+    Error Message: {error_message}
+""")
+    
+    return f"""
+    You are an expert API constraint analyst. One test run produced {len(failures)} separate API failures.
+    Analyze each failure independently and extract the specific, sophisticated constraint rule behind it.
+
+    **CONTEXT:**
+    User Goal: {user_prompt}
+    {''.join(sections)}
+{_analysis_instructions('endpoint of the failure', BATCH_OUTPUT_FORMAT)}    """
+
+BATCH_OUTPUT_FORMAT = (
+    "Return ONLY a JSON array with exactly one element per failure, in the order given above.\n"
+    "    Each element is null when its failure does not reveal a learnable rule, otherwise an object "
+    "with this structure:"
+)
+
+def _analysis_instructions(endpoint_path: str, output_format: str) -> str:
+    """Constraint categories and the rule structure, shared by the single and batched prompts"""
+    return f"""    **ANALYSIS TASK:**
     Based on the error message, determine what type of sophisticated constraint was violated:
 
     1. **CONDITIONAL REQUIREMENT**: "if field A has value X, then field B is required"
@@ -156,7 +284,7 @@ def interpret_failure(user_prompt: str, failed_script: str, request_details: Dic
     - "field is required", "missing required" → REQUIRED_FIELD
 
     **OUTPUT FORMAT:**
-    Return a JSON object with this structure:
+    {output_format}
     {{
         "rule_description": "Detailed rule description",
         "constraint_type": "conditional_requirement|mutual_exclusivity|format_dependency|business_rule|rate_limiting|required_field",
@@ -208,187 +336,89 @@ def interpret_failure(user_prompt: str, failed_script: str, request_details: Dic
     - Be specific about field names and values
     - Extract exact constraint parameters from the error message
     """
+
+def _constraint_from_inferred(inferred_data: Dict[str, Any]) -> Optional[LearnedConstraint]:
+    """Build a LearnedConstraint from one JSON rule returned by the LLM"""
+    # Validate the inferred rule
+    inferred_rule = EnhancedInferredRule(**inferred_data)
     
-    try:
-        print("🤖 Sending enhanced prompt to Gemini...")
-        response = llm_call_with_timeout(model, prompt, 60)  # 60 second timeout
-        
-        print(f"🤖 LLM Response received ({len(response.text)} chars):")
-        print("=" * 30)
-        print(response.text[:500])
-        print("=" * 30)
-        
-        # Extract JSON from response
-        json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-        if not json_match:
-            print("❌ No JSON found in LLM response")
-            return None
-            
-        json_str = json_match.group()
-        print(f"🔍 Extracted JSON: {json_str}")
-        
-        inferred_data = json.loads(json_str)
-        
-        # Validate the inferred rule
-        inferred_rule = EnhancedInferredRule(**inferred_data)
-        
-        if not inferred_rule.is_learnable:
-            print(f"⚠️ Rule not learnable: {inferred_rule.rule_description}")
-            return None
-        
-        # Convert to LearnedConstraint with enhanced data
-        try:
-            constraint_type = ConstraintType(inferred_rule.constraint_type)
-        except ValueError:
-            print(f"❌ Invalid constraint type: {inferred_rule.constraint_type}")
-            return None
-        
-        # Create the base constraint
-        learned_constraint = LearnedConstraint(
-            constraint_type=constraint_type,
-            affected_parameter=inferred_rule.affected_parameter,
-            endpoint_path=inferred_rule.endpoint_path,
-            rule_description=inferred_rule.rule_description,
-            formal_constraint=inferred_rule.formal_constraint,
-            confidence_score=inferred_rule.confidence
-        )
-        
-        # Add sophisticated constraint details based on type
-        if constraint_type == ConstraintType.CONDITIONAL_REQUIREMENT and inferred_rule.conditional_logic:
-            learned_constraint.conditional_rule = ConditionalRule(
-                condition_field=inferred_rule.conditional_logic['condition_field'],
-                condition_value=inferred_rule.conditional_logic['condition_value'],
-                condition_operator=inferred_rule.conditional_logic['condition_operator'],
-                required_field=inferred_rule.conditional_logic['required_field'],
-                required_value=inferred_rule.conditional_logic.get('required_value')
-            )
-        
-        elif constraint_type == ConstraintType.MUTUAL_EXCLUSIVITY and inferred_rule.exclusivity_info:
-            learned_constraint.exclusivity_rule = MutualExclusivityRule(
-                exclusive_fields=inferred_rule.exclusivity_info['exclusive_fields'],
-                min_required=inferred_rule.exclusivity_info.get('min_required', 1),
-                max_allowed=inferred_rule.exclusivity_info.get('max_allowed', 1)
-            )
-        
-        elif constraint_type == ConstraintType.FORMAT_DEPENDENCY and inferred_rule.format_dependency:
-            learned_constraint.format_dependency = FormatDependencyRule(
-                dependent_field=inferred_rule.format_dependency['dependent_field'],
-                dependency_field=inferred_rule.format_dependency['dependency_field'],
-                dependency_value=inferred_rule.format_dependency['dependency_value'],
-                required_format=inferred_rule.format_dependency['required_format']
-            )
-        
-        elif constraint_type == ConstraintType.BUSINESS_RULE and inferred_rule.business_rule_info:
-            learned_constraint.business_rule = BusinessRule(
-                field=inferred_rule.business_rule_info['field'],
-                rule_type=inferred_rule.business_rule_info['rule_type'],
-                constraint_value=inferred_rule.business_rule_info['constraint_value'],
-                error_message=inferred_rule.business_rule_info.get('error_message', 'Business rule violation')
-            )
-        
-        elif constraint_type == ConstraintType.RATE_LIMITING and inferred_rule.rate_limit_info:
-            learned_constraint.rate_limit_rule = RateLimitRule(
-                endpoint_pattern=inferred_rule.rate_limit_info['endpoint_pattern'],
-                max_requests=inferred_rule.rate_limit_info['max_requests'],
-                time_window_seconds=inferred_rule.rate_limit_info['time_window_seconds'],
-                scope=inferred_rule.rate_limit_info.get('scope', 'per_user')
-            )
-        
-        print(f"✅ Successfully created enhanced learned constraint: {learned_constraint.rule_description}")
-        print(f"   🎯 Constraint Type: {constraint_type.value}")
-        
-        if learned_constraint.conditional_rule:
-            print(f"   🔀 Conditional: if {learned_constraint.conditional_rule.condition_field} {learned_constraint.conditional_rule.condition_operator} {learned_constraint.conditional_rule.condition_value}, then {learned_constraint.conditional_rule.required_field} required")
-        
-        return learned_constraint
-        
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON decode error: {e}")
-        print(f"Raw response: {response.text}")
+    if not inferred_rule.is_learnable:
+        print(f"⚠️ Rule not learnable: {inferred_rule.rule_description}")
         return None
-    except Exception as e:
-        print(f"❌ Error during enhanced failure interpretation: {e}")
+    
+    # Convert to LearnedConstraint with enhanced data
+    try:
+        constraint_type = ConstraintType(inferred_rule.constraint_type)
+    except ValueError:
+        print(f"❌ Invalid constraint type: {inferred_rule.constraint_type}")
         return None
 
-def _extract_failure_details(failure_output: str, failed_script: str) -> tuple:
-    """Extract HTTP method, endpoint, status code, and error message from failure output"""
-    
-    print("🔍 Starting detail extraction...")
-    
-    # Extract HTTP method and endpoint from script
-    http_method = "POST"  # Default
-    endpoint_path = "/users"  # Default
-    
-    # Look for requests.post, requests.get, etc. in the script
-    method_match = re.search(r'requests\.(get|post|put|patch|delete)', failed_script)
-    if method_match:
-        http_method = method_match.group(1).upper()
-        print(f"   Found method: {http_method}")
-    
-    # Look for endpoint in URL
-    url_matches = [
-        re.search(r'f?["\'].*?/([\w/\-]+)["\']', failed_script),
-        re.search(r'/users', failed_script),
-        re.search(r'api_base_url.*?["\']/([\w/\-]+)["\']', failed_script)
-    ]
-    
-    for match in url_matches:
-        if match:
-            if hasattr(match, 'group') and len(match.groups()) > 0:
-                endpoint_path = "/" + match.group(1)
-            else:
-                endpoint_path = "/users"  # fallback
-            print(f"   Found endpoint: {endpoint_path}")
-            break
-    
-    # Extract status code - FIXED: Look for the actual response status, not expected status
-    status_code = None
-    status_patterns = [
-        r'got\s+(\d{3})',  # "got 400" - This should be first priority
-        r'AssertionError.*?got\s+(\d{3})',  # AssertionError with got status
-        r'<Response\s*\[(\d{3})',  # <Response [400
-        r'status_code.*?(\d{3}).*?{',  # status_code: 400 followed by error JSON
-        r'Expected.*?got\s+(\d{3})',  # Expected 201, got 400
-    ]
-    
-    for pattern in status_patterns:
-        match = re.search(pattern, failure_output)
-        if match:
-            status_code = match.group(1)
-            print(f"   Found status code: {status_code}")
-            break
-    
-    # Extract error message with multiple strategies
-    error_message = None
-    
-    # Strategy 1: JSON error messages
-    json_patterns = [
-        r'"error":\s*"([^"]*)"',  # "error": "message"
-        r"'error':\s*'([^']*)'",  # 'error': 'message'
-        r'\{[^}]*"(?:error|message|detail)":\s*"([^"]*)"[^}]*\}',  # Full JSON
-    ]
-    
-    for pattern in json_patterns:
-        match = re.search(pattern, failure_output, re.IGNORECASE)
-        if match:
-            error_message = match.group(1)
-            print(f"   Found JSON error: {error_message}")
-            break
-    
-    # Strategy 2: AssertionError messages
-    if not error_message:
-        assert_patterns = [
-            r'AssertionError:\s*(.+?)(?:\n|$)',
-            r'assert\s+.*?,\s*f?"([^"]*)"',
-            r'AssertionError.*?:\s*(.+)'
-        ]
-        
-        for pattern in assert_patterns:
-            match = re.search(pattern, failure_output)
-            if match:
-                error_message = match.group(1).strip()
-                print(f"   Found assertion error: {error_message}")
-                break
-    
-    print(f"🔍 Final extracted details: {http_method}, {endpoint_path}, {status_code}, {error_message}")
-    return http_method, endpoint_path, status_code, error_message
+    # Create the base constraint
+    learned_constraint = LearnedConstraint(
+        constraint_type=constraint_type,
+        affected_parameter=inferred_rule.affected_parameter,
+        endpoint_path=inferred_rule.endpoint_path,
+        rule_description=inferred_rule.rule_description,
+        formal_constraint=inferred_rule.formal_constraint,
+        confidence_score=inferred_rule.confidence
+    )
+
+    # Add sophisticated constraint details based on type
+    if constraint_type == ConstraintType.CONDITIONAL_REQUIREMENT and inferred_rule.conditional_logic:
+        learned_constraint.conditional_rule = ConditionalRule(
+            condition_field=inferred_rule.conditional_logic['condition_field'],
+            condition_value=inferred_rule.conditional_logic['condition_value'],
+            condition_operator=inferred_rule.conditional_logic['condition_operator'],
+            required_field=inferred_rule.conditional_logic['required_field'],
+            required_value=inferred_rule.conditional_logic.get('required_value')
+        )
+
+    elif constraint_type == ConstraintType.MUTUAL_EXCLUSIVITY and inferred_rule.exclusivity_info:
+        learned_constraint.exclusivity_rule = MutualExclusivityRule(
+            exclusive_fields=inferred_rule.exclusivity_info['exclusive_fields'],
+            min_required=inferred_rule.exclusivity_info.get('min_required', 1),
+            max_allowed=inferred_rule.exclusivity_info.get('max_allowed', 1)
+        )
+
+    elif constraint_type == ConstraintType.FORMAT_DEPENDENCY and inferred_rule.format_dependency:
+        learned_constraint.format_dependency = FormatDependencyRule(
+            dependent_field=inferred_rule.format_dependency['dependent_field'],
+            dependency_field=inferred_rule.format_dependency['dependency_field'],
+            dependency_value=inferred_rule.format_dependency['dependency_value'],
+            required_format=inferred_rule.format_dependency['required_format']
+        )
+
+    elif constraint_type == ConstraintType.BUSINESS_RULE and inferred_rule.business_rule_info:
+        learned_constraint.business_rule = BusinessRule(
+            field=inferred_rule.business_rule_info['field'],
+            rule_type=inferred_rule.business_rule_info['rule_type'],
+            constraint_value=inferred_rule.business_rule_info['constraint_value'],
+            error_message=inferred_rule.business_rule_info.get('error_message', 'Business rule violation')
+        )
+
+    elif constraint_type == ConstraintType.RATE_LIMITING and inferred_rule.rate_limit_info:
+        learned_constraint.rate_limit_rule = RateLimitRule(
+            endpoint_pattern=inferred_rule.rate_limit_info['endpoint_pattern'],
+            max_requests=inferred_rule.rate_limit_info['max_requests'],
+            time_window_seconds=inferred_rule.rate_limit_info['time_window_seconds'],
+            scope=inferred_rule.rate_limit_info.get('scope', 'per_user')
+        )
+
+    print(f"✅ Successfully created enhanced learned constraint: {learned_constraint.rule_description}")
+    print(f"   🎯 Constraint Type: {constraint_type.value}")
+
+    if learned_constraint.conditional_rule:
+        print(f"   🔀 Conditional: if {learned_constraint.conditional_rule.condition_field} {learned_constraint.conditional_rule.condition_operator} {learned_constraint.conditional_rule.condition_value}, then {learned_constraint.conditional_rule.required_field} required")
+
+    return learned_constraint
+
+def _request_body_for(request_details: Dict[str, Any], http_method: str, endpoint_path: str) -> Any:
+    """The body of the script's request matching the failing call, for scripts making several requests"""
+    for request in request_details.get('requests', []):
+        template = request.get('endpoint_path') or ''
+        pattern = re.escape(template).replace(r'\{', '{').replace(r'\}', '}')
+        pattern = re.sub(r'\{[^}]*\}', '[^/]+', pattern)
+        if (request.get('http_method') == http_method and request.get('json_body') is not None
+                and re.fullmatch(pattern, endpoint_path or '')):
+            return request['json_body']
+    return request_details.get('request_body', {})
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Any, Optional, Callable
+
+
+class LLMResponseCache:
+    """
+    On-disk cache of LLM responses keyed by (model name, prompt, generation params).
+
+    Each entry is one JSON file named after the SHA-256 of its key. Reads
+    refresh the file's mtime, so eviction by oldest mtime is LRU; entries
+    older than the TTL are treated as misses and removed.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None, ttl_seconds: Optional[float] = None,
+                 enabled: Optional[bool] = None):
+        self.cache_dir = cache_dir or os.getenv('LLM_CACHE_DIR', '.llm_cache')
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('LLM_CACHE_MAX_ENTRIES', '1000'))
+        self.max_bytes = max_bytes if max_bytes is not None else int(os.getenv('LLM_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('LLM_CACHE_TTL_SECONDS', str(7 * 24 * 3600)))
+        if enabled is None:
+            enabled = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Content hash identifying one LLM request"""
+        payload = json.dumps([model_name, prompt, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, model_name: str, prompt: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Return the cached response text, or None on a miss"""
+        if not self.enabled:
+            return None
+
+        text = self._read_entry(self.make_key(model_name, prompt, params))
+        with self._lock:
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return text
+
+    def put(self, model_name: str, prompt: str, params: Optional[Dict[str, Any]], text: str):
+        """Store a response and evict old entries if the cache is over budget"""
+        if not self.enabled or text is None:
+            return
+
+        key = self.make_key(model_name, prompt, params)
+        entry = {
+            'model': model_name,
+            'params': params or {},
+            'created_at': time.time(),
+            'text': text
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._atomic_write(self._entry_path(key), json.dumps(entry))
+            self._evict()
+        except OSError as e:
+            print(f"⚠️ Could not write LLM cache entry: {e}")
+
+    def delete(self, model_name: str, prompt: str, params: Optional[Dict[str, Any]] = None):
+        """Remove one entry"""
+        with self._lock:
+            self._remove(self._entry_path(self.make_key(model_name, prompt, params)))
+
+    def get_or_generate(self, model_name: str, prompt: str, params: Optional[Dict[str, Any]],
+                        generate: Callable[[], str]) -> str:
+        """Return the cached response, calling generate() and caching its text on a miss"""
+        cached = self.get(model_name, prompt, params)
+        if cached is not None:
+            print("💾 Using cached LLM response")
+            return cached
+
+        text = generate()
+        self.put(model_name, prompt, params, text)
+        return text
+
+    def clear(self):
+        """Remove every cached entry"""
+        with self._lock:
+            for path in self._entry_files():
+                self._remove(path)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        entries = self._entry_files()
+        return {
+            'entries': len(entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'bytes': sum(self._size(path) for path in entries)
+        }
+
+    def _read_entry(self, key: str) -> Optional[str]:
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get('created_at', 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)  # Mark as recently used for LRU eviction
+        except OSError:
+            pass
+        return entry.get('text')
+
+    def _entry_files(self):
+        try:
+            return [entry.path for entry in os.scandir(self.cache_dir)
+                    if entry.is_file() and entry.name.endswith('.json')]
+        except OSError:
+            return []
+
+    def _evict(self):
+        """Drop least recently used entries until both size limits hold"""
+        with self._lock:
+            entries = []
+            for path in self._entry_files():
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+            entries.sort()
+            total_bytes = sum(size for _, size, _ in entries)
+            while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+                _, size, path = entries.pop(0)
+                total_bytes -= size
+                self._remove(path)
+
+    def _atomic_write(self, path: str, content: str):
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except OSError:
+            self._remove(temp_path)
+            raise
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# Global cache instance shared by scribe and interpreter
+response_cache = LLMResponseCache()
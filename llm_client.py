@@ -0,0 +1,85 @@
+from dotenv import load_dotenv
+load_dotenv()
+
+import os
+import threading
+import google.generativeai as genai
+from typing import Dict, Any, Optional
+
+from llm_cache import response_cache
+from llm_executor import llm_executor
+
+MODEL_NAME = os.getenv('LLM_MODEL', 'gemini-1.5-flash')
+
+# One configured client and one model handle per model name for the whole
+# process; genai.configure() builds a new transport every time it is called.
+_client_lock = threading.Lock()
+_configured_api_key: Optional[str] = None
+_models: Dict[str, Any] = {}
+
+
+def get_model(model_name: Optional[str] = None):
+    """Return the shared GenerativeModel, configuring the client on first use"""
+    global _configured_api_key
+    model_name = model_name or MODEL_NAME
+    api_key = os.getenv('GOOGLE_API_KEY')
+
+    with _client_lock:
+        if api_key != _configured_api_key:
+            genai.configure(api_key=api_key)
+            _configured_api_key = api_key
+            _models.clear()
+
+        if model_name not in _models:
+            _models[model_name] = genai.GenerativeModel(model_name)
+        return _models[model_name]
+
+
+def reset_client():
+    """Forget the configured client and model handles (e.g. after a key rotation)"""
+    global _configured_api_key
+    with _client_lock:
+        _configured_api_key = None
+        _models.clear()
+
+
+def _generate(model, prompt: str, generation_config: Optional[Dict[str, Any]], remaining: float):
+    """One generate_content call whose HTTP request gives up when the caller's deadline passes"""
+    return model.generate_content(
+        prompt,
+        generation_config=generation_config,
+        request_options={'timeout': remaining}
+    )
+
+
+def llm_call(prompt: str, timeout: int = 60, generation_config: Optional[Dict[str, Any]] = None,
+             model_name: Optional[str] = None, use_cache: bool = True) -> str:
+    """
+    Send a prompt to the shared model and return the response text.
+
+    Responses go through the on-disk response cache, so an identical
+    request (model, prompt, generation config) never reaches the network twice.
+    Pass use_cache=False for requests that must be answered afresh, such as
+    script generation, where a replayed response would reproduce a script
+    that already failed. Calls run on the shared bounded executor, which
+    enforces the timeout and retries transient errors with backoff.
+    """
+    model_name = model_name or MODEL_NAME
+    model = get_model(model_name)
+
+    def generate() -> str:
+        return llm_executor.call(
+            lambda remaining: _generate(model, prompt, generation_config, remaining), timeout
+        ).text
+
+    if not use_cache:
+        return generate()
+    return response_cache.get_or_generate(model_name, prompt, generation_config, generate)
+
+
+def get_llm_statistics() -> Dict[str, Any]:
+    """Queue depth, in-flight count and outcome counters for LLM calls, plus cache stats"""
+    return {
+        'executor': llm_executor.get_statistics(),
+        'cache': response_cache.get_statistics()
+    }
@@ -0,0 +1,143 @@
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Dict, Any, Callable, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Transient failures worth retrying, matched by class name so this module does
+# not depend on google.api_core being importable.
+RETRYABLE_ERROR_NAMES = {
+    'ResourceExhausted', 'TooManyRequests', 'ServiceUnavailable',
+    'InternalServerError', 'DeadlineExceeded', 'Aborted',
+}
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """Whether an LLM error is transient (rate limiting, overload, dropped connection)"""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+class LLMCallExecutor:
+    """
+    Runs LLM calls on one bounded thread pool.
+
+    At most max_concurrency calls are in flight; the rest wait in the pool's
+    queue. A call that misses its deadline is cancelled if it is still queued,
+    and running calls receive their remaining time so the transport itself
+    gives up and the thread returns to the pool instead of leaking.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None, max_retries: Optional[int] = None,
+                 backoff_base: Optional[float] = None, backoff_max: Optional[float] = None):
+        self.max_concurrency = max_concurrency or int(os.getenv('LLM_MAX_CONCURRENCY', '4'))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('LLM_MAX_RETRIES', '2'))
+        self.backoff_base = backoff_base if backoff_base is not None else float(os.getenv('LLM_BACKOFF_BASE_SECONDS', '1.0'))
+        self.backoff_max = backoff_max if backoff_max is not None else float(os.getenv('LLM_BACKOFF_MAX_SECONDS', '16.0'))
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='llm-call')
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._stats = {'completed': 0, 'failed': 0, 'timeouts': 0, 'retries': 0, 'cancelled': 0}
+
+    def call(self, fn: Callable[[float], T], timeout: float) -> T:
+        """
+        Run fn(remaining_seconds) with retries, raising TimeoutError once the
+        overall deadline passes.
+        """
+        deadline = time.monotonic() + timeout
+        attempt = 0
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._count('timeouts')
+                raise TimeoutError(f"LLM request timed out after {timeout} seconds")
+
+            future = self._submit(fn, deadline)
+            try:
+                result = future.result(timeout=remaining)
+                self._count('completed')
+                return result
+            except FuturesTimeoutError:
+                if future.cancel():
+                    self._count('cancelled')
+                self._count('timeouts')
+                raise TimeoutError(f"LLM request timed out after {timeout} seconds")
+            except Exception as e:
+                delay = self._backoff_delay(attempt)
+                if (not is_retryable_error(e) or attempt >= self.max_retries
+                        or time.monotonic() + delay >= deadline):
+                    self._count('failed')
+                    raise
+                print(f"⚠️ Retryable LLM error ({type(e).__name__}), retrying in {delay:.1f}s...")
+                self._count('retries')
+                time.sleep(delay)
+                attempt += 1
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _submit(self, fn: Callable[[float], T], deadline: float):
+        with self._lock:
+            self._queued += 1
+
+        def run():
+            with self._lock:
+                self._queued -= 1
+                self._in_flight += 1
+            try:
+                # Time spent queued counts against the deadline
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("LLM request deadline passed while queued")
+                return fn(remaining)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+        future = self._pool.submit(run)
+
+        def on_done(done_future):
+            if done_future.cancelled():
+                with self._lock:
+                    self._queued -= 1
+
+        future.add_done_callback(on_done)
+        return future
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._queued
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    def get_statistics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_concurrency': self.max_concurrency,
+                'queue_depth': self._queued,
+                'in_flight': self._in_flight,
+                **self._stats
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Global executor shared by every LLM call in the process
+llm_executor = LLMCallExecutor()
@@ -1,19 +1,29 @@
 # Updated main.py with correct flow and Phase 3 integration
 import yaml
 import os
+import time
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
 from scribe import generate_test_script
-from executor import execute_test_script
-from interpreter import interpret_failure
+from executor import execute_test_script, release_execution_result
+from interpreter import interpret_failures
 from constraint_model import APIConstraintModel, LearnedConstraint
 from error_handler import error_handler, AdaptiveError, ErrorType, ErrorSeverity
+from spec_cache import load_spec, spec_content_hash
+from constraint_store import SQLiteConstraintStore, constraint_to_dict
+from constraint_validator import ConstraintValidator
+from request_extractor import extract_requests
+from script_cache import discard_script
 import json
 
+# How many times a script whose request breaks known rules is regenerated
+# before it is executed anyway (0 disables pre-validation)
+PREVALIDATION_RETRIES = int(os.getenv('PREVALIDATION_RETRIES', '2'))
+
 def load_spec_with_error_handling(spec_path: str) -> dict:
     """Load OpenAPI specification with comprehensive error handling"""
     try:
-        with open(spec_path, 'r') as file:
-            return yaml.safe_load(file)
+        return load_spec(spec_path)
     except FileNotFoundError:
         error = AdaptiveError(
             f"Specification file not found: {spec_path}",
@@ -58,6 +68,235 @@ def load_default_spec() -> dict:
         }
     }
 
+@dataclass
+class LearningSessionResult:
+    """Structured outcome of one in-process learning session"""
+    user_prompt: str
+    constraint_model: Optional[APIConstraintModel]
+    learning_attempts: List[Dict[str, Any]] = field(default_factory=list)
+    successful_attempts: int = 0
+    converged: bool = False
+    duration: float = 0.0
+    error: Optional[str] = None
+    preloaded_constraints: int = 0
+    
+    @property
+    def total_constraints(self) -> int:
+        return len(self.constraint_model.learned_constraints) if self.constraint_model else 0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as learned_model.json, plus session statistics"""
+        progress = _serialize_learning_progress(self.constraint_model) if self.constraint_model else {
+            'total_constraints': 0, 'constraints': {}, 'endpoint_coverage': []
+        }
+        progress.update({
+            'user_prompt': self.user_prompt,
+            'attempts': len(self.learning_attempts),
+            'successful_attempts': self.successful_attempts,
+            'converged': self.converged,
+            'duration': self.duration,
+            'error': self.error,
+            'preloaded_constraints': self.preloaded_constraints
+        })
+        return progress
+
+def run_learning_session(spec, user_prompt: str, max_attempts: int = 5,
+                         constraint_model: Optional[APIConstraintModel] = None,
+                         session_tag: Optional[str] = None,
+                         constraint_store: Optional[SQLiteConstraintStore] = None,
+                         warm_start: bool = True,
+                         executor_backend: Optional[str] = None) -> LearningSessionResult:
+    """
+    Run one learning loop in-process and return its structured result.
+    
+    `spec` is either a spec file path or an already-loaded spec dict. A
+    session_tag keeps generated script names unique when sessions run in
+    parallel. With a constraint_store every change is written back as it
+    happens; with warm_start as well, the constraints it already holds are
+    loaded first, shape generation from attempt 1 and count toward convergence.
+    executor_backend overrides EXECUTOR_BACKEND for running the scripts.
+    """
+    start_time = time.time()
+    
+    if isinstance(spec, str):
+        print(f"📋 Loading specification from {spec}")
+        spec_data = load_spec_with_error_handling(spec)
+    else:
+        spec_data = spec
+    
+    if not spec_data:
+        print("❌ Failed to load specification. Using fallback mode.")
+        spec_data = load_default_spec()
+    
+    # CONSTRAINT MODEL INITIALIZATION (Fixed: Single initialization)
+    if constraint_model is None:
+        constraint_model = safe_constraint_model_initialization(spec_data)
+    
+    if not constraint_model:
+        return LearningSessionResult(
+            user_prompt=user_prompt,
+            constraint_model=None,
+            duration=time.time() - start_time,
+            error="Constraint model could not be initialized"
+        )
+    
+    preloaded = 0
+    if constraint_store:
+        preloaded = constraint_model.attach_store(constraint_store, load=warm_start)
+        if warm_start:
+            print(f"🔥 Warm start: preloaded {preloaded} known constraints for this spec")
+    
+    # LEARNING LOOP PHASE
+    learning_attempts = []
+    successful_attempts = 0
+    validator = ConstraintValidator(constraint_model)
+    learned_constraints_count = 0  # Track learned constraints
+    
+    print(f"🎯 Goal: {user_prompt}")
+    print(f"🔄 Maximum learning attempts: {max_attempts}")
+    print("=" * 60)
+    
+    for attempt in range(1, max_attempts + 1):
+        print(f"\n🔄 Learning Attempt {attempt}/{max_attempts}")
+        
+        try:
+            # Generate test script
+            print("📝 Generating test script with current constraints...")
+            generated_script_data = generate_test_script_with_error_handling(
+                spec_data, user_prompt, constraint_model
+            )
+            
+            if 'error' in generated_script_data:
+                print(f"❌ Script generation failed: {generated_script_data['error']}")
+                continue
+            
+            # Requests that break already-learned rules are regenerated before execution
+            generated_script_data, violations = _prevalidate_generated_script(
+                spec_data, user_prompt, constraint_model, generated_script_data, validator
+            )
+            
+            generated_script = generated_script_data['script']
+            if session_tag:
+                script_file = f"generated_test_{session_tag}_{attempt}.py"
+            else:
+                script_file = f"generated_test_{attempt}.py"
+            
+            # Save script
+            try:
+                with open(script_file, 'w', encoding='utf-8') as f:
+                    f.write(generated_script)
+                print(f"💾 Script saved to {script_file}")
+            except Exception as e:
+                error = AdaptiveError(
+                    f"Failed to save test script: {e}",
+                    ErrorType.FILE_SYSTEM,
+                    ErrorSeverity.MEDIUM,
+                    context={'script_file': script_file}
+                )
+                error_handler.handle_error(error)
+                continue
+            
+            # Execute test
+            print("🧪 Executing test script...")
+            execution_result = execute_test_script_with_error_handling(script_file, executor_backend)
+            
+            # Track attempt details
+            attempt_data = {
+                'attempt_number': attempt,
+                'script_file': script_file,
+                'execution_successful': execution_result['success'],
+                'learned_constraint': None
+            }
+            if violations:
+                attempt_data['prevalidation_violations'] = [str(violation) for violation in violations]
+            if execution_result.get('execution'):
+                attempt_data['request_latencies_ms'] = execution_result['execution'].request_latencies_ms
+            
+            if execution_result['success']:
+                print("✅ Test passed! No learning needed from this attempt.")
+                successful_attempts += 1
+                _update_successful_constraints(constraint_model, generated_script_data)
+            else:
+                print("❌ Test failed. Analyzing failure for learning opportunities...")
+                # A failing script must not be replayed on the next attempt
+                if generated_script_data.get('fingerprint'):
+                    discard_script(generated_script_data['fingerprint'])
+                
+                # Extract request details and interpret every failure of the run
+                request_details = _extract_request_details_from_script(generated_script)
+                constraints = interpret_failures_with_error_handling(
+                    user_prompt, 
+                    generated_script, 
+                    request_details,
+                    execution_result.get('output') or execution_result.get('output_file', ''),
+                    execution=execution_result.get('execution')
+                )
+                
+                learned, reinforced = _upsert_constraints(constraint_model, constraints)
+                if learned:
+                    # Only genuinely new rules count against convergence
+                    attempt_data['learned_constraint'] = learned[0]
+                    attempt_data['learned_constraints'] = learned
+                    learned_constraints_count += len(learned)
+                if reinforced:
+                    attempt_data['reinforced_constraints'] = reinforced
+                
+                events = [("🧠 New constraint learned", c) for c in learned]
+                events += [("🔁 Reinforced known constraint", c) for c in reinforced]
+                for label, learned_constraint in events:
+                    print(f"{label}: {learned_constraint.rule_description}")
+                    print(f"   📍 Endpoint: {learned_constraint.endpoint_path}")
+                    print(f"   🎯 Parameter: {learned_constraint.affected_parameter}")
+                    print(f"   📊 Confidence: {learned_constraint.confidence_score:.2f}")
+                if not constraints:
+                    print("🤔 No learnable constraint found from this failure.")
+            
+            # The captured output is no longer needed once interpreted
+            release_execution_result(execution_result)
+            learning_attempts.append(attempt_data)
+            
+            # Check for convergence
+            if has_converged(learning_attempts, preloaded_constraints=preloaded):
+                print("\n🎉 Learning has converged! The model has stabilized.")
+                break
+            
+            # Show current learning state
+            total_constraints = len(constraint_model.learned_constraints)
+            print(f"📈 Current knowledge: {total_constraints} learned constraints")
+            
+            # Clean up script file
+            try:
+                if os.path.exists(script_file):
+                    os.remove(script_file)
+            except Exception as e:
+                error = AdaptiveError(
+                    f"Failed to clean up script file: {e}",
+                    ErrorType.FILE_SYSTEM,
+                    ErrorSeverity.LOW,
+                    context={'script_file': script_file}
+                )
+                error_handler.handle_error(error)
+            
+        except Exception as e:
+            error = AdaptiveError(
+                f"Unexpected error in learning attempt {attempt}: {e}",
+                ErrorType.TEST_EXECUTION,
+                ErrorSeverity.MEDIUM,
+                context={'attempt': attempt, 'traceback': str(e)}
+            )
+            error_handler.handle_error(error)
+            continue
+    
+    return LearningSessionResult(
+        user_prompt=user_prompt,
+        constraint_model=constraint_model,
+        learning_attempts=learning_attempts,
+        successful_attempts=successful_attempts,
+        converged=has_converged(learning_attempts, preloaded_constraints=preloaded),
+        duration=time.time() - start_time,
+        preloaded_constraints=preloaded
+    )
+
 def main():
     """Enhanced main function with Phase 3 pattern discovery integration"""
     try:
@@ -67,138 +306,39 @@ def main():
         config = {
             'spec_path': os.getenv('SPEC_PATH', "specs/spec_enhanced_flawed.yaml"),  # Updated default
             'max_attempts': int(os.getenv('MAX_ATTEMPTS', '5')),
-            'user_prompt': os.getenv('USER_PROMPT', "Create a new user with valid data and verify the response")
+            'user_prompt': os.getenv('USER_PROMPT', "Create a new user with valid data and verify the response"),
+            'executor_workers': int(os.getenv('EXECUTOR_WORKERS', '0')),
+            'warm_start': os.getenv('WARM_START', 'true').lower() == 'true',
+            # Persisting learned constraints across runs is opt-in
+            'constraint_store_path': os.getenv('CONSTRAINT_STORE_PATH')
         }
         
+        if config['executor_workers']:
+            print(f"🏊 Executing scripts on a pool of {config['executor_workers']} warm pytest workers")
+        
         print(f"📋 Loading specification from {config['spec_path']}")
         spec_data = load_spec_with_error_handling(config['spec_path'])
         
-        if not spec_data:
-            print("❌ Failed to load specification. Using fallback mode.")
-            spec_data = load_default_spec()
+        # Stored knowledge is keyed by spec content, so edits to the spec start fresh
+        constraint_store = None
+        if spec_data and config['constraint_store_path']:
+            constraint_store = _open_constraint_store(spec_content_hash(spec_data), config['constraint_store_path'])
         
-        # 2. CONSTRAINT MODEL INITIALIZATION (Fixed: Single initialization)
-        constraint_model = safe_constraint_model_initialization(spec_data)
+        # 2-3. CONSTRAINT MODEL INITIALIZATION AND LEARNING LOOP
+        try:
+            session = run_learning_session(
+                spec_data, config['user_prompt'], config['max_attempts'],
+                constraint_store=constraint_store, warm_start=config['warm_start']
+            )
+        finally:
+            if constraint_store:
+                constraint_store.close()
+        constraint_model = session.constraint_model
         
         if not constraint_model:
             print("⚠️ Proceeding without constraint model (limited functionality)")
             return
         
-        # 3. LEARNING LOOP PHASE
-        learning_attempts = []
-        successful_attempts = 0
-        learned_constraints_count = 0  # Track learned constraints
-        
-        print(f"🎯 Goal: {config['user_prompt']}")
-        print(f"🔄 Maximum learning attempts: {config['max_attempts']}")
-        print("=" * 60)
-        
-        for attempt in range(1, config['max_attempts'] + 1):
-            print(f"\n🔄 Learning Attempt {attempt}/{config['max_attempts']}")
-            
-            try:
-                # Generate test script
-                print("📝 Generating test script with current constraints...")
-                generated_script_data = generate_test_script_with_error_handling(
-                    spec_data, config['user_prompt'], constraint_model
-                )
-                
-                if 'error' in generated_script_data:
-                    print(f"❌ Script generation failed: {generated_script_data['error']}")
-                    continue
-                
-                generated_script = generated_script_data['script']
-                script_file = f"generated_test_{attempt}.py"
-                
-                # Save script
-                try:
-                    with open(script_file, 'w', encoding='utf-8') as f:
-                        f.write(generated_script)
-                    print(f"💾 Script saved to {script_file}")
-                except Exception as e:
-                    error = AdaptiveError(
-                        f"Failed to save test script: {e}",
-                        ErrorType.FILE_SYSTEM,
-                        ErrorSeverity.MEDIUM,
-                        context={'script_file': script_file}
-                    )
-                    error_handler.handle_error(error)
-                    continue
-                
-                # Execute test
-                print("🧪 Executing test script...")
-                execution_result = execute_test_script_with_error_handling(script_file)
-                
-                # Track attempt details
-                attempt_data = {
-                    'attempt_number': attempt,
-                    'script_file': script_file,
-                    'execution_successful': execution_result['success'],
-                    'learned_constraint': None
-                }
-                
-                if execution_result['success']:
-                    print("✅ Test passed! No learning needed from this attempt.")
-                    successful_attempts += 1
-                    _update_successful_constraints(constraint_model, generated_script_data)
-                else:
-                    print("❌ Test failed. Analyzing failure for learning opportunities...")
-                    
-                    # Extract request details and interpret failure
-                    request_details = _extract_request_details_from_script(generated_script)
-                    learned_constraint = interpret_failure_with_error_handling(
-                        config['user_prompt'], 
-                        generated_script, 
-                        request_details,
-                        execution_result.get('output_file', '')
-                    )
-                    
-                    if learned_constraint:
-                        constraint_id = constraint_model.add_constraint(learned_constraint)
-                        attempt_data['learned_constraint'] = learned_constraint
-                        learned_constraints_count += 1  # Increment counter
-                        
-                        print(f"🧠 New constraint learned: {learned_constraint.rule_description}")
-                        print(f"   📍 Endpoint: {learned_constraint.endpoint_path}")
-                        print(f"   🎯 Parameter: {learned_constraint.affected_parameter}")
-                        print(f"   📊 Confidence: {learned_constraint.confidence_score:.2f}")
-                    else:
-                        print("🤔 No learnable constraint found from this failure.")
-                
-                learning_attempts.append(attempt_data)
-                
-                # Check for convergence
-                if has_converged(learning_attempts):
-                    print("\n🎉 Learning has converged! The model has stabilized.")
-                    break
-                
-                # Show current learning state
-                total_constraints = len(constraint_model.learned_constraints)
-                print(f"📈 Current knowledge: {total_constraints} learned constraints")
-                
-                # Clean up script file
-                try:
-                    if os.path.exists(script_file):
-                        os.remove(script_file)
-                except Exception as e:
-                    error = AdaptiveError(
-                        f"Failed to clean up script file: {e}",
-                        ErrorType.FILE_SYSTEM,
-                        ErrorSeverity.LOW,
-                        context={'script_file': script_file}
-                    )
-                    error_handler.handle_error(error)
-                
-            except Exception as e:
-                error = AdaptiveError(
-                    f"Unexpected error in learning attempt {attempt}: {e}",
-                    ErrorType.TEST_EXECUTION,
-                    ErrorSeverity.MEDIUM,
-                    context={'attempt': attempt, 'traceback': str(e)}
-                )
-                error_handler.handle_error(error)
-                continue
-        
         # 4. PHASE 3: ADVANCED PATTERN ANALYSIS (Fixed: Correct placement and condition)
         total_learned_constraints = len(constraint_model.learned_constraints)
         if total_learned_constraints > 0:
@@ -212,7 +352,7 @@ def main():
             pattern_discovery = None
         
         # 5. FINAL SUMMARY PHASE
-        print_final_summary(learning_attempts, constraint_model, successful_attempts, pattern_discovery)
+        print_final_summary(session.learning_attempts, constraint_model, session.successful_attempts, pattern_discovery)
         
     except Exception as e:
         error = AdaptiveError(
@@ -362,10 +502,10 @@ def generate_test_script_with_error_handling(spec_data, user_prompt, constraint_
         else:
             return {'error': str(e), 'user_prompt': user_prompt}
 
-def execute_test_script_with_error_handling(script_file):
+def execute_test_script_with_error_handling(script_file, backend=None):
     """Execute test script with error handling"""
     try:
-        return execute_test_script(script_file)
+        return execute_test_script(script_file, backend=backend)
     except Exception as e:
         error = AdaptiveError(
             f"Test execution failed: {e}",
@@ -382,32 +522,53 @@ def execute_test_script_with_error_handling(script_file):
             'recovered': recovery_result is not None
         }
 
-def interpret_failure_with_error_handling(user_prompt, failed_script, request_details, failure_context_path):
-    """Interpret failure with error handling"""
+def interpret_failures_with_error_handling(user_prompt, failed_script, request_details, failure_context,
+                                           execution=None):
+    """Interpret every failure of a run with error handling, returning a list of constraints"""
     try:
-        return interpret_failure(user_prompt, failed_script, request_details, failure_context_path)
+        return interpret_failures(user_prompt, failed_script, request_details, failure_context,
+                                  execution=execution)
     except TimeoutError as e:
         error = AdaptiveError(
             f"Failure interpretation timed out: {e}",
             ErrorType.CONSTRAINT_PARSING,
             ErrorSeverity.MEDIUM,
-            context={'raw_response': failure_context_path, 'timeout': True}
+            context={'raw_response': str(failure_context), 'timeout': True}
         )
         recovery_result = error_handler.handle_error(error)
-        return recovery_result
+        return recovery_result or []
     except Exception as e:
         error = AdaptiveError(
             f"Failure interpretation failed: {e}",
             ErrorType.CONSTRAINT_PARSING,
             ErrorSeverity.MEDIUM,
-            context={'raw_response': failure_context_path}
+            context={'raw_response': str(failure_context)}
         )
         recovery_result = error_handler.handle_error(error)
-        return recovery_result
+        return recovery_result or []
+
+def _upsert_constraints(constraint_model: APIConstraintModel, constraints: List[LearnedConstraint]):
+    """Merge interpreted constraints into the model, returning (new constraints, reinforced known ones)"""
+    learned, reinforced = [], []
+    for constraint in constraints:
+        constraint_id, created = constraint_model.upsert_constraint(constraint)
+        if created:
+            learned.append(constraint)
+        else:
+            known = constraint_model.learned_constraints[constraint_id]
+            if all(known is not existing for existing in reinforced):
+                reinforced.append(known)
+    return learned, reinforced
 
-def has_converged(recent_attempts: list, window_size: int = 3) -> bool:
-    """Check if learning has converged with error handling"""
+def has_converged(recent_attempts: list, window_size: int = 3, preloaded_constraints: int = 0) -> bool:
+    """
+    Check if learning has converged with error handling.
+    
+    Constraints preloaded from earlier runs stand in for stable attempts, so
+    a warm-started session needs fewer quiet attempts to converge.
+    """
     try:
+        window_size = max(1, window_size - min(preloaded_constraints, window_size - 1))
         if len(recent_attempts) < window_size:
             return False
         
@@ -429,22 +590,7 @@ def has_converged(recent_attempts: list, window_size: int = 3) -> bool:
 def save_learning_progress(constraint_model: APIConstraintModel, output_file: str = "learned_model.json"):
     """Save learning progress with error handling"""
     try:
-        progress_data = {
-            'total_constraints': len(constraint_model.learned_constraints),
-            'constraints': {},
-            'endpoint_coverage': list(constraint_model.endpoint_rules.keys())
-        }
-        
-        for constraint_id, constraint in constraint_model.learned_constraints.items():
-            progress_data['constraints'][constraint_id] = {
-                'rule_description': constraint.rule_description,
-                'constraint_type': constraint.constraint_type.value,
-                'affected_parameter': constraint.affected_parameter,
-                'endpoint_path': constraint.endpoint_path,
-                'confidence_score': constraint.confidence_score,
-                'success_count': constraint.success_count,
-                'failure_count': constraint.failure_count
-            }
+        progress_data = _serialize_learning_progress(constraint_model)
         
         with open(output_file, 'w') as f:
             json.dump(progress_data, f, indent=2)
@@ -460,20 +606,51 @@ def save_learning_progress(constraint_model: APIConstraintModel, output_file: st
         )
         error_handler.handle_error(error)
 
+def _open_constraint_store(namespace: str, db_path: Optional[str] = None) -> Optional[SQLiteConstraintStore]:
+    """Open the durable constraint store, continuing without persistence if it is unavailable"""
+    try:
+        return SQLiteConstraintStore(db_path=db_path, namespace=namespace)
+    except Exception as e:
+        error = AdaptiveError(
+            f"Failed to open constraint store: {e}",
+            ErrorType.FILE_SYSTEM,
+            ErrorSeverity.LOW,
+            context={'namespace': namespace, 'db_path': db_path}
+        )
+        error_handler.handle_error(error)
+        return None
+
+def _serialize_learning_progress(constraint_model: APIConstraintModel) -> Dict[str, Any]:
+    """Summarize the learned constraints in the learned_model.json format"""
+    progress_data = {
+        'total_constraints': len(constraint_model.learned_constraints),
+        'constraints': {},
+        'endpoint_coverage': list(constraint_model.endpoint_rules.keys())
+    }
+    
+    for constraint_id, constraint in constraint_model.learned_constraints.items():
+        progress_data['constraints'][constraint_id] = constraint_to_dict(constraint)
+    
+    return progress_data
+
 def _extract_request_details_from_script(script: str) -> dict:
-    """Extract request details from script with error handling"""
+    """
+    Extract request details from script with error handling
+    
+    The script is analysed statically and never executed. 'requests' lists
+    every requests call it makes; the top-level keys describe the first one
+    sending a JSON object body (or the first call).
+    """
     try:
-        request_details = {'request_body': {}}
-        
-        import re
-        json_match = re.search(r'json\s*=\s*(\{[^}]*\})', script)
-        if json_match:
-            try:
-                request_details['request_body'] = eval(json_match.group(1))
-            except:
-                request_details['request_body'] = json_match.group(1)
-        
-        return request_details
+        extracted = extract_requests(script)
+        primary = next((request for request in extracted if isinstance(request.json_body, dict)),
+                       extracted[0] if extracted else None)
+        return {
+            'request_body': primary.json_body if primary and primary.json_body is not None else {},
+            'http_method': primary.http_method if primary else 'POST',
+            'endpoint_path': (primary.endpoint_path if primary else None) or '/users',
+            'requests': [request.to_dict() for request in extracted]
+        }
     except Exception as e:
         error = AdaptiveError(
             f"Failed to extract request details: {e}",\
@@ -482,15 +659,63 @@ def _extract_request_details_from_script(script: str) -> dict:
             context={'script_length': len(script)}
         )
         error_handler.handle_error(error)
-        return {'request_body': {}}
+        return {'request_body': {}, 'http_method': 'POST', 'endpoint_path': '/users', 'requests': []}
+
+def _find_request_violations(script: str, validator: ConstraintValidator) -> list:
+    """Learned constraints broken by the JSON bodies of requests in tests that expect success"""
+    violations = []
+    for request in extract_requests(script):
+        # Negative tests break rules on purpose
+        if not request.expects_success or not isinstance(request.json_body, dict) or not request.json_body:
+            continue
+        violations.extend(validator.validate(request.endpoint_path or '/users', request.json_body))
+    return violations
+
+def _prevalidate_generated_script(spec_data, user_prompt: str, constraint_model: APIConstraintModel,
+                                  script_data: dict, validator: ConstraintValidator,
+                                  max_regenerations: Optional[int] = None) -> tuple:
+    """
+    Check a generated script's request against the learned constraints.
+    
+    A script that would fail on a known rule is regenerated with the broken
+    rules spelled out, up to PREVALIDATION_RETRIES times. Returns the script
+    data to execute and the violations it still has.
+    """
+    if max_regenerations is None:
+        max_regenerations = PREVALIDATION_RETRIES
+    if max_regenerations <= 0:
+        return script_data, []
+    
+    violations = _find_request_violations(script_data['script'], validator)
+    for _ in range(max_regenerations):
+        if not violations:
+            break
+        print(f"🛡️ Request breaks {len(violations)} known constraint(s); regenerating before execution")
+        for violation in violations:
+            print(f"   ⛔ {violation}")
+        
+        rules = "\n".join(f"- {violation}" for violation in violations)
+        retry_data = generate_test_script_with_error_handling(
+            spec_data,
+            f"{user_prompt}\n\nThe previous request broke these learned rules; the request body must satisfy them:\n{rules}",
+            constraint_model
+        )
+        if 'error' in retry_data:
+            break
+        script_data = dict(retry_data, user_prompt=user_prompt)
+        violations = _find_request_violations(script_data['script'], validator)
+    
+    if violations:
+        print(f"⚠️ Executing despite {len(violations)} known constraint violation(s)")
+    return script_data, violations
 
 def _update_successful_constraints(constraint_model: APIConstraintModel, script_data: dict):
     """Update constraint confidence with error handling"""
     try:
         if script_data.get('enhanced_spec_used'):
-            for constraint in constraint_model.learned_constraints.values():
+            for constraint_id, constraint in list(constraint_model.learned_constraints.items()):
                 if constraint.confidence_score > 0.7:
-                    constraint.update_confidence(success=True)
+                    constraint_model.update_confidence(constraint_id, success=True)
     except Exception as e:
         error = AdaptiveError(
             f"Failed to update constraint confidence: {e}",
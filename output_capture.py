@@ -0,0 +1,187 @@
+"""
+Bounded, memory-first capture of test execution output.
+
+Executor output used to be written to a NamedTemporaryFile(delete=False) per
+run that nothing removed. CapturedOutput keeps the text in memory and only
+spills it to a temp file above OUTPUT_SPOOL_THRESHOLD characters. Runaway
+output is cut down to its head and tail at OUTPUT_MAX_CHARS while it is being
+produced: BoundedCapture is the stream workers write into, and read_bounded
+reads a subprocess's output file without loading the middle. Spilled files
+are deleted by cleanup(), on context exit, or at the latest when the object
+is garbage collected.
+"""
+
+import io
+import os
+import tempfile
+import weakref
+from collections import deque
+from typing import BinaryIO, Optional
+
+OUTPUT_SPOOL_THRESHOLD = int(os.getenv('OUTPUT_SPOOL_THRESHOLD', str(1024 * 1024)))
+OUTPUT_MAX_CHARS = int(os.getenv('OUTPUT_MAX_CHARS', str(8 * 1024 * 1024)))
+# Characters of stdout/stderr kept on an execution result next to its CapturedOutput
+OUTPUT_TAIL_CHARS = int(os.getenv('OUTPUT_TAIL_CHARS', '4096'))
+
+SPILL_PREFIX = 'echidna_output_'
+
+
+def bound_text(text: str, max_chars: Optional[int] = None) -> str:
+    """Keep the head and tail of text longer than max_chars, marking the cut"""
+    max_chars = OUTPUT_MAX_CHARS if max_chars is None else max_chars
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text
+    head = max_chars // 2
+    tail = max_chars - head
+    return _mark_cut(text[:head], text[-tail:], len(text) - head - tail)
+
+
+def tail_text(text: str, max_chars: Optional[int] = None) -> str:
+    """The last max_chars (OUTPUT_TAIL_CHARS) characters of text"""
+    max_chars = OUTPUT_TAIL_CHARS if max_chars is None else max_chars
+    return text[-max_chars:] if max_chars > 0 else text
+
+
+def _mark_cut(head: str, tail: str, omitted: int, unit: str = 'characters') -> str:
+    return f"{head}\n... [{omitted} {unit} truncated] ...\n{tail}"
+
+
+def read_bounded(f: BinaryIO, max_chars: Optional[int] = None) -> str:
+    """
+    Decode a binary output file, reading only its first and last bytes when
+    it is longer than max_chars (OUTPUT_MAX_CHARS)
+    """
+    max_chars = OUTPUT_MAX_CHARS if max_chars is None else max_chars
+    size = f.seek(0, os.SEEK_END)
+    f.seek(0)
+    if max_chars <= 0 or size <= max_chars:
+        return f.read().decode('utf-8', errors='replace')
+    head = f.read(max_chars // 2)
+    tail_size = max_chars - len(head)
+    f.seek(size - tail_size)
+    tail = f.read(tail_size)
+    return _mark_cut(head.decode('utf-8', errors='replace'), tail.decode('utf-8', errors='replace'),
+                     size - len(head) - tail_size, 'bytes')
+
+
+class BoundedCapture(io.TextIOBase):
+    """
+    Text stream for redirect_stdout/redirect_stderr that keeps only the head
+    and tail of what is written, so memory stays bounded however much a
+    script prints. getvalue() returns what bound_text would have.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        super().__init__()
+        self.max_chars = OUTPUT_MAX_CHARS if max_chars is None else max_chars
+        self._head_limit = self.max_chars // 2 if self.max_chars > 0 else None
+        self._tail_limit = self.max_chars - self.max_chars // 2
+        self._head = []
+        self._head_size = 0
+        self._tail = deque()
+        self._tail_size = 0
+        self.total = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        written = len(text)
+        self.total += written
+        if self._head_limit is None or self._head_size < self._head_limit:
+            room = written if self._head_limit is None else self._head_limit - self._head_size
+            self._head.append(text[:room])
+            self._head_size += len(text[:room])
+            text = text[room:]
+        if text:
+            self._tail.append(text)
+            self._tail_size += len(text)
+            # Drop whole chunks that lie entirely before the tail window
+            while self._tail_size - len(self._tail[0]) >= self._tail_limit:
+                self._tail_size -= len(self._tail.popleft())
+            if self._tail_size > 2 * self._tail_limit:
+                kept = ''.join(self._tail)[-self._tail_limit:]
+                self._tail = deque([kept])
+                self._tail_size = len(kept)
+        return written
+
+    def getvalue(self) -> str:
+        head = ''.join(self._head)
+        tail = ''.join(self._tail)
+        if self._head_limit is None or self.total <= self.max_chars:
+            return head + tail
+        tail = tail[-self._tail_limit:]
+        return _mark_cut(head, tail, self.total - len(head) - len(tail))
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class CapturedOutput:
+    """Execution output held in memory, or in a temp file once it is large"""
+
+    def __init__(self, text: str, spool_threshold: Optional[int] = None, max_chars: Optional[int] = None):
+        spool_threshold = OUTPUT_SPOOL_THRESHOLD if spool_threshold is None else spool_threshold
+        text = bound_text(text, max_chars)
+        self.size = len(text)
+        self._text: Optional[str] = text
+        self._path: Optional[str] = None
+        self._finalizer = None
+
+        if self.size > spool_threshold:
+            self._write_file(text)
+            self._text = None
+
+    def _write_file(self, text: str):
+        fd, path = tempfile.mkstemp(prefix=SPILL_PREFIX, suffix='.txt')
+        with os.fdopen(fd, 'w', encoding='utf-8', errors='replace') as f:
+            f.write(text)
+        self._path = path
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    @property
+    def spilled(self) -> bool:
+        """True when the text lives in a temp file rather than in memory"""
+        return self._text is None
+
+    @property
+    def path(self) -> str:
+        """
+        A file holding the output, for callers that need a path.
+
+        In-memory output is written out on demand; the file is removed by
+        cleanup() like a spilled one.
+        """
+        if self._path is None:
+            self._write_file(self._text or '')
+        return self._path
+
+    def read(self) -> str:
+        if self._text is not None:
+            return self._text
+        if self._path is None:
+            return ''
+        with open(self._path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+
+    def cleanup(self):
+        """Delete any temp file; in-memory text stays readable"""
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        if self._text is None:
+            self._text = ''
+        self._path = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __enter__(self) -> 'CapturedOutput':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cleanup()
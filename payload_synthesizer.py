@@ -0,0 +1,374 @@
+"""
+Local synthesis of request bodies and test scripts from learned constraints.
+
+Once an endpoint's rules are known, a valid payload follows from the OpenAPI
+schema plus the learned constraints: start from the schema's required fields,
+apply every active rule, and repair whatever ConstraintValidator still
+reports. Each rule also yields one deliberately invalid body. The emitted
+pytest script has the shape of scribe's fallback script but covers every
+operation the prompt asks for, so regression runs on stabilized APIs need no
+LLM call.
+"""
+
+import copy
+import re
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Tuple
+
+from constraint_model import APIConstraintModel, ConstraintType, LearnedConstraint
+from constraint_validator import ConstraintValidator, ConstraintViolation, MIN_CONFIDENCE
+from prompt_context import prompt_methods
+
+HTTP_METHODS = ('get', 'post', 'put', 'patch', 'delete')
+BODY_METHODS = ('post', 'put', 'patch')
+
+FORMAT_SAMPLES = {
+    'email': 'jane.doe@example.com',
+    'url': 'https://example.com',
+    'uri': 'https://example.com',
+    'uuid': '123e4567-e89b-12d3-a456-426614174000',
+    'date': '2024-01-15',
+    'date-time': '2024-01-15T10:30:00Z',
+    'phone': '+15550100123',
+}
+
+NAME_SAMPLES = {
+    'name': 'Jane Doe',
+    'username': 'janedoe',
+    'email': 'jane.doe@example.com',
+    'phone': '+15550100123',
+}
+
+INVALID_FORMAT_VALUE = 'not-a-valid-value'
+
+# Enough rounds for rules that unlock further rules (a condition adding a field with its own format)
+MAX_REPAIR_ROUNDS = 5
+
+
+@dataclass
+class InvalidCase:
+    constraint_id: str
+    field: str
+    description: str
+    body: Dict[str, Any]
+
+
+def _resolve(node: Any, spec: Dict[str, Any], depth: int = 0) -> Any:
+    """Follow local $refs ('#/components/schemas/User')"""
+    while isinstance(node, dict) and '$ref' in node and depth < 20:
+        target = spec
+        for part in node['$ref'].lstrip('#/').split('/'):
+            target = target.get(part, {}) if isinstance(target, dict) else {}
+        node = target
+        depth += 1
+    return node if isinstance(node, dict) else {}
+
+
+def request_schema(operation: Dict[str, Any], spec: Dict[str, Any]) -> Dict[str, Any]:
+    """The operation's JSON request body schema, with $refs resolved"""
+    body = _resolve(operation.get('requestBody', {}), spec)
+    media = body.get('content', {}).get('application/json', {})
+    return _resolve(media.get('schema', {}), spec)
+
+
+def _bounds_for(constraint: LearnedConstraint) -> Dict[str, Any]:
+    bounds = dict(constraint.formal_constraint)
+    rule = constraint.business_rule
+    if rule is not None and isinstance(rule.constraint_value, (int, float)):
+        key = {'min_value': 'minimum', 'max_value': 'maximum'}.get(rule.rule_type)
+        if key and not ({'exclusiveMinimum', 'exclusiveMaximum'} & set(bounds)):
+            bounds.setdefault(key, rule.constraint_value)
+    return bounds
+
+
+def sample_value(field_name: str, schema: Optional[Dict[str, Any]] = None,
+                 bounds: Optional[Dict[str, Any]] = None) -> Any:
+    """A value for a field that satisfies its schema keywords and learned bounds"""
+    keywords = dict(schema or {})
+    keywords.update({key: value for key, value in (bounds or {}).items() if value is not None})
+
+    if keywords.get('enum'):
+        return keywords['enum'][0]
+    if 'example' in keywords:
+        return keywords['example']
+
+    value_type = keywords.get('type')
+    numeric_keys = {'minimum', 'maximum', 'exclusiveMinimum', 'exclusiveMaximum'}
+    if value_type in ('integer', 'number') or (value_type is None and numeric_keys & set(keywords)):
+        step = 1 if value_type != 'number' else 0.5
+        low = keywords.get('minimum', keywords.get('exclusiveMinimum', 0) + step if 'exclusiveMinimum' in keywords else None)
+        high = keywords.get('maximum', keywords.get('exclusiveMaximum', 0) - step if 'exclusiveMaximum' in keywords else None)
+        if low is not None:
+            value = low
+        elif high is not None:
+            value = min(high, 1)
+        else:
+            value = 1
+        return int(value) if value_type == 'integer' else value
+    if value_type == 'boolean':
+        return True
+    if value_type == 'array':
+        return [sample_value(field_name, keywords.get('items') or {'type': 'string'})]
+    if value_type == 'object':
+        return {}
+
+    required_format = str(keywords.get('format', '')).lower()
+    value = FORMAT_SAMPLES.get(required_format) or NAME_SAMPLES.get(field_name) or f"test_{field_name}"
+    if 'maxLength' in keywords:
+        value = value[:max(int(keywords['maxLength']), 0)]
+    if 'minLength' in keywords and len(value) < int(keywords['minLength']):
+        value = value + 'x' * (int(keywords['minLength']) - len(value))
+    return value
+
+
+def _out_of_bounds(bounds: Dict[str, Any]) -> Optional[Any]:
+    """A value breaking the first bound present"""
+    if 'minimum' in bounds:
+        return bounds['minimum'] - 1
+    if 'exclusiveMinimum' in bounds:
+        return bounds['exclusiveMinimum']
+    if 'maximum' in bounds:
+        return bounds['maximum'] + 1
+    if 'exclusiveMaximum' in bounds:
+        return bounds['exclusiveMaximum']
+    if 'minLength' in bounds and int(bounds['minLength']) > 0:
+        return 'x' * (int(bounds['minLength']) - 1)
+    if 'maxLength' in bounds:
+        return 'x' * (int(bounds['maxLength']) + 1)
+    if bounds.get('enum'):
+        return INVALID_FORMAT_VALUE
+    if bounds.get('format'):
+        return INVALID_FORMAT_VALUE
+    return None
+
+
+class PayloadSynthesizer:
+    """Builds valid and invalid request bodies for the operations of a spec"""
+
+    def __init__(self, spec: Dict[str, Any], constraint_model: Optional[APIConstraintModel] = None):
+        self.spec = spec
+        self.constraint_model = constraint_model or APIConstraintModel(spec)
+        self.validator = ConstraintValidator(self.constraint_model)
+
+    def operations(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        return [
+            (path, method, operation)
+            for path, path_item in (self.spec.get('paths') or {}).items() if isinstance(path_item, dict)
+            for method, operation in path_item.items() if method in HTTP_METHODS and isinstance(operation, dict)
+        ]
+
+    def _property(self, schema: Dict[str, Any], field_name: str) -> Dict[str, Any]:
+        return _resolve(schema.get('properties', {}).get(field_name, {}), self.spec)
+
+    def _value(self, schema: Dict[str, Any], field_name: str, bounds: Optional[Dict[str, Any]] = None) -> Any:
+        return sample_value(field_name, self._property(schema, field_name), bounds)
+
+    def _apply(self, body: Dict[str, Any], schema: Dict[str, Any], constraint: LearnedConstraint):
+        """Change the body so it satisfies one constraint"""
+        field_name = constraint.affected_parameter
+        if constraint.constraint_type == ConstraintType.REQUIRED_FIELD:
+            body.setdefault(field_name, self._value(schema, field_name))
+
+        elif constraint.exclusivity_rule:
+            rule = constraint.exclusivity_rule
+            present = [name for name in rule.exclusive_fields if body.get(name) is not None]
+            for name in present[max(rule.max_allowed, 0):]:
+                del body[name]
+            for name in rule.exclusive_fields:
+                if len([n for n in rule.exclusive_fields if body.get(n) is not None]) >= rule.min_required:
+                    break
+                body.setdefault(name, self._value(schema, name))
+
+        elif constraint.conditional_rule:
+            rule = constraint.conditional_rule
+            if rule.condition_field in body and rule.required_field not in body:
+                body[rule.required_field] = (rule.required_value if rule.required_value is not None
+                                             else self._value(schema, rule.required_field))
+
+        elif constraint.format_dependency:
+            rule = constraint.format_dependency
+            if str(body.get(rule.dependency_field)).lower() == str(rule.dependency_value).lower():
+                body[rule.dependent_field] = sample_value(rule.dependent_field, {'format': rule.required_format})
+
+        elif field_name in body or constraint.constraint_type == ConstraintType.BUSINESS_RULE:
+            field_name = constraint.business_rule.field if constraint.business_rule else field_name
+            if field_name in body:
+                body[field_name] = self._value(schema, field_name, _bounds_for(constraint))
+
+    def valid_body(self, path: str, method: str = 'post') -> Tuple[Dict[str, Any], List[ConstraintViolation]]:
+        """A body satisfying the schema and every active rule, plus any rule it still breaks"""
+        operation = self.spec.get('paths', {}).get(path, {}).get(method, {})
+        schema = request_schema(operation, self.spec)
+        # Without declared required fields, send every documented property
+        fields = schema.get('required') or list(schema.get('properties', {}))
+        body = {name: self._value(schema, name) for name in fields}
+        active = self.validator.active_constraints(path)
+
+        violations = self.validator.validate(path, body)
+        for _ in range(MAX_REPAIR_ROUNDS):
+            for _, constraint in active:
+                self._apply(body, schema, constraint)
+            violations = self.validator.validate(path, body)
+            if not violations:
+                break
+            # Rules that are still broken get applied again, last, so they win conflicts
+            broken = {violation.constraint_id for violation in violations}
+            active = [entry for entry in active if entry[0] not in broken] + \
+                     [entry for entry in active if entry[0] in broken]
+        return body, violations
+
+    def invalid_bodies(self, path: str, method: str = 'post') -> List[InvalidCase]:
+        """One body per active rule, valid except that it breaks that rule"""
+        base, _ = self.valid_body(path, method)
+        schema = request_schema(self.spec.get('paths', {}).get(path, {}).get(method, {}), self.spec)
+        cases = []
+        for constraint_id, constraint in self.validator.active_constraints(path):
+            body = copy.deepcopy(base)
+            field_name = constraint.affected_parameter
+
+            if constraint.constraint_type == ConstraintType.REQUIRED_FIELD:
+                body.pop(field_name, None)
+            elif constraint.exclusivity_rule:
+                for name in constraint.exclusivity_rule.exclusive_fields:
+                    body.setdefault(name, self._value(schema, name))
+            elif constraint.conditional_rule:
+                rule = constraint.conditional_rule
+                if rule.condition_operator not in ('equals', None):
+                    continue
+                body[rule.condition_field] = rule.condition_value
+                body.pop(rule.required_field, None)
+            elif constraint.format_dependency:
+                rule = constraint.format_dependency
+                body[rule.dependency_field] = rule.dependency_value
+                body[rule.dependent_field] = INVALID_FORMAT_VALUE
+            else:
+                field_name = constraint.business_rule.field if constraint.business_rule else field_name
+                value = _out_of_bounds(_bounds_for(constraint))
+                if value is None:
+                    continue
+                body[field_name] = value
+
+            # Only keep cases that break exactly the rule they are meant to test
+            broken = {violation.constraint_id for violation in self.validator.validate(path, body)}
+            if broken == {constraint_id}:
+                cases.append(InvalidCase(constraint_id, field_name, constraint.rule_description, body))
+        return cases
+
+
+def _slug(path: str, method: str) -> str:
+    words = [part.strip('{}') for part in path.split('/') if part]
+    slug = re.sub(r'\W+', '_', '_'.join(words)).strip('_').lower() or 'root'
+    return f"{method}_{slug}"
+
+
+def _success_status(operation: Dict[str, Any], method: str) -> int:
+    for status in (operation.get('responses') or {}):
+        if str(status).startswith('2') and str(status).isdigit():
+            return int(status)
+    return 201 if method == 'post' else 200
+
+
+def _request_url(path: str, operation: Dict[str, Any], spec: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """The f-string URL with path parameters filled in, and required query parameters"""
+    params = {}
+    for parameter in operation.get('parameters', []):
+        parameter = _resolve(parameter, spec)
+        if parameter.get('in') == 'query' and parameter.get('required'):
+            params[parameter['name']] = sample_value(parameter['name'], _resolve(parameter.get('schema', {}), spec))
+    url_path = re.sub(r'\{[^}]+\}', '1', path)
+    return f'f"{{api_base_url}}{url_path}"', params
+
+
+def _request_line(method: str, url: str, params: Dict[str, Any], has_body: bool) -> str:
+    arguments = [url]
+    if has_body:
+        arguments.append('json=payload')
+    if params:
+        arguments.append(f'params={params!r}')
+    return f"    response = requests.{method}({', '.join(arguments)})"
+
+
+def _targeted_operations(synthesizer: PayloadSynthesizer, endpoints: Optional[List[str]],
+                         user_prompt: str) -> List[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Operations under `endpoints` whose method the prompt's verbs ask for.
+    A prompt naming no (matching) verb gets every operation except DELETE,
+    which is only sent when asked for explicitly.
+    """
+    candidates = [entry for entry in synthesizer.operations() if not endpoints or entry[0] in endpoints]
+    methods = prompt_methods(user_prompt)
+    requested = [entry for entry in candidates if entry[1] in methods]
+    return requested or [entry for entry in candidates if entry[1] != 'delete']
+
+
+def synthesize_test_script(spec: Dict[str, Any], constraint_model: Optional[APIConstraintModel] = None,
+                           endpoints: Optional[List[str]] = None, include_invalid: bool = True,
+                           user_prompt: str = "") -> str:
+    """
+    Emit a pytest script exercising the operations the prompt targets
+    (restricted to those under `endpoints` when given).
+
+    Operations with a JSON body get a valid-payload test and, with
+    include_invalid, one test per learned rule expecting a 4xx.
+    """
+    synthesizer = PayloadSynthesizer(spec, constraint_model)
+    tests = []
+    for path, method, operation in _targeted_operations(synthesizer, endpoints, user_prompt):
+        slug = _slug(path, method)
+        url, params = _request_url(path, operation, spec)
+        has_body = method in BODY_METHODS and bool(request_schema(operation, spec) or operation.get('requestBody'))
+        status = _success_status(operation, method)
+        summary = operation.get('summary') or f"{method.upper()} {path}"
+
+        payload_line = ''
+        if has_body:
+            body, _ = synthesizer.valid_body(path, method)
+            payload_line = f"    payload = {body!r}\n"
+        if '{' in path:
+            # Sample ids may not exist; only server errors are failures
+            check = (f'    assert response.status_code < 500, '
+                     f'f"Expected no server error, got {{response.status_code}}: {{response.text}}"')
+        else:
+            check = (f'    assert response.status_code == {status}, '
+                     f'f"Expected {status}, got {{response.status_code}}: {{response.text}}"')
+        tests.append(
+            f'def test_{slug}_valid(api_base_url):\n'
+            f'    """{summary} with a payload satisfying every learned constraint"""\n'
+            f'{payload_line}'
+            f'{_request_line(method, url, params, has_body)}\n'
+            f'{check}\n'
+        )
+
+        if not (has_body and include_invalid):
+            continue
+        for index, case in enumerate(synthesizer.invalid_bodies(path, method), 1):
+            description = case.description.replace('"""', "'")
+            tests.append(
+                f'def test_{slug}_rejects_{re.sub(r"[^0-9a-zA-Z]+", "_", case.field).lower()}_{index}(api_base_url):\n'
+                f'    """Breaks: {description}"""\n'
+                f'    payload = {case.body!r}\n'
+                f'{_request_line(method, url, params, True)}\n'
+                f'    assert 400 <= response.status_code < 500, '
+                f'f"Expected a 4xx rejection, got {{response.status_code}}: {{response.text}}"\n'
+            )
+
+    header = '"""\nLocally synthesized tests'
+    header += f' for: {user_prompt}\n' if user_prompt else '\n'
+    header += 'Payloads computed from the OpenAPI schema and learned constraints.\n"""\n'
+    return header + 'import requests\nimport pytest\n\n\n' + '\n\n'.join(tests)
+
+
+def endpoints_are_stable(constraint_model: Optional[APIConstraintModel], endpoints: List[str],
+                         min_confidence: float = MIN_CONFIDENCE) -> bool:
+    """True when every endpoint has learned rules and all of them are above the confidence threshold"""
+    if not constraint_model or not endpoints:
+        return False
+    constraints = constraint_model.learned_constraints
+    for endpoint in endpoints:
+        constraint_ids = constraint_model.endpoint_rules.get(endpoint, [])
+        if not constraint_ids:
+            return False
+        if any(constraint_id not in constraints or constraints[constraint_id].confidence_score <= min_confidence
+               for constraint_id in constraint_ids):
+            return False
+    return True
@@ -4,12 +4,9 @@ Production Readiness Assessment for Echidna Agent
 Final comprehensive validation with enterprise-grade testing scenarios
 """
 
-import os
 import json
 import time
 import requests
-import subprocess
-import sys
 from datetime import datetime
 
 class ProductionReadinessValidator:
@@ -268,108 +265,52 @@ paths:
     
     def _run_enterprise_tests(self, test_name, spec_file, scenarios):
         """Run enterprise-grade test scenarios"""
+        from batch_runner import Scenario, run_scenario_batch
+        
+        # Allow more attempts for complex scenarios
+        sessions = run_scenario_batch(
+            [Scenario(spec_file, scenario['prompt']) for scenario in scenarios], max_attempts=2
+        )
+        
         results = []
+        complexity_score = {'high': 3, 'medium': 2, 'low': 1}
         
-        for i, scenario in enumerate(scenarios, 1):
+        for i, (scenario, session) in enumerate(zip(scenarios, sessions), 1):
             print(f"   🏢 {test_name} Enterprise Test {i}: {scenario['prompt'][:50]}...")
             
             # Increase scoring based on complexity
-            complexity_score = {'high': 3, 'medium': 2, 'low': 1}
             self.max_enterprise_score += complexity_score.get(scenario.get('complexity', 'low'), 1)
             
-            # Clean up
-            for file in ['learned_model.json', 'pattern_analysis.json']:
-                if os.path.exists(file):
-                    os.remove(file)
+            if session.error:
+                print(f"      ❌ Enterprise error: {session.error[:30]}")
             
-            # Set environment with more aggressive settings
-            env = os.environ.copy()
-            env.update({
-                'SPEC_PATH': spec_file,
-                'MAX_ATTEMPTS': '2',  # Allow more attempts for complex scenarios
-                'USER_PROMPT': scenario['prompt'],
-                'PYTHONIOENCODING': 'utf-8'
-            })
+            # Check for learning with enhanced scoring
+            constraints = session.to_dict()['constraints']
+            constraint_learned = bool(constraints)
+            learned_details = next(iter(constraints.values())) if constraints else {}
+            confidence = learned_details.get('confidence_score', 0)
             
-            start_time = time.time()
-            try:
-                result = subprocess.run(
-                    [sys.executable, 'main.py'],
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    timeout=180,  # Longer timeout for complex scenarios
-                    encoding='utf-8',
-                    errors='replace'
-                )
-                
-                duration = time.time() - start_time
-                
-                # Check for learning with enhanced scoring
-                constraint_learned = False
-                learned_details = {}
-                confidence = 0
+            # Enterprise scoring based on constraint quality and confidence
+            if constraint_learned:
+                base_score = complexity_score.get(scenario.get('complexity', 'low'), 1)
+                confidence_multiplier = min(confidence, 1.0)
+                earned_score = base_score * confidence_multiplier
+                self.enterprise_score += earned_score
                 
-                if os.path.exists('learned_model.json'):
-                    try:
-                        with open('learned_model.json', 'r') as f:
-                            data = json.load(f)
-                        if data.get('total_constraints', 0) > 0:
-                            constraint_learned = True
-                            constraints = data.get('constraints', {})
-                            if constraints:
-                                key = list(constraints.keys())[0]
-                                learned_details = constraints[key]
-                                confidence = learned_details.get('confidence_score', 0)
-                    except:
-                        pass
-                
-                # Enterprise scoring based on constraint quality and confidence
-                if constraint_learned:
-                    base_score = complexity_score.get(scenario.get('complexity', 'low'), 1)
-                    confidence_multiplier = min(confidence, 1.0)
-                    earned_score = base_score * confidence_multiplier
-                    self.enterprise_score += earned_score
-                    
-                    print(f"      ✅ Enterprise Learning: {learned_details.get('constraint_type', 'unknown')} (confidence: {confidence:.1%})")
-                else:
-                    print(f"      ❌ No enterprise constraint learned")
-                
-                results.append({
-                    'test_name': test_name,
-                    'scenario': scenario['prompt'][:40] + '...',
-                    'success': constraint_learned,
-                    'duration': duration,
-                    'learned_details': learned_details,
-                    'expected': scenario['expected'],
-                    'complexity': scenario.get('complexity', 'low'),
-                    'confidence': confidence
-                })
-                
-            except subprocess.TimeoutExpired:
-                print(f"      ⏰ Enterprise timeout")
-                results.append({
-                    'test_name': test_name,
-                    'scenario': scenario['prompt'][:40] + '...',
-                    'success': False,
-                    'duration': 180,
-                    'learned_details': {},
-                    'expected': scenario['expected'],
-                    'complexity': scenario.get('complexity', 'low'),
-                    'confidence': 0
-                })
-            except Exception as e:
-                print(f"      ❌ Enterprise error: {str(e)[:30]}")
-                results.append({
-                    'test_name': test_name,
-                    'scenario': scenario['prompt'][:40] + '...',
-                    'success': False,
-                    'duration': 0,
-                    'learned_details': {},
-                    'expected': scenario['expected'],
-                    'complexity': scenario.get('complexity', 'low'),
-                    'confidence': 0
-                })
+                print(f"      ✅ Enterprise Learning: {learned_details.get('constraint_type', 'unknown')} (confidence: {confidence:.1%})")
+            else:
+                print(f"      ❌ No enterprise constraint learned")
+            
+            results.append({
+                'test_name': test_name,
+                'scenario': scenario['prompt'][:40] + '...',
+                'success': constraint_learned,
+                'duration': session.duration,
+                'learned_details': learned_details,
+                'expected': scenario['expected'],
+                'complexity': scenario.get('complexity', 'low'),
+                'confidence': confidence
+            })
         
         return {'success': True, 'results': results}
     
@@ -395,7 +336,6 @@ paths:
                 result = test_func()
                 if result.get('success') and 'results' in result:
                     all_results.extend(result['results'])
-                time.sleep(2)  # Pause between test suites
             except Exception as e:
                 print(f"   ❌ {test_name} failed: {str(e)}")
         
@@ -0,0 +1,235 @@
+"""
+Endpoint-scoped spec slicing for generation prompts.
+
+Instead of serializing the whole (enhanced) spec into every prompt, pick the
+operations the user prompt is about, then include only those paths, the
+components they reference (transitively), and top-level metadata. Operations
+are added best match first until the token budget is reached.
+"""
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+HTTP_METHODS = ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']
+
+# Prompt verbs that imply an HTTP method
+VERB_METHODS = {
+    'create': {'post'}, 'add': {'post'}, 'new': {'post'}, 'register': {'post'},
+    'submit': {'post'}, 'post': {'post'}, 'send': {'post'},
+    'get': {'get'}, 'fetch': {'get'}, 'retrieve': {'get'}, 'list': {'get'},
+    'read': {'get'}, 'view': {'get'}, 'show': {'get'}, 'search': {'get'}, 'find': {'get'},
+    'update': {'put', 'patch'}, 'modify': {'put', 'patch'}, 'change': {'put', 'patch'},
+    'edit': {'put', 'patch'}, 'replace': {'put'},
+    'delete': {'delete'}, 'remove': {'delete'},
+}
+
+STOP_WORDS = {'a', 'an', 'the', 'with', 'and', 'or', 'to', 'of', 'for', 'in', 'on', 'by',
+              'that', 'valid', 'invalid', 'data', 'test', 'verify', 'response', 'api'}
+
+REF_PATTERN = re.compile(r'^#/components/([^/]+)/([^/]+)$')
+
+
+@dataclass
+class PromptContext:
+    spec: Dict[str, Any]
+    endpoints: List[str] = field(default_factory=list)
+    estimated_tokens: int = 0
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+def _word_forms(word: str) -> Set[str]:
+    forms = {word}
+    if word.endswith('ies') and len(word) > 3:
+        forms.add(word[:-3] + 'y')
+    elif word.endswith('s') and len(word) > 1:
+        forms.add(word[:-1])
+    return forms
+
+
+def _words(text: str) -> Set[str]:
+    words = set()
+    for word in re.findall(r'[a-z0-9]+', text.lower()):
+        if word not in STOP_WORDS:
+            words |= _word_forms(word)
+    return words
+
+
+def prompt_methods(user_prompt: str) -> Set[str]:
+    """HTTP methods the prompt's verbs ask for (empty when it names none)"""
+    methods = set()
+    for word in _words(user_prompt):
+        methods |= VERB_METHODS.get(word, set())
+    return methods
+
+
+def _score_operation(path: str, method: str, operation: Dict[str, Any], prompt_words: Set[str]) -> int:
+    score = 0
+    segments = [s for s in path.split('/') if s and not s.startswith('{')]
+    for segment in segments:
+        if _words(segment.replace('-', ' ').replace('_', ' ')) & prompt_words:
+            score += 3
+
+    if score and any(method in VERB_METHODS.get(word, ()) for word in prompt_words):
+        score += 2
+
+    if isinstance(operation, dict):
+        described = ' '.join(str(operation.get(key, '')) for key in ('operationId', 'summary', 'description'))
+        described += ' ' + ' '.join(str(tag) for tag in operation.get('tags', []))
+        score += len(_words(described) & prompt_words)
+    return score
+
+
+def resolve_target_operations(spec: Dict[str, Any], user_prompt: str) -> List[Tuple[str, str]]:
+    """(path, method) pairs ranked by relevance to the prompt; every operation if nothing matches"""
+    prompt_words = _words(user_prompt)
+    scored = []
+    for path, path_item in (spec.get('paths') or {}).items():
+        if not isinstance(path_item, dict):
+            continue
+        for method, operation in path_item.items():
+            if method in HTTP_METHODS:
+                scored.append((_score_operation(path, method, operation, prompt_words), path, method))
+
+    matched = [entry for entry in scored if entry[0] > 0]
+    if matched:
+        # Stable sort keeps spec order among equally relevant operations
+        matched.sort(key=lambda entry: -entry[0])
+        return [(path, method) for _, path, method in matched]
+    return [(path, method) for _, path, method in scored]
+
+
+def _collect_refs(node: Any, refs: Set[Tuple[str, str]]):
+    if isinstance(node, dict):
+        ref = node.get('$ref')
+        if isinstance(ref, str):
+            match = REF_PATTERN.match(ref)
+            if match:
+                refs.add((match.group(1), match.group(2)))
+        for value in node.values():
+            _collect_refs(value, refs)
+    elif isinstance(node, list):
+        for value in node:
+            _collect_refs(value, refs)
+
+
+def _referenced_components(spec: Dict[str, Any], roots: List[Any]) -> Dict[str, Dict[str, Any]]:
+    """Components reachable from the given nodes through $ref chains"""
+    components = spec.get('components') or {}
+    pending: Set[Tuple[str, str]] = set()
+    for root in roots:
+        _collect_refs(root, pending)
+
+    included: Dict[str, Dict[str, Any]] = {}
+    seen: Set[Tuple[str, str]] = set()
+    while pending:
+        kind, name = pending.pop()
+        if (kind, name) in seen:
+            continue
+        seen.add((kind, name))
+        component = (components.get(kind) or {}).get(name)
+        if component is None:
+            continue
+        included.setdefault(kind, {})[name] = component
+        _collect_refs(component, pending)
+    return included
+
+
+def _slice_spec(spec: Dict[str, Any], operations: List[Tuple[str, str]]) -> Dict[str, Any]:
+    sliced = {key: spec[key] for key in ('openapi', 'swagger', 'info', 'servers') if key in spec}
+    if spec.get('x-learned-rules'):
+        sliced['x-learned-rules'] = spec['x-learned-rules']
+
+    paths: Dict[str, Dict[str, Any]] = {}
+    for path, method in operations:
+        path_item = spec['paths'][path]
+        if path not in paths:
+            paths[path] = {'parameters': path_item['parameters']} if 'parameters' in path_item else {}
+        paths[path][method] = path_item[method]
+    sliced['paths'] = paths
+
+    components = _referenced_components(spec, list(paths.values()))
+    if components:
+        sliced['components'] = components
+    return sliced
+
+
+def build_prompt_context(spec: Dict[str, Any], user_prompt: str,
+                         token_budget: Optional[int] = None) -> PromptContext:
+    """
+    Slice the spec down to the operations relevant to user_prompt.
+
+    The best-matching operation is always included; further ones are added
+    while the serialized slice stays within token_budget (PROMPT_TOKEN_BUDGET,
+    default 6000).
+    """
+    token_budget = token_budget or int(os.getenv('PROMPT_TOKEN_BUDGET', '6000'))
+    ranked = resolve_target_operations(spec, user_prompt)
+
+    def size_of(node: Any) -> int:
+        return estimate_tokens(json.dumps(node, indent=2, default=str))
+
+    if not ranked:
+        return PromptContext(spec=spec, endpoints=[], estimated_tokens=size_of(spec))
+
+    # Budget incrementally: each operation costs its own size plus any
+    # components it pulls in that are not included yet
+    selected: List[Tuple[str, str]] = []
+    included: Set[Tuple[str, str]] = set()
+    tokens = size_of(_slice_spec(spec, []))
+    for path, method in ranked:
+        operation = spec['paths'][path][method]
+        new_components = [
+            (kind, name, component)
+            for kind, named in _referenced_components(spec, [operation]).items()
+            for name, component in named.items()
+            if (kind, name) not in included
+        ]
+        # Wrapped at the depth they will sit at, so indentation is counted
+        cost = size_of({'paths': {path: {method: operation}}}) + sum(
+            size_of({'components': {kind: {name: component}}}) for kind, name, component in new_components
+        )
+        if selected and tokens + cost > token_budget:
+            continue
+        selected.append((path, method))
+        included.update((kind, name) for kind, name, _ in new_components)
+        tokens += cost
+
+    sliced = _slice_spec(spec, selected)
+    while len(selected) > 1 and size_of(sliced) > token_budget:
+        selected.pop()
+        sliced = _slice_spec(spec, selected)
+    endpoints = list(dict.fromkeys(path for path, _ in selected))
+    return PromptContext(spec=sliced, endpoints=endpoints, estimated_tokens=size_of(sliced))
+
+
+def merge_prompt_contexts(contexts: List[PromptContext]) -> PromptContext:
+    """One spec slice covering the operations and components of several slices of the same spec"""
+    if not contexts:
+        return PromptContext(spec={})
+    if any(not context.endpoints for context in contexts):
+        # An unmatched prompt already carries the whole spec
+        spec = next(context.spec for context in contexts if not context.endpoints)
+        return PromptContext(spec=spec, endpoints=[],
+                             estimated_tokens=estimate_tokens(json.dumps(spec, indent=2, default=str)))
+
+    merged = {key: value for key, value in contexts[0].spec.items() if key not in ('paths', 'components')}
+    merged['paths'] = {}
+    components: Dict[str, Dict[str, Any]] = {}
+    endpoints: List[str] = []
+    for context in contexts:
+        for path, path_item in context.spec.get('paths', {}).items():
+            merged['paths'].setdefault(path, {}).update(path_item)
+        for kind, named in context.spec.get('components', {}).items():
+            components.setdefault(kind, {}).update(named)
+        endpoints.extend(endpoint for endpoint in context.endpoints if endpoint not in endpoints)
+    if components:
+        merged['components'] = components
+    return PromptContext(spec=merged, endpoints=endpoints,
+                         estimated_tokens=estimate_tokens(json.dumps(merged, indent=2, default=str)))
@@ -4,11 +4,7 @@ Quick Constraint Validation Test
 Tests all 8 constraint types to ensure they're properly handled
 """
 
-import subprocess
-import os
-import sys
-import time
-import json
+from batch_runner import Scenario, run_scenario_batch
 
 def test_all_constraint_types():
     """Test all constraint types defined in the system"""
@@ -60,94 +56,50 @@ def test_all_constraint_types():
         }
     ]
     
+    sessions = run_scenario_batch(
+        [Scenario('specs/spec_enhanced_flawed.yaml', scenario['prompt']) for scenario in constraint_scenarios],
+        max_attempts=1
+    )
+    
     results = {}
     total_tested = 0
     total_learned = 0
     
-    for i, scenario in enumerate(constraint_scenarios, 1):
+    for i, (scenario, session) in enumerate(zip(constraint_scenarios, sessions), 1):
         print(f"\n🧪 Test {i}/8: {scenario['name']}")
         print(f"   Prompt: {scenario['prompt']}")
+        total_tested += 1
         
-        # Clean up any existing learned model
-        if os.path.exists('learned_model.json'):
-            os.remove('learned_model.json')
-        
-        # Set environment for test
-        env = os.environ.copy()
-        env.update({
-            'SPEC_PATH': 'specs/spec_enhanced_flawed.yaml',
-            'MAX_ATTEMPTS': '1',
-            'USER_PROMPT': scenario['prompt'],
-            'GOOGLE_API_KEY': os.environ.get('GOOGLE_API_KEY', '')
-        })
-        
-        start_time = time.time()
-        try:
-            result = subprocess.run(
-                [sys.executable, 'main.py'],
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=60,  # Quick test - 60 second timeout
-                encoding='utf-8',
-                errors='replace'
-            )
-            execution_time = time.time() - start_time
-            
-            # Check if any constraint was learned
-            constraint_learned = False
-            learned_type = "none"
-            
-            if os.path.exists('learned_model.json'):
-                try:
-                    with open('learned_model.json', 'r') as f:
-                        learned_data = json.load(f)
-                        if learned_data.get('total_constraints', 0) > 0:
-                            constraint_learned = True
-                            # Get the constraint type that was learned
-                            constraints = learned_data.get('constraints', {})
-                            if constraints:
-                                first_constraint = list(constraints.values())[0]
-                                learned_type = first_constraint.get('constraint_type', 'unknown')
-                            total_learned += 1
-                except Exception as e:
-                    print(f"   ⚠️  Error reading learned model: {e}")
-            
-            total_tested += 1
-            
-            status = "✅" if constraint_learned else "❌"
-            print(f"   {status} Result: {learned_type} constraint ({execution_time:.2f}s)")
-            
-            results[scenario['name']] = {
-                'success': constraint_learned,
-                'learned_type': learned_type,
-                'expected_type': scenario['expected_constraint'],
-                'execution_time': execution_time
-            }
-            
-        except subprocess.TimeoutExpired:
-            print(f"   ⏰ Timeout (60s)")
-            results[scenario['name']] = {
-                'success': False,
-                'learned_type': 'timeout',
-                'expected_type': scenario['expected_constraint'],
-                'execution_time': 60.0
-            }
-            total_tested += 1
-            
-        except Exception as e:
-            print(f"   ❌ Error: {e}")
+        if session.error:
+            print(f"   ❌ Error: {session.error}")
             results[scenario['name']] = {
                 'success': False,
                 'learned_type': 'error',
                 'expected_type': scenario['expected_constraint'],
-                'execution_time': 0
+                'execution_time': session.duration
             }
-            total_tested += 1
+            continue
+        
+        # Check if any constraint was learned
+        constraints = session.to_dict()['constraints']
+        constraint_learned = bool(constraints)
+        learned_type = "none"
         
-        # Brief pause between tests
-        if i < len(constraint_scenarios):
-            time.sleep(2)
+        if constraint_learned:
+            # Get the constraint type that was learned
+            first_constraint = next(iter(constraints.values()))
+            learned_type = first_constraint.get('constraint_type', 'unknown')
+            total_learned += 1
+        
+        status = "✅" if constraint_learned else "❌"
+        print(f"   {status} Result: {learned_type} constraint ({session.duration:.2f}s)")
+        
+        results[scenario['name']] = {
+            'success': constraint_learned,
+            'learned_type': learned_type,
+            'expected_type': scenario['expected_constraint'],
+            'execution_time': session.duration
+        }
     
     # Summary
     print(f"\n📊 CONSTRAINT TYPE VALIDATION SUMMARY")
@@ -379,101 +379,44 @@ paths:
         print(f"\n🚀 EXECUTING REAL-WORLD API TESTS")
         print("="*60)
         
+        from batch_runner import Scenario, run_scenario_batch
+        
+        sessions = run_scenario_batch(
+            [Scenario(scenario['spec_file'], scenario['prompt'], name=scenario['name']) for scenario in scenarios],
+            max_attempts=2  # Allow more attempts for real APIs
+        )
+        
         results = []
         
-        for i, scenario in enumerate(scenarios, 1):
+        for i, (scenario, session) in enumerate(zip(scenarios, sessions), 1):
             print(f"\n🧪 Test {i}/{len(scenarios)}: {scenario['name']}")
             print(f"   📝 Prompt: {scenario['prompt']}")
             
-            # Clean up before test
-            for file in ['learned_model.json', 'pattern_analysis.json']:
-                if os.path.exists(file):
-                    os.remove(file)
+            if session.error:
+                print(f"   ❌ ERROR: {session.error}")
             
-            # Set environment for real-world test
-            env = os.environ.copy()
-            env.update({
-                'SPEC_PATH': scenario['spec_file'],
-                'MAX_ATTEMPTS': '2',  # Allow more attempts for real APIs
-                'USER_PROMPT': scenario['prompt'],
-                'PYTHONIOENCODING': 'utf-8'
-            })
+            # Analyze results
+            constraints = session.to_dict()['constraints']
+            constraint_learned = bool(constraints)
+            learned_details = next(iter(constraints.values())) if constraints else {}
             
-            start_time = time.time()
-            try:
-                import subprocess
-                import sys
-                
-                result = subprocess.run(
-                    [sys.executable, 'main.py'],
-                    env=env,
-                    capture_output=True,
-                    text=True,
-                    timeout=180,  # Longer timeout for real APIs
-                    encoding='utf-8',
-                    errors='replace'
-                )
-                
-                duration = time.time() - start_time
-                
-                # Analyze results
-                constraint_learned = False
-                learned_details = {}
-                
-                if os.path.exists('learned_model.json'):
-                    try:
-                        with open('learned_model.json', 'r') as f:
-                            learned_data = json.load(f)
-                        
-                        constraints = learned_data.get('constraints', {})
-                        if constraints:
-                            constraint_learned = True
-                            constraint_key = list(constraints.keys())[0]
-                            learned_details = constraints[constraint_key]
-                    except Exception as e:
-                        print(f"   ⚠️  Error reading learned model: {e}")
-                
-                # Report result
-                if constraint_learned:
-                    print(f"   ✅ SUCCESS: Learned constraint from real API!")
-                    print(f"      Type: {learned_details.get('constraint_type', 'unknown')}")
-                    print(f"      Rule: {learned_details.get('rule_description', 'N/A')[:60]}...")
-                    print(f"      Confidence: {learned_details.get('confidence_score', 0):.0%}")
-                else:
-                    print(f"   ❌ No constraint learned (API may not enforce expected rules)")
-                
-                results.append({
-                    'scenario': scenario['name'],
-                    'success': constraint_learned,
-                    'duration': duration,
-                    'learned_details': learned_details,
-                    'return_code': result.returncode,
-                    'expected_learning': scenario['expected_learning']
-                })
-                
-            except subprocess.TimeoutExpired:
-                print(f"   ⏰ TIMEOUT: Test exceeded 180 seconds")
-                results.append({
-                    'scenario': scenario['name'],
-                    'success': False,
-                    'duration': 180,
-                    'learned_details': {},
-                    'return_code': -1,
-                    'expected_learning': scenario['expected_learning']
-                })
-            except Exception as e:
-                print(f"   ❌ ERROR: {str(e)}")
-                results.append({
-                    'scenario': scenario['name'],
-                    'success': False,
-                    'duration': 0,
-                    'learned_details': {},
-                    'return_code': -1,
-                    'expected_learning': scenario['expected_learning']
-                })
+            # Report result
+            if constraint_learned:
+                print(f"   ✅ SUCCESS: Learned constraint from real API!")
+                print(f"      Type: {learned_details.get('constraint_type', 'unknown')}")
+                print(f"      Rule: {learned_details.get('rule_description', 'N/A')[:60]}...")
+                print(f"      Confidence: {learned_details.get('confidence_score', 0):.0%}")
+            else:
+                print(f"   ❌ No constraint learned (API may not enforce expected rules)")
             
-            # Brief pause between tests
-            time.sleep(2)
+            results.append({
+                'scenario': scenario['name'],
+                'success': constraint_learned,
+                'duration': session.duration,
+                'learned_details': learned_details,
+                'return_code': -1 if session.error else 0,
+                'expected_learning': scenario['expected_learning']
+            })
         
         return results
 
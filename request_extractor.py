@@ -0,0 +1,322 @@
+"""
+Static extraction of the HTTP requests a generated test script makes.
+
+The script is parsed once with `ast` and never executed or eval'd. Each
+`requests.<method>(...)` call (also `requests.request(...)` and calls on a
+`requests.Session()`) is resolved against the literal assignments that
+precede it in its function and at module level, so nested payload dicts,
+`**base` merges and f-string URLs come back as real values. Anything that
+cannot be resolved statically is kept as its source text.
+"""
+
+import ast
+import copy
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional
+from urllib.parse import urlparse
+
+HTTP_METHODS = {'get', 'post', 'put', 'patch', 'delete', 'head', 'options'}
+REQUEST_KEYWORDS = ('json', 'params', 'headers', 'data')
+
+# Statement fields holding nested statement blocks
+NESTED_BLOCKS = ('body', 'orelse', 'finalbody', 'handlers')
+
+
+class _Unresolved(Exception):
+    """Raised when an expression has no static value"""
+
+
+# Binding for names assigned something that cannot be resolved statically
+_UNRESOLVED = object()
+
+
+@dataclass
+class ExtractedRequest:
+    http_method: str
+    url: Optional[str]
+    endpoint_path: Optional[str]
+    json_body: Any = None
+    params: Any = None
+    headers: Any = None
+    data: Any = None
+    test_name: Optional[str] = None
+    expected_status: Optional[int] = None
+    line: int = 0
+
+    @property
+    def expects_success(self) -> bool:
+        return self.expected_status is not None and 200 <= self.expected_status < 300
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _endpoint_from_url(url: Optional[str]) -> Optional[str]:
+    """'{api_base_url}/users/1?x=2' or 'http://host/users/1' -> '/users/1'"""
+    if not url:
+        return None
+    if url.startswith('{'):
+        closing = url.find('}')
+        path = url[closing + 1:] if closing != -1 else url
+    else:
+        path = urlparse(url).path if '://' in url else url
+    path = path.split('?')[0]
+    return path if path.startswith('/') else None
+
+
+def _expected_status(function: ast.AST) -> Optional[int]:
+    """The first status code a function compares `.status_code` against"""
+    for node in ast.walk(function):
+        if not isinstance(node, ast.Compare):
+            continue
+        sides = [node.left] + list(node.comparators)
+        if not any(isinstance(side, ast.Attribute) and side.attr == 'status_code' for side in sides):
+            continue
+        for side in sides:
+            candidates = side.elts if isinstance(side, (ast.Tuple, ast.List, ast.Set)) else [side]
+            for candidate in candidates:
+                if isinstance(candidate, ast.Constant) and type(candidate.value) is int:
+                    return candidate.value
+    return None
+
+
+def _own_nodes(statement: ast.stmt) -> List[ast.AST]:
+    """A statement's own expressions, without its nested statement blocks"""
+    nodes = []
+    for name, value in ast.iter_fields(statement):
+        if name in NESTED_BLOCKS:
+            continue
+        if isinstance(value, list):
+            nodes.extend(item for item in value if isinstance(item, ast.AST))
+        elif isinstance(value, ast.AST):
+            nodes.append(value)
+    return nodes
+
+
+class _Resolver:
+    """Evaluates literal expressions against a chain of name bindings"""
+
+    def __init__(self, scopes: List[Dict[str, Any]]):
+        self.scopes = scopes
+
+    def lookup(self, name: str) -> Any:
+        for scope in reversed(self.scopes):
+            if name in scope:
+                if scope[name] is _UNRESOLVED:
+                    break
+                return scope[name]
+        raise _Unresolved(name)
+
+    def value(self, node: ast.AST) -> Any:
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Name):
+            return self.lookup(node.id)
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            items = [self.soft_value(item) for item in node.elts]
+            return tuple(items) if isinstance(node, ast.Tuple) else items
+        if isinstance(node, ast.Dict):
+            result = {}
+            for key, value in zip(node.keys, node.values):
+                if key is None:
+                    merged = self.value(value)  # {**base, ...}
+                    if not isinstance(merged, dict):
+                        raise _Unresolved('**')
+                    result.update(merged)
+                else:
+                    result[self.value(key)] = self.soft_value(value)
+            return result
+        if isinstance(node, ast.JoinedStr):
+            return self.fstring(node)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            operand = self.value(node.operand)
+            if isinstance(operand, (int, float)):
+                return -operand
+        if isinstance(node, ast.Subscript):
+            container = self.value(node.value)
+            try:
+                return container[self.value(node.slice)]
+            except (KeyError, IndexError, TypeError):
+                raise _Unresolved('subscript')
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'dict' \
+                and len(node.args) <= 1:
+            result = {}
+            if node.args:  # dict(base, ...) copies base
+                base = self.value(node.args[0])
+                if not isinstance(base, dict):
+                    raise _Unresolved('dict()')
+                result.update(base)
+            result.update({keyword.arg: self.soft_value(keyword.value)
+                           for keyword in node.keywords if keyword.arg})
+            return result
+        raise _Unresolved(type(node).__name__)
+
+    def soft_value(self, node: ast.AST) -> Any:
+        """Like value(), but falls back to the expression's source text"""
+        try:
+            return self.value(node)
+        except _Unresolved:
+            return ast.unparse(node)
+
+    def fstring(self, node: ast.JoinedStr) -> str:
+        """Render an f-string, leaving unresolved pieces as {expr} placeholders"""
+        parts = []
+        for piece in node.values:
+            if isinstance(piece, ast.Constant):
+                parts.append(str(piece.value))
+                continue
+            try:
+                value = self.value(piece.value)
+                if not isinstance(value, (str, int, float)):
+                    raise _Unresolved('f-string value')
+                parts.append(str(value))
+            except _Unresolved:
+                parts.append('{' + ast.unparse(piece.value) + '}')
+        return ''.join(parts)
+
+
+class _RequestVisitor:
+    """Walks statements in order, tracking assignments and collecting requests calls"""
+
+    def __init__(self):
+        self.requests: List[ExtractedRequest] = []
+        self.module_scope: Dict[str, Any] = {}
+        self.sessions = {'requests'}
+
+    def run(self, tree: ast.Module):
+        self._statements(tree.body, [self.module_scope], None)
+
+    def _statements(self, statements: List[ast.stmt], scopes: List[Dict[str, Any]], test_name: Optional[str]):
+        """Nested blocks share their function's scope, in source order"""
+        for statement in statements:
+            if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                first = len(self.requests)
+                self._statements(statement.body, scopes + [{}], statement.name)
+                expected_status = _expected_status(statement)
+                for request in self.requests[first:]:
+                    request.expected_status = expected_status
+                continue
+            if isinstance(statement, ast.ClassDef):
+                self._statements(statement.body, scopes + [{}], test_name)
+                continue
+
+            self._collect_calls(statement, scopes, test_name)
+            self._bind(statement, scopes)
+
+            for field_name in NESTED_BLOCKS:
+                nested = getattr(statement, field_name, None)
+                if not isinstance(nested, list):
+                    continue
+                for block in nested:
+                    if isinstance(block, ast.stmt):
+                        self._statements([block], scopes, test_name)
+                    elif isinstance(block, ast.excepthandler):
+                        self._statements(block.body, scopes, test_name)
+
+    def _bind(self, statement: ast.stmt, scopes: List[Dict[str, Any]]):
+        """Track name bindings and in-place edits of resolved dicts (payload["x"] = ..., del, .pop)"""
+        resolver = _Resolver(scopes)
+        if isinstance(statement, ast.Delete):
+            for target in statement.targets:
+                self._edit_item(target, resolver, delete=True)
+            return
+        if (isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Call)
+                and isinstance(statement.value.func, ast.Attribute) and statement.value.func.attr == 'pop'
+                and statement.value.args):
+            call = statement.value
+            self._edit_item(ast.Subscript(value=call.func.value, slice=call.args[0]), resolver, delete=True)
+            return
+
+        if isinstance(statement, ast.Assign):
+            targets, value = statement.targets, statement.value
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            targets, value = [statement.target], statement.value
+        else:
+            return
+
+        is_session = (isinstance(value, ast.Call) and isinstance(value.func, ast.Attribute)
+                      and value.func.attr == 'Session')
+        for target in targets:
+            if isinstance(target, ast.Subscript):
+                self._edit_item(target, resolver, value=value)
+            elif isinstance(target, ast.Name):
+                if is_session:
+                    self.sessions.add(target.id)
+                    continue
+                try:
+                    scopes[-1][target.id] = resolver.value(value)
+                except _Unresolved:
+                    # Shadow any outer binding: the name no longer has a static value
+                    scopes[-1][target.id] = _UNRESOLVED
+
+    @staticmethod
+    def _edit_item(target: ast.AST, resolver: '_Resolver', value: Optional[ast.AST] = None, delete: bool = False):
+        if not (isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name)):
+            return
+        try:
+            container = resolver.lookup(target.value.id)
+            key = resolver.value(target.slice)
+        except _Unresolved:
+            return
+        if not isinstance(container, dict):
+            return
+        if delete:
+            container.pop(key, None)
+        else:
+            container[key] = resolver.soft_value(value)
+
+    def _collect_calls(self, statement: ast.stmt, scopes: List[Dict[str, Any]], test_name: Optional[str]):
+        for own in _own_nodes(statement):
+            for node in ast.walk(own):
+                if isinstance(node, ast.Call):
+                    request = self._request_from_call(node, scopes, test_name)
+                    if request:
+                        self.requests.append(request)
+
+    def _request_from_call(self, node: ast.Call, scopes: List[Dict[str, Any]],
+                           test_name: Optional[str]) -> Optional[ExtractedRequest]:
+        func = node.func
+        if not (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                and func.value.id in self.sessions):
+            return None
+
+        resolver = _Resolver(scopes)
+        args = list(node.args)
+        keywords = {keyword.arg: keyword.value for keyword in node.keywords if keyword.arg}
+        if func.attr == 'request':
+            method_node = args.pop(0) if args else keywords.get('method')
+            method = resolver.soft_value(method_node) if method_node is not None else 'GET'
+        elif func.attr in HTTP_METHODS:
+            method = func.attr
+        else:
+            return None
+
+        url_node = args[0] if args else keywords.get('url')
+        url = resolver.soft_value(url_node) if url_node is not None else None
+        url = url if isinstance(url, str) else None
+
+        # Deep copies, so later edits of the same payload do not rewrite this request
+        values = {name: copy.deepcopy(resolver.soft_value(keywords[name])) if name in keywords else None
+                  for name in REQUEST_KEYWORDS}
+        return ExtractedRequest(
+            http_method=str(method).upper(),
+            url=url,
+            endpoint_path=_endpoint_from_url(url),
+            json_body=values['json'],
+            params=values['params'],
+            headers=values['headers'],
+            data=values['data'],
+            test_name=test_name,
+            line=node.lineno
+        )
+
+
+def extract_requests(script: str) -> List[ExtractedRequest]:
+    """Every requests call in the script, in source order; [] when it does not parse"""
+    try:
+        tree = ast.parse(script)
+    except (SyntaxError, ValueError):
+        return []
+    visitor = _RequestVisitor()
+    visitor.run(tree)
+    return visitor.requests
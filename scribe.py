@@ -2,56 +2,50 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import os
-import google.generativeai as genai
 import json
 import re
-import threading
-import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 # Import actual constraint model classes
 from constraint_model import APIConstraintModel, LearnedConstraint
+from llm_client import llm_call
+from prompt_context import build_prompt_context, merge_prompt_contexts
+from script_cache import script_fingerprint, get_cached_script, store_script
+from payload_synthesizer import synthesize_test_script, endpoints_are_stable
 
-def llm_call_with_timeout(model, prompt, timeout=60):
-    """Call LLM with timeout using threading"""
-    result = [None]
-    exception = [None]
-    
-    def target():
-        try:
-            result[0] = model.generate_content(prompt)
-        except Exception as e:
-            exception[0] = e
-    
-    thread = threading.Thread(target=target)
-    thread.daemon = True
-    thread.start()
-    thread.join(timeout)
-    
-    if thread.is_alive():
-        # Thread is still running, timeout occurred
-        raise TimeoutError(f"LLM request timed out after {timeout} seconds")
-    
-    if exception[0]:
-        raise exception[0]
-    
-    return result[0]
+# Generate scripts locally for endpoints whose learned constraints are all high-confidence
+LOCAL_SYNTHESIS = os.getenv('LOCAL_SYNTHESIS', 'false').lower() == 'true'
+
+# Prompts sent together in one batched generation request
+GENERATION_BATCH_SIZE = int(os.getenv('GENERATION_BATCH_SIZE', '4'))
 
-def _build_learned_rules_context(constraint_model: APIConstraintModel) -> str:
-    """Build context string with learned constraints"""
+# Marker line the batched prompt asks the model to put before each module
+MODULE_MARKER = re.compile(r'^\s*#\s*=+\s*MODULE\s+(\d+)\s*=+\s*$', re.MULTILINE)
+CODE_FENCE = re.compile(r'^\s*```[a-z]*\s*$', re.MULTILINE)
+
+def _high_confidence_rules(constraint_model: Optional[APIConstraintModel],
+                           endpoints: Optional[List[str]] = None) -> Dict[str, LearnedConstraint]:
+    """High-confidence constraints by id, optionally only those for the given endpoints"""
     if not constraint_model or not getattr(constraint_model, 'learned_constraints', None):
-        return ""
+        return {}
     
-    context = "\n**LEARNED CONSTRAINTS (MUST FOLLOW):**\n"
-    
-    high_confidence_rules = [
-        constraint for constraint in constraint_model.learned_constraints.values()
+    return {
+        constraint_id: constraint
+        for constraint_id, constraint in list(constraint_model.learned_constraints.items())
         if constraint.confidence_score > 0.7
-    ]
+        and (not endpoints or constraint.endpoint_path in endpoints)
+    }
+
+
+def _build_learned_rules_context(constraint_model: APIConstraintModel, endpoints: Optional[List[str]] = None) -> str:
+    """Build context string with learned constraints, optionally only those for the given endpoints"""
+    high_confidence_rules = list(_high_confidence_rules(constraint_model, endpoints).values())
     
     if not high_confidence_rules:
         return ""
     
+    context = "\n**LEARNED CONSTRAINTS (MUST FOLLOW):**\n"
+    
     for constraint in high_confidence_rules:
         context += f"- {constraint.rule_description} (confidence: {constraint.confidence_score:.2f})\n"
         
@@ -103,7 +97,7 @@ def _validate_code_completeness(script: str) -> Dict[str, Any]:
     return {'is_complete': not issues, 'issues': issues}
 
 
-def _complete_incomplete_script(incomplete_script: str, model) -> Optional[str]:
+def _complete_incomplete_script(incomplete_script: str) -> Optional[str]:
     """Attempt to complete an incomplete script using the LLM."""
     completion_prompt = f"""The following Python test script is incomplete or contains syntax errors. Please fix it and provide only the complete, corrected, and fully functional Python code.
 
@@ -121,8 +115,8 @@ def _complete_incomplete_script(incomplete_script: str, model) -> Optional[str]:
 """
     try:
         print("🔄 Attempting to complete the script...")
-        response = llm_call_with_timeout(model, completion_prompt, 60)
-        completed_script = _extract_code_from_response(response.text)
+        response_text = llm_call(completion_prompt, timeout=60, use_cache=False)
+        completed_script = _extract_code_from_response(response_text)
         
         validation = _validate_code_completeness(completed_script)
         if validation['is_complete']:
@@ -185,8 +179,61 @@ def test_create_user_fallback(api_base_url):
 '''
 
 
+def _plan_generation(spec_data: Dict[str, Any], user_prompt: str,
+                     constraint_model: Optional[APIConstraintModel]) -> Dict[str, Any]:
+    """Enhanced spec, prompt spec slice and script cache fingerprint for one user prompt"""
+    enhanced_spec = constraint_model.get_enhanced_schema() if constraint_model else spec_data
+    
+    # Only the operations the prompt targets (and what they reference) go into the prompt
+    prompt_context = build_prompt_context(enhanced_spec, user_prompt)
+    
+    # Same spec slice, prompt and active rules means the same script
+    fingerprint = script_fingerprint(
+        prompt_context.spec, user_prompt, _high_confidence_rules(constraint_model, prompt_context.endpoints)
+    )
+    return {'enhanced_spec': enhanced_spec, 'prompt_context': prompt_context, 'fingerprint': fingerprint}
+
+
+def _generate_without_llm(plan: Dict[str, Any], user_prompt: str,
+                          constraint_model: Optional[APIConstraintModel]) -> Optional[Dict[str, Any]]:
+    """Replay a cached script or synthesize one from learned constraints, when either applies"""
+    cached_script = get_cached_script(plan['fingerprint'])
+    if cached_script:
+        print("💾 Replaying cached test script (spec, prompt and constraints unchanged)")
+        return {
+            'script': cached_script,
+            'user_prompt': user_prompt,
+            'enhanced_spec_used': constraint_model is not None,
+            'completion_status': 'cached',
+            'fingerprint': plan['fingerprint']
+        }
+    
+    # Endpoints whose learned rules have all stabilized need no LLM at all
+    endpoints = plan['prompt_context'].endpoints
+    if LOCAL_SYNTHESIS and endpoints_are_stable(constraint_model, endpoints):
+        print("🧪 Targeted endpoints are stable; synthesizing test script from learned constraints")
+        return {
+            'script': synthesize_test_script(plan['enhanced_spec'], constraint_model, endpoints,
+                                             user_prompt=user_prompt),
+            'user_prompt': user_prompt,
+            'enhanced_spec_used': True,
+            'completion_status': 'synthesized'
+        }
+    return None
+
+
 def generate_test_script(spec_data: Dict[str, Any], user_prompt: str, constraint_model: Optional[APIConstraintModel] = None) -> Dict[str, Any]:
     """Generate a test script with awareness of learned constraints and complete code validation."""
+    learned_rules_context = ""
+    
+    plan = _plan_generation(spec_data, user_prompt, constraint_model)
+    enhanced_spec, prompt_context, fingerprint = plan['enhanced_spec'], plan['prompt_context'], plan['fingerprint']
+    print(f"✂️ Prompt spec context: {len(prompt_context.endpoints)} endpoint(s), ~{prompt_context.estimated_tokens} tokens")
+    
+    resolved = _generate_without_llm(plan, user_prompt, constraint_model)
+    if resolved:
+        return resolved
+    
     api_key = os.getenv('GOOGLE_API_KEY')
     if not api_key:
         # Fallback gracefully if API key is missing
@@ -198,16 +245,9 @@ def generate_test_script(spec_data: Dict[str, Any], user_prompt: str, constraint
             'error': "GOOGLE_API_KEY environment variable not set or found.",
             'completion_status': 'fallback'
         }
-
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    
-    enhanced_spec = spec_data
-    learned_rules_context = ""
     
     if constraint_model:
-        enhanced_spec = constraint_model.get_enhanced_schema()
-        learned_rules_context = _build_learned_rules_context(constraint_model)
+        learned_rules_context = _build_learned_rules_context(constraint_model, prompt_context.endpoints)
 
     prompt_template = """You are an expert Python test script generator. Your task is to generate a single, complete, and fully-formed pytest test script based on the provided API specification and user requirement.
 
@@ -250,7 +290,7 @@ Now, generate the Python code for the user requirement. Return ONLY the raw Pyth
 """
     
     prompt = prompt_template.format(
-        spec=json.dumps(enhanced_spec, indent=2),
+        spec=json.dumps(prompt_context.spec, indent=2),
         requirement=user_prompt,
         rules_context=learned_rules_context
     )
@@ -262,27 +302,34 @@ Now, generate the Python code for the user requirement. Return ONLY the raw Pyth
             "temperature": 0.1,
         }
         
-        response = llm_call_with_timeout(model, prompt, 90)  # 90 second timeout
-        generated_script = _extract_code_from_response(response.text)
+        response_text = llm_call(prompt, timeout=90, generation_config=generation_config,
+                                 use_cache=False)  # 90 second timeout
+        generated_script = _extract_code_from_response(response_text)
         
         validation_result = _validate_code_completeness(generated_script)
-        if not validation_result['is_complete']:
+        script_is_valid = validation_result['is_complete']
+        if not script_is_valid:
             print(f"❌ Generated script is incomplete: {validation_result['issues']}")
-            completed_script = _complete_incomplete_script(generated_script, model)
+            completed_script = _complete_incomplete_script(generated_script)
             if completed_script:
                 generated_script = completed_script
+                script_is_valid = True
             else:
                 # Corrected: Gracefully use fallback instead of raising an error
                 print("❌ Could not complete script, using fallback.")
                 generated_script = _generate_enhanced_fallback_script(user_prompt, enhanced_spec)
         
+        if script_is_valid:
+            store_script(fingerprint, generated_script)
+        
         print("✅ Final script generated successfully.")
         # Corrected: Return dictionary now includes all required keys
         return {
             'script': generated_script,
             'user_prompt': user_prompt,
             'enhanced_spec_used': constraint_model is not None,
-            'completion_status': 'complete'
+            'completion_status': 'complete',
+            'fingerprint': fingerprint if script_is_valid else None
         }
     
     except Exception as e:
@@ -294,3 +341,136 @@ Now, generate the Python code for the user requirement. Return ONLY the raw Pyth
             'error': str(e),
             'completion_status': 'fallback'
         }
+
+
+BATCH_PROMPT_TEMPLATE = """You are an expert Python test script generator. Your task is to generate {count} separate, complete, and fully-formed pytest test modules, one for each user requirement below, all against the same API specification.
+
+**API SPECIFICATION:**
+{spec}
+
+**USER REQUIREMENTS:**
+{requirements}
+{rules_context}
+
+**CRITICAL REQUIREMENTS:**
+1.  **Generate COMPLETE Python code** for every module. Do not truncate or leave any part of a module unfinished.
+2.  **Each module stands alone.** Repeat the imports in every module; never refer to another module.
+3.  **Use `requests` and `pytest`** and the `api_base_url` fixture for the base URL.
+4.  **Include comprehensive assertions** on status codes and key JSON response fields, with meaningful error messages.
+
+**OUTPUT FORMAT:**
+Return ONLY Python code. Start each module with its marker line, exactly as shown, followed by the module code:
+```python
+# === MODULE 1 ===
+import requests
+import pytest
+
+def test_requirement_one(api_base_url):
+    ...
+# === MODULE 2 ===
+import requests
+import pytest
+...
+```
+"""
+
+
+def _split_modules(response_text: str, count: int) -> Dict[int, str]:
+    """Module number -> code for every marked module in a batched response"""
+    parts = MODULE_MARKER.split(response_text)
+    modules = {}
+    # split() alternates: text before the first marker, number, code, number, code, ...
+    for number, code in zip(parts[1::2], parts[2::2]):
+        number = int(number)
+        if 1 <= number <= count and number not in modules:
+            modules[number] = CODE_FENCE.sub('', code).strip()
+    return modules
+
+
+def _generate_batch_with_llm(spec_data: Dict[str, Any], user_prompts: List[str], plans: List[Dict[str, Any]],
+                             constraint_model: Optional[APIConstraintModel]) -> List[Optional[Dict[str, Any]]]:
+    """One LLM request for several prompts; None for every prompt whose module was missing or incomplete"""
+    prompt_context = merge_prompt_contexts([plan['prompt_context'] for plan in plans])
+    learned_rules_context = ""
+    if constraint_model:
+        learned_rules_context = _build_learned_rules_context(constraint_model, prompt_context.endpoints)
+    
+    prompt = BATCH_PROMPT_TEMPLATE.format(
+        count=len(user_prompts),
+        spec=json.dumps(prompt_context.spec, indent=2),
+        requirements='\n'.join(f"{number}. {user_prompt}" for number, user_prompt in enumerate(user_prompts, 1)),
+        rules_context=learned_rules_context
+    )
+    print(f"🤖 Generating {len(user_prompts)} test scripts in one request "
+          f"({len(prompt_context.endpoints)} endpoint(s), ~{prompt_context.estimated_tokens} spec tokens)...")
+    
+    try:
+        generation_config = {
+            "max_output_tokens": min(4096 * len(user_prompts), 8192),
+            "temperature": 0.1,
+        }
+        response_text = llm_call(prompt, timeout=90 + 30 * len(user_prompts), generation_config=generation_config,
+                                 use_cache=False)
+    except Exception as e:
+        print(f"❌ Batched generation failed: {e}")
+        return [None] * len(user_prompts)
+    
+    modules = _split_modules(response_text, len(user_prompts))
+    results = []
+    for number, (user_prompt, plan) in enumerate(zip(user_prompts, plans), 1):
+        script = modules.get(number, '')
+        validation = _validate_code_completeness(script)
+        if not validation['is_complete']:
+            print(f"❌ Batched module {number} is incomplete: {validation['issues']}")
+            results.append(None)
+            continue
+        store_script(plan['fingerprint'], script)
+        results.append({
+            'script': script,
+            'user_prompt': user_prompt,
+            'enhanced_spec_used': constraint_model is not None,
+            'completion_status': 'batched',
+            'fingerprint': plan['fingerprint']
+        })
+    return results
+
+
+def generate_test_scripts_batch(spec_data: Dict[str, Any], user_prompts: List[str],
+                                constraint_model: Optional[APIConstraintModel] = None,
+                                batch_size: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Generate test scripts for several user prompts against the same spec.
+    
+    Prompts that can be served from the script cache or synthesized locally
+    never reach the LLM. The rest are sent batch_size (GENERATION_BATCH_SIZE)
+    at a time in a single request that returns one delimited module per
+    prompt, so the spec is sent once per batch instead of once per prompt.
+    Modules that are missing or fail validation fall back to
+    generate_test_script for that prompt alone. Results keep the input order.
+    """
+    batch_size = max(1, batch_size or GENERATION_BATCH_SIZE)
+    results: List[Optional[Dict[str, Any]]] = [None] * len(user_prompts)
+    
+    pending = []
+    for index, user_prompt in enumerate(user_prompts):
+        plan = _plan_generation(spec_data, user_prompt, constraint_model)
+        results[index] = _generate_without_llm(plan, user_prompt, constraint_model)
+        if results[index] is None:
+            pending.append((index, plan))
+    
+    if len(pending) > 1 and batch_size > 1 and os.getenv('GOOGLE_API_KEY'):
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start:start + batch_size]
+            if len(chunk) == 1:
+                continue
+            batched = _generate_batch_with_llm(
+                spec_data, [user_prompts[index] for index, _ in chunk], [plan for _, plan in chunk], constraint_model
+            )
+            for (index, _), result in zip(chunk, batched):
+                results[index] = result
+    
+    # Anything the batch did not produce is generated on its own
+    for index, user_prompt in enumerate(user_prompts):
+        if results[index] is None:
+            results[index] = generate_test_script(spec_data, user_prompt, constraint_model)
+    return results
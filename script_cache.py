@@ -0,0 +1,50 @@
+"""
+Cache of validated test scripts keyed by what actually shaped them.
+
+The LLM response cache is keyed by the full prompt text, which changes
+whenever a confidence score in the rules context moves. A generated script
+really depends only on the enhanced spec slice the prompt targets, the user
+prompt, and which high-confidence constraints were in force; the fingerprint
+here covers exactly those, so unchanged APIs replay their scripts without an
+LLM call. A script whose run fails is discarded again, so only scripts that
+have not been seen to fail are replayed.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Any, Iterable, Optional
+
+from llm_cache import LLMResponseCache
+
+# Namespace for script entries, in place of a model name
+SCRIPT_CACHE_KIND = 'validated-test-script'
+
+script_cache = LLMResponseCache(
+    cache_dir=os.getenv('SCRIPT_CACHE_DIR', '.script_cache'),
+    enabled=os.getenv('SCRIPT_CACHE_ENABLED', 'true').lower() == 'true'
+)
+
+
+def script_fingerprint(spec_slice: Dict[str, Any], user_prompt: str, constraint_ids: Iterable[str]) -> str:
+    """Content hash of the inputs that determine a generated script"""
+    payload = json.dumps(
+        {'spec': spec_slice, 'prompt': user_prompt.strip(), 'constraints': sorted(set(constraint_ids))},
+        sort_keys=True, separators=(',', ':'), default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_cached_script(fingerprint: str) -> Optional[str]:
+    """Return the validated script stored under a fingerprint, or None"""
+    return script_cache.get(SCRIPT_CACHE_KIND, fingerprint)
+
+
+def store_script(fingerprint: str, script: str):
+    """Remember a script that passed completeness validation"""
+    script_cache.put(SCRIPT_CACHE_KIND, fingerprint, None, script)
+
+
+def discard_script(fingerprint: str):
+    """Forget a script whose execution failed, so the next attempt asks the LLM again"""
+    script_cache.delete(SCRIPT_CACHE_KIND, fingerprint)
@@ -0,0 +1,99 @@
+"""
+Parsed OpenAPI spec cache.
+
+Parsing a multi-megabyte YAML spec dominates startup, so the parsed dict is
+pickled next to the YAML file (`<spec>.cache`). A cache entry is trusted when
+the YAML's mtime and size are unchanged; otherwise the YAML's sha256 is
+compared, so a touched-but-identical file still hits. Parsing uses libyaml's
+CSafeLoader when PyYAML was built with it.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import yaml
+from typing import Dict, Any, Optional
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+CACHE_SUFFIX = '.cache'
+CACHE_FORMAT_VERSION = 1
+
+
+def _cache_path(spec_path: str) -> str:
+    return spec_path + CACHE_SUFFIX
+
+
+def _read_cache(cache_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(cache_path, 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get('version') != CACHE_FORMAT_VERSION:
+        return None
+    return entry
+
+
+def _write_cache(cache_path: str, entry: Dict[str, Any]):
+    """Atomically replace the cache file; a read-only spec directory just means no caching"""
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def parse_spec(content: bytes) -> Dict[str, Any]:
+    """Parse YAML with the fastest available safe loader"""
+    return yaml.load(content, Loader=SafeLoader)
+
+
+def spec_content_hash(spec: Dict[str, Any]) -> str:
+    """Hash of a parsed spec's content, independent of YAML formatting and key order"""
+    canonical = json.dumps(spec, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def load_spec(spec_path: str, use_cache: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    Load a spec file, going through the on-disk parsed cache.
+
+    Raises the same errors as opening and parsing the file directly
+    (FileNotFoundError, yaml.YAMLError), so callers keep their handling.
+    """
+    if use_cache is None:
+        use_cache = os.getenv('SPEC_CACHE_ENABLED', 'true').lower() == 'true'
+
+    stat = os.stat(spec_path)
+    cache_path = _cache_path(spec_path)
+
+    entry = _read_cache(cache_path) if use_cache else None
+    if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+        return entry['spec']
+
+    with open(spec_path, 'rb') as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+
+    if entry and entry['sha256'] == digest:
+        spec = entry['spec']
+    else:
+        spec = parse_spec(content)
+
+    if use_cache:
+        _write_cache(cache_path, {
+            'version': CACHE_FORMAT_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'spec': spec
+        })
+    return spec
@@ -0,0 +1,41 @@
+import asyncio
+import unittest.mock as mock
+from async_orchestrator import LearningOrchestrator, LearningSession
+from constraint_model import APIConstraintModel
+from main import LearningSessionResult
+
+
+class TestLearningOrchestrator:
+    def setup_method(self):
+        self.spec = {'openapi': '3.0.0', 'paths': {'/users': {'post': {}}}}
+        self.model = APIConstraintModel(self.spec)
+        self.calls = []
+
+    def fake_session(self, spec, user_prompt, max_attempts, **kwargs):
+        self.calls.append((user_prompt, kwargs))
+        if user_prompt == 'broken':
+            raise RuntimeError("boom")
+        return LearningSessionResult(user_prompt=user_prompt, constraint_model=kwargs['constraint_model'],
+                                     learning_attempts=[{}] * max_attempts, converged=True)
+
+    def test_sessions_run_the_shared_learning_loop(self):
+        orchestrator = LearningOrchestrator(constraint_model=self.model, max_concurrency=2)
+        sessions = [LearningSession(self.spec, 'first', max_attempts=2),
+                    LearningSession(self.spec, 'broken', name='bad'),
+                    LearningSession(self.spec, 'second', max_attempts=1)]
+
+        with mock.patch('async_orchestrator.get_executor_pool'), \
+                mock.patch('async_orchestrator.run_learning_session', side_effect=self.fake_session):
+            results = asyncio.run(orchestrator.run(sessions))
+            # The orchestrator can be run again once a run has finished
+            again = asyncio.run(orchestrator.run(sessions[:1]))
+
+        assert [r['user_prompt'] for r in results] == ['first', 'broken', 'second']
+        assert [len(r['attempts']) for r in results] == [2, 0, 1]
+        assert results[1]['error'] == "boom" and results[1]['session'] == 'bad'
+        assert results[0]['error'] is None and results[0]['constraint_model'] is self.model
+        assert again[0]['converged']
+
+        kwargs = dict(self.calls)['first']
+        assert kwargs['executor_backend'] == 'pool'
+        assert kwargs['session_tag'] == 's1'
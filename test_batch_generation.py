@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest.mock as mock
+from constraint_model import APIConstraintModel
+from llm_cache import LLMResponseCache
+from prompt_context import build_prompt_context, merge_prompt_contexts
+from scribe import generate_test_script, generate_test_scripts_batch
+
+SPEC = {
+    'openapi': '3.0.0',
+    'paths': {
+        '/users': {'post': {'summary': 'Create user', 'requestBody': {'content': {'application/json': {
+            'schema': {'$ref': '#/components/schemas/User'}
+        }}}}},
+        '/orders': {'get': {'summary': 'List orders'}},
+        '/products': {'delete': {'summary': 'Delete product'}}
+    },
+    'components': {'schemas': {'User': {'type': 'object', 'properties': {'name': {'type': 'string'}}}}}
+}
+
+
+def _module(test_name, path):
+    return f'''import requests
+import pytest
+
+def {test_name}(api_base_url):
+    response = requests.get(f"{{api_base_url}}{path}")
+    assert response.status_code == 200, response.text
+'''
+
+
+BATCH_RESPONSE = f'''Here are the modules:
+```python
+# === MODULE 1 ===
+{_module('test_create_user', '/users')}
+# === MODULE 2 ===
+import requests
+
+def test_list_orders(api_base_url):
+    response = requests.get(
+```
+
+```python
+# === MODULE 3 ===
+{_module('test_delete_product', '/products')}
+```
+'''
+
+
+class TestBatchGeneration:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = LLMResponseCache(cache_dir=self.temp_dir, enabled=True)
+        self.model = APIConstraintModel(SPEC)
+        self.prompts = ['Create a user', 'List orders', 'Delete a product']
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_one_request_for_all_prompts_with_per_prompt_fallback(self):
+        responses = [BATCH_RESPONSE, f"```python\n{_module('test_list_orders', '/orders')}```"]
+        with mock.patch('script_cache.script_cache', self.cache), \
+                mock.patch.dict(os.environ, {'GOOGLE_API_KEY': 'test-key'}), \
+                mock.patch('scribe.llm_call', side_effect=responses) as mock_llm:
+            results = generate_test_scripts_batch(SPEC, self.prompts, self.model)
+
+            # Validated modules were stored under each prompt's own fingerprint
+            replay = generate_test_script(SPEC, 'Delete a product', self.model)
+
+        assert mock_llm.call_count == 2
+        batch_prompt = mock_llm.call_args_list[0][0][0]
+        assert all(prompt in batch_prompt for prompt in self.prompts)
+        assert batch_prompt.count('"/users"') == 1
+
+        assert [r['completion_status'] for r in results] == ['batched', 'complete', 'batched']
+        assert [r['user_prompt'] for r in results] == self.prompts
+        assert 'def test_list_orders' in results[1]['script']
+        assert replay['completion_status'] == 'cached'
+        assert replay['script'] == results[2]['script']
+
+    def test_merged_context_keeps_each_slice(self):
+        contexts = [build_prompt_context(SPEC, prompt) for prompt in self.prompts]
+        merged = merge_prompt_contexts(contexts)
+
+        assert merged.endpoints == ['/users', '/orders', '/products']
+        assert set(merged.spec['paths']) == {'/users', '/orders', '/products'}
+        assert merged.spec['components'] == SPEC['components']
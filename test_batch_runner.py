@@ -0,0 +1,62 @@
+import os
+import unittest.mock as mock
+from batch_runner import Scenario, run_scenario_batch
+from main import LearningSessionResult, has_converged
+
+
+class TestScenarioBatch:
+    def setup_method(self):
+        self.spec = {'openapi': '3.0.0', 'paths': {'/users': {'post': {}}}}
+
+    def fake_session(self, spec, user_prompt, max_attempts, session_tag=None):
+        spec['paths']['/mutated'] = {}
+        return LearningSessionResult(user_prompt=user_prompt, constraint_model=None,
+                                     learning_attempts=[{}] * max_attempts)
+
+    def test_spec_loaded_once_and_copied_per_scenario(self):
+        """Sessions share one parse of the spec but never each other's dict"""
+        with mock.patch('batch_runner.load_spec_with_error_handling', return_value=self.spec) as mock_load, \
+                mock.patch('batch_runner.run_learning_session', side_effect=self.fake_session):
+            results = run_scenario_batch(
+                [('spec.yaml', 'first'), {'spec_path': 'spec.yaml', 'user_prompt': 'second', 'max_attempts': 3}],
+                parallelism=2
+            )
+
+        assert mock_load.call_count == 1
+        assert '/mutated' not in self.spec['paths']
+        assert [r.user_prompt for r in results] == ['first', 'second']
+        assert [len(r.learning_attempts) for r in results] == [2, 3]
+
+    def test_session_errors_become_results(self):
+        with mock.patch('batch_runner.load_spec_with_error_handling', return_value=self.spec), \
+                mock.patch('batch_runner.run_learning_session', side_effect=RuntimeError("boom")):
+            results = run_scenario_batch([Scenario('spec.yaml', 'prompt')])
+
+        assert results[0].error == "boom"
+        assert results[0].to_dict()['total_constraints'] == 0
+
+    def test_first_scripts_are_generated_in_one_batch_per_spec(self):
+        with mock.patch('batch_runner.load_spec_with_error_handling', return_value=self.spec), \
+                mock.patch('batch_runner.run_learning_session', side_effect=self.fake_session), \
+                mock.patch.dict(os.environ, {'GOOGLE_API_KEY': 'test-key'}), \
+                mock.patch('batch_runner.generate_test_scripts_batch') as mock_batch:
+            run_scenario_batch([('spec.yaml', 'first'), ('spec.yaml', 'second'), ('spec.yaml', 'first'),
+                                ('other.yaml', 'alone')])
+
+        assert mock_batch.call_count == 1
+        assert mock_batch.call_args[0][1] == ['first', 'second']
+
+
+class TestWarmStartConvergence:
+    def test_preloaded_constraints_shorten_the_convergence_window(self):
+        quiet_attempt = [{'learned_constraint': None}]
+
+        assert not has_converged(quiet_attempt)
+        assert not has_converged(quiet_attempt, preloaded_constraints=1)
+        assert has_converged(quiet_attempt * 2, preloaded_constraints=1)
+        assert has_converged(quiet_attempt, preloaded_constraints=5)
+
+    def test_new_constraints_still_block_convergence(self):
+        attempts = [{'learned_constraint': object()}]
+
+        assert not has_converged(attempts, preloaded_constraints=5)
@@ -0,0 +1,60 @@
+import pytest
+from compact_store import CompactConstraintStore
+from constraint_model import LearnedConstraint, ConstraintType, MutualExclusivityRule
+
+
+def make_constraint(parameter='email', endpoint='/users'):
+    return LearnedConstraint(
+        constraint_type=ConstraintType.FORMAT_VALIDATION,
+        affected_parameter=parameter,
+        endpoint_path=endpoint,
+        rule_description=f"{parameter} must be an email",
+        formal_constraint={'format': 'email'},
+        confidence_score=0.9
+    )
+
+
+class TestCompactConstraintStore:
+    def setup_method(self):
+        self.store = CompactConstraintStore()
+
+    def test_learned_constraint_is_slotted_and_interned(self):
+        constraint = make_constraint(parameter=''.join(['em', 'ail']))
+
+        assert not hasattr(constraint, '__dict__')
+        assert constraint.affected_parameter is make_constraint().affected_parameter
+
+    def test_views_expose_the_constraint_attributes(self):
+        original = make_constraint()
+        original.exclusivity_rule = MutualExclusivityRule(['email', 'phone'])
+        index = self.store.append(original)
+
+        view = self.store[index]
+
+        assert view.constraint_type is ConstraintType.FORMAT_VALIDATION
+        assert view.endpoint_path == '/users'
+        assert view.formal_constraint == {'format': 'email'}
+        assert view.exclusivity_rule.exclusive_fields == ['email', 'phone']
+        assert view.conditional_rule is None
+        assert view.last_validated is None
+        assert self.store.to_constraint(index).rule_description == original.rule_description
+
+    def test_updates_write_through_to_columns(self):
+        self.store.append(make_constraint())
+        view = self.store[0]
+
+        view.update_confidence(success=False)
+        view.context_tags.append('imported')
+
+        assert self.store[0].failure_count == 1
+        assert self.store[0].confidence_score == 0.0
+        assert self.store[0].last_validated is not None
+        assert self.store[0].context_tags == ['imported']
+
+    def test_repeated_strings_are_stored_once(self):
+        self.store.extend(make_constraint() for _ in range(100))
+
+        assert len(self.store) == 100
+        assert self.store.get_statistics()['distinct_strings'] == 4
+        with pytest.raises(IndexError):
+            self.store[100]
@@ -0,0 +1,163 @@
+import unittest.mock as mock
+from constraint_model import (
+    APIConstraintModel, LearnedConstraint, ConstraintType, ConditionalRule, MutualExclusivityRule
+)
+
+
+def make_spec():
+    return {
+        'openapi': '3.0.0',
+        'info': {'title': 'Test API', 'version': '1.0.0'},
+        'paths': {
+            '/users': {
+                'post': {
+                    'requestBody': {
+                        'content': {
+                            'application/json': {
+                                'schema': {
+                                    'type': 'object',
+                                    'properties': {'name': {'type': 'string'}, 'email': {'type': 'string'}}
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            '/orders': {'get': {'responses': {'200': {'description': 'OK'}}}}
+        }
+    }
+
+
+def required_field(parameter, endpoint='/users'):
+    return LearnedConstraint(
+        constraint_type=ConstraintType.REQUIRED_FIELD,
+        affected_parameter=parameter,
+        endpoint_path=endpoint,
+        rule_description=f"{parameter} is required",
+        formal_constraint={'required': True}
+    )
+
+
+class TestEnhancedSchema:
+    def setup_method(self):
+        self.spec = make_spec()
+        self.model = APIConstraintModel(self.spec)
+
+    def schema_of(self, spec):
+        return spec['paths']['/users']['post']['requestBody']['content']['application/json']['schema']
+
+    def test_base_spec_is_never_mutated(self):
+        self.model.add_constraint(required_field('email'))
+
+        enhanced = self.model.get_enhanced_schema()
+
+        assert self.schema_of(enhanced)['required'] == ['email']
+        assert 'required' not in self.schema_of(self.spec)
+        assert 'required' not in self.schema_of(self.model.base_spec)
+
+    def test_untouched_paths_are_shared(self):
+        """Only path items with applied constraints are copied"""
+        self.model.add_constraint(required_field('email'))
+
+        enhanced = self.model.get_enhanced_schema()
+
+        assert enhanced['paths']['/orders'] is self.spec['paths']['/orders']
+        assert enhanced['paths']['/users'] is not self.spec['paths']['/users']
+
+    def test_schema_is_memoized_until_constraints_change(self):
+        self.model.add_constraint(required_field('email'))
+        first = self.model.get_enhanced_schema()
+
+        with mock.patch('constraint_model.copy.deepcopy') as mock_copy:
+            assert self.model.get_enhanced_schema() is first
+        assert mock_copy.call_count == 0
+
+        self.model.add_constraint(required_field('name'))
+        assert self.schema_of(self.model.get_enhanced_schema())['required'] == ['email', 'name']
+
+    def test_confidence_drop_below_threshold_removes_constraint(self):
+        constraint_id = self.model.add_constraint(required_field('email'))
+        self.model.get_enhanced_schema()
+
+        self.model.update_confidence(constraint_id, success=False)
+
+        assert self.model.learned_constraints[constraint_id].confidence_score == 0.0
+        assert 'required' not in self.schema_of(self.model.get_enhanced_schema())
+
+
+class TestRelatedConstraints:
+    def setup_method(self):
+        self.model = APIConstraintModel(make_spec())
+
+    def test_lookup_covers_every_rule_shape_without_duplicates(self):
+        conditional = required_field('billing_address')
+        conditional.constraint_type = ConstraintType.CONDITIONAL_REQUIREMENT
+        conditional.conditional_rule = ConditionalRule('plan', 'premium', 'equals', 'billing_address')
+        exclusive = required_field('email')
+        exclusive.constraint_type = ConstraintType.MUTUAL_EXCLUSIVITY
+        exclusive.exclusivity_rule = MutualExclusivityRule(['email', 'phone'])
+        self.model.add_constraint(conditional)
+        self.model.add_constraint(exclusive)
+        self.model.add_constraint(required_field('email', endpoint='/orders'))
+
+        assert self.model.get_related_constraints('plan') == [conditional]
+        assert self.model.get_related_constraints('billing_address') == [conditional]
+        assert self.model.get_related_constraints('email', '/users') == [exclusive]
+        assert self.model.get_related_constraints('phone') == [exclusive]
+        assert len(self.model.get_related_constraints('email')) == 2
+
+    def test_removed_constraints_leave_no_index_entries(self):
+        constraint_id = self.model.add_constraint(required_field('email'))
+
+        assert self.model.remove_constraint(constraint_id) is not None
+
+        assert self.model.get_related_constraints('email') == []
+        assert self.model.field_index == {}
+        assert self.model.endpoint_rules == {}
+        assert self.model.constraints_by_type == {}
+
+
+class TestConstraintUpsert:
+    def setup_method(self):
+        self.model = APIConstraintModel(make_spec())
+
+    def test_relearned_rule_merges_evidence(self):
+        """A collision merges into the stored rule instead of duplicating index entries"""
+        first = required_field('email')
+        first.success_count, first.failure_count = 3, 1
+        constraint_id, created = self.model.upsert_constraint(first)
+        again = required_field('email')
+        again.success_count = 4
+
+        same_id, created_again = self.model.upsert_constraint(again)
+
+        assert created and not created_again
+        assert same_id == constraint_id
+        assert self.model.learned_constraints[constraint_id] is first
+        assert (first.success_count, first.failure_count) == (7, 1)
+        assert first.confidence_score == 7 / 8
+        assert self.model.endpoint_rules['/users'] == [constraint_id]
+        assert self.model.constraints_by_type[ConstraintType.REQUIRED_FIELD] == [constraint_id]
+
+    def test_index_sizes_track_distinct_constraints(self):
+        for _ in range(50):
+            self.model.add_constraint(required_field('email'))
+            self.model.add_constraint(required_field('name'))
+
+        assert len(self.model.learned_constraints) == 2
+        assert sum(len(ids) for ids in self.model.endpoint_rules.values()) == 2
+        assert len(self.model.get_related_constraints('email')) == 1
+
+    def test_replace_reindexes_changed_fields(self):
+        exclusive = required_field('email')
+        exclusive.constraint_type = ConstraintType.MUTUAL_EXCLUSIVITY
+        exclusive.exclusivity_rule = MutualExclusivityRule(['email', 'phone'])
+        constraint_id = self.model.add_constraint(exclusive)
+        replacement = required_field('email')
+        replacement.constraint_type = ConstraintType.MUTUAL_EXCLUSIVITY
+        replacement.exclusivity_rule = MutualExclusivityRule(['email', 'phone'], max_allowed=2)
+
+        self.model.upsert_constraint(replacement, merge=False)
+
+        assert self.model.learned_constraints[constraint_id] is replacement
+        assert self.model.get_related_constraints('phone') == [replacement]
@@ -0,0 +1,113 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import pytest
+import unittest.mock as mock
+import main
+from constraint_model import APIConstraintModel, LearnedConstraint, ConstraintType, ConditionalRule
+from constraint_store import SQLiteConstraintStore, constraint_to_dict, constraint_from_dict
+
+
+SPEC = {'openapi': '3.0.0', 'info': {'title': 'Test API', 'version': '1.0.0'}, 'paths': {'/users': {'post': {}}}}
+
+
+def conditional_constraint():
+    return LearnedConstraint(
+        constraint_type=ConstraintType.CONDITIONAL_REQUIREMENT,
+        affected_parameter='billing_address',
+        endpoint_path='/users',
+        rule_description="billing_address is required for premium plans",
+        formal_constraint={'when': {'plan': 'premium'}},
+        confidence_score=0.9,
+        conditional_rule=ConditionalRule('plan', 'premium', 'equals', 'billing_address')
+    )
+
+
+class TestConstraintStore:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'constraints.db')
+        self.store = SQLiteConstraintStore(self.db_path, namespace='users-api')
+
+    def teardown_method(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip_keeps_rule_sub_objects(self):
+        original = conditional_constraint()
+
+        restored = constraint_from_dict(constraint_to_dict(original))
+
+        assert restored.conditional_rule == original.conditional_rule
+        assert restored.discovered_at == original.discovered_at
+        assert restored.formal_constraint == original.formal_constraint
+
+    def test_model_reloads_constraints_from_a_previous_run(self):
+        first_run = APIConstraintModel(SPEC)
+        first_run.attach_store(self.store)
+        constraint_id = first_run.add_constraint(conditional_constraint())
+        first_run.update_confidence(constraint_id, success=True)
+
+        second_run = APIConstraintModel(SPEC)
+        loaded = second_run.attach_store(SQLiteConstraintStore(self.db_path, namespace='users-api'))
+
+        assert loaded == 1
+        restored = second_run.learned_constraints[constraint_id]
+        assert restored.success_count == 1
+        assert second_run.get_related_constraints('plan') == [restored]
+
+    def test_changes_are_written_per_constraint(self):
+        model = APIConstraintModel(SPEC)
+        model.attach_store(self.store)
+        constraint_id = model.add_constraint(conditional_constraint())
+        assert self.store.count() == 1
+
+        model.remove_constraint(constraint_id)
+
+        assert self.store.count() == 0
+
+    def test_reattaching_writes_only_changed_constraints(self):
+        model = APIConstraintModel(SPEC)
+        constraint_id = model.add_constraint(conditional_constraint())
+
+        with mock.patch.object(self.store, 'save', wraps=self.store.save) as save:
+            model.attach_store(self.store)
+            assert [call[0][0] for call in save.call_args_list] == [constraint_id]
+
+            # A later session on the same model finds nothing new to write
+            save.reset_mock()
+            model.attach_store(self.store)
+            assert save.call_count == 0
+
+            model.upsert_constraint(conditional_constraint())
+            assert save.call_count == 1
+
+    def test_namespaces_are_isolated(self):
+        APIConstraintModel(SPEC).attach_store(self.store)
+        self.store.save('id', conditional_constraint())
+
+        other = SQLiteConstraintStore(self.db_path, namespace='orders-api')
+
+        assert other.load_all() == {}
+        other.close()
+
+    def _run_main(self, env):
+        session = main.LearningSessionResult(user_prompt='prompt', constraint_model=None)
+        with mock.patch.dict(os.environ, env), \
+                mock.patch('main.load_spec_with_error_handling', return_value=SPEC), \
+                mock.patch('main.run_learning_session', return_value=session) as mock_session:
+            if 'CONSTRAINT_STORE_PATH' not in env:
+                os.environ.pop('CONSTRAINT_STORE_PATH', None)
+            main.main()
+        return mock_session.call_args[1]['constraint_store']
+
+    def test_main_persists_only_when_a_store_path_is_configured(self):
+        assert self._run_main({}) is None
+
+        store_path = os.path.join(self.temp_dir, 'main.db')
+        store = self._run_main({'CONSTRAINT_STORE_PATH': store_path})
+        assert store.db_path == store_path and os.path.exists(store_path)
+        # main() closes the store once the session ends
+        with pytest.raises(sqlite3.ProgrammingError):
+            store.count()
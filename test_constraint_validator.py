@@ -0,0 +1,112 @@
+import unittest.mock as mock
+from constraint_model import (
+    APIConstraintModel, LearnedConstraint, ConstraintType, ConditionalRule,
+    MutualExclusivityRule, FormatDependencyRule, BusinessRule
+)
+from constraint_validator import ConstraintValidator, validate_request_body
+from failure_classifier import classify_failure
+from main import _prevalidate_generated_script
+
+SPEC = {'openapi': '3.0.0', 'paths': {'/users': {'post': {}}, '/users/{id}': {'put': {}}}}
+
+VALID_USER = {'name': 'Ann', 'username': 'ann', 'email': 'ann@example.com', 'age': 30,
+              'account_type': 'business', 'company_name': 'Acme'}
+
+
+def _constraint(constraint_type, parameter, endpoint_path='/users', formal=None, **rules):
+    return LearnedConstraint(
+        constraint_type=constraint_type,
+        affected_parameter=parameter,
+        endpoint_path=endpoint_path,
+        rule_description=f"{parameter} rule",
+        formal_constraint=formal or {},
+        confidence_score=0.9,
+        **rules
+    )
+
+
+def _script(body):
+    return f'''import requests
+import pytest
+
+def test_create_user(api_base_url):
+    response = requests.post(f"{{api_base_url}}/users", json={body!r})
+    assert response.status_code == 201, response.text
+'''
+
+
+class TestConstraintValidator:
+    def setup_method(self):
+        self.model = APIConstraintModel(SPEC)
+        for constraint in [
+            _constraint(ConstraintType.REQUIRED_FIELD, 'username', formal={'required': True}),
+            _constraint(ConstraintType.CONDITIONAL_REQUIREMENT, 'company_name',
+                        conditional_rule=ConditionalRule('account_type', 'business', 'equals', 'company_name')),
+            _constraint(ConstraintType.MUTUAL_EXCLUSIVITY, 'email',
+                        exclusivity_rule=MutualExclusivityRule(['email', 'phone'])),
+            _constraint(ConstraintType.FORMAT_DEPENDENCY, 'email',
+                        format_dependency=FormatDependencyRule('email', 'contact_method', 'email', 'email')),
+            _constraint(ConstraintType.BUSINESS_RULE, 'age', formal={'minimum': 18},
+                        business_rule=BusinessRule('age', 'min_value', 18, 'age must be at least 18')),
+            _constraint(ConstraintType.VALUE_CONSTRAINT, 'name', endpoint_path='/users/{id}',
+                        formal={'minLength': 2, 'maxLength': 5}),
+        ]:
+            self.model.upsert_constraint(constraint)
+        self.validator = ConstraintValidator(self.model)
+
+    def _fields(self, endpoint_path, body):
+        return sorted(violation.field for violation in self.validator.validate(endpoint_path, body))
+
+    def test_valid_body_passes(self):
+        assert self.validator.validate('/users', VALID_USER) == []
+
+    def test_each_rule_type_reports_its_field(self):
+        assert self._fields('/users', {k: v for k, v in VALID_USER.items() if k != 'username'}) == ['username']
+        assert self._fields('/users', dict(VALID_USER, account_type='personal', company_name=None)) == []
+        assert self._fields('/users', {k: v for k, v in VALID_USER.items() if k != 'company_name'}) == ['company_name']
+        assert self._fields('/users', dict(VALID_USER, phone='+15550100')) == ['email']
+        assert self._fields('/users', dict(VALID_USER, contact_method='email', email='not-an-email')) == ['email']
+        assert self._fields('/users', dict(VALID_USER, age=16)) == ['age']
+
+    def test_templated_paths_and_low_confidence_rules(self):
+        assert self._fields('/users/42', {'name': 'Alexander'}) == ['name']
+
+        constraint_id = next(cid for cid in self.model.learned_constraints if 'username' in cid)
+        self.model.learned_constraints[constraint_id].confidence_score = 0.5
+        assert self._fields('/users', {k: v for k, v in VALID_USER.items() if k != 'username'}) == []
+
+    def test_classified_constraints_are_checkable(self):
+        model = APIConstraintModel(SPEC)
+        model.upsert_constraint(classify_failure("Quantity must be greater than 0", '/users'))
+
+        assert [v.field for v in validate_request_body(model, '/users', {'Quantity': 0})] == ['Quantity']
+        assert validate_request_body(model, '/users', {'Quantity': 1}) == []
+
+
+class TestPrevalidation:
+    def setup_method(self):
+        self.model = APIConstraintModel(SPEC)
+        self.model.upsert_constraint(_constraint(ConstraintType.REQUIRED_FIELD, 'username', formal={'required': True}))
+        self.validator = ConstraintValidator(self.model)
+
+    def test_violating_script_is_regenerated_before_execution(self):
+        bad = {'script': _script({'name': 'Ann'}), 'user_prompt': 'create user'}
+        good = {'script': _script({'name': 'Ann', 'username': 'ann'}), 'user_prompt': 'create user + rules'}
+
+        with mock.patch('main.generate_test_script_with_error_handling', return_value=good) as mock_generate:
+            script_data, violations = _prevalidate_generated_script(SPEC, 'create user', self.model, bad, self.validator)
+
+        assert violations == []
+        assert script_data['script'] == good['script']
+        assert script_data['user_prompt'] == 'create user'
+        assert 'username: is required' in mock_generate.call_args[0][1]
+
+    def test_negative_tests_are_left_alone(self):
+        negative = {'script': _script({'name': 'Ann'}).replace('== 201', '== 400'), 'user_prompt': 'missing username'}
+
+        with mock.patch('main.generate_test_script_with_error_handling') as mock_generate:
+            script_data, violations = _prevalidate_generated_script(SPEC, 'missing username', self.model,
+                                                                    negative, self.validator)
+
+        assert mock_generate.call_count == 0
+        assert script_data is negative and violations == []
@@ -0,0 +1,106 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from executor import execute_test_script
+from execution_capture import ExecutionRecord, HttpExchange, AssertionOutcome, encode_record, extract_record
+from warm_executor import run_script_in_worker
+
+SCRIPT = '''import requests
+
+BASE = "{base}"
+
+def test_create_user():
+    response = requests.post(f"{{BASE}}/users", json={{"name": "Ann"}})
+    assert response.status_code == 201, f"Expected 201, got {{response.status_code}}"
+
+def test_list_users():
+    response = requests.get(f"{{BASE}}/users", params={{"limit": 5}})
+    assert response.status_code == 200
+'''
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def _reply(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._reply(400, {'error': 'username field is required'})
+
+    def do_GET(self):
+        self._reply(200, [])
+
+    def log_message(self, *args):
+        pass
+
+
+class TestExecutionCapture:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = HTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        self.script = os.path.join(self.temp_dir, 'generated_test_capture.py')
+        with open(self.script, 'w', encoding='utf-8') as f:
+            f.write(SCRIPT.format(base=base))
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _check_record(self, record):
+        assert [(e.method, e.endpoint_path, e.status_code) for e in record.exchanges] == [
+            ('POST', '/users', 400), ('GET', '/users', 200)
+        ]
+        assert record.exchanges[0].request_json == {'name': 'Ann'}
+        assert record.exchanges[0].test_name == 'test_create_user'
+        assert record.exchanges[1].request_params == {'limit': 5}
+        assert all(latency >= 0 for latency in record.request_latencies_ms)
+        assert [(a.test_name, a.outcome) for a in record.assertions] == [
+            ('test_create_user', 'failed'), ('test_list_users', 'passed')
+        ]
+
+        details = record.failure_details()
+        assert details.as_tuple() == ('POST', '/users', '400', 'username field is required')
+        assert details.error_json == {'error': 'username field is required'}
+        assert 'Expected 201, got 400' in details.assertion_message
+
+    def test_subprocess_backend_returns_record(self):
+        result = execute_test_script(self.script, backend='subprocess')
+
+        assert not result['success']
+        assert '@@EXECUTION_RECORD@@' not in result['stdout']
+        self._check_record(result['execution'])
+
+    def test_warm_direct_runner_embeds_record(self):
+        stdout, record = extract_record(run_script_in_worker(self.script)['stdout'])
+
+        assert 'test_create_user FAILED' in stdout
+        self._check_record(record)
+
+
+class TestRecordEncoding:
+    def test_marker_round_trip(self):
+        record = ExecutionRecord(
+            exchanges=[HttpExchange('GET', 'http://api/items/1', status_code=404,
+                                    response_json={'detail': 'Not found'}, elapsed_ms=1.5)],
+            assertions=[AssertionOutcome('test_item', 'failed', 'assert 404 == 200')]
+        )
+        stdout, decoded = extract_record("line one\n" + encode_record(record) + "\nline two\n")
+
+        assert stdout == "line one\nline two\n"
+        assert decoded == record
+        assert decoded.failure_details().error_message == 'Not found'
+
+    def test_no_requests_means_no_details(self):
+        assert ExecutionRecord().failure_details() is None
+        assert extract_record("plain output") == ("plain output", None)
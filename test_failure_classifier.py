@@ -0,0 +1,45 @@
+from failure_classifier import classify_failure
+from constraint_model import ConstraintType
+
+
+class TestFailureClassifier:
+    def test_required_field(self):
+        constraint = classify_failure("username field is required", "/users")
+
+        assert constraint.constraint_type == ConstraintType.REQUIRED_FIELD
+        assert constraint.affected_parameter == "username"
+        assert constraint.endpoint_path == "/users"
+
+    def test_conditional_requirement(self):
+        constraint = classify_failure("billing_address is required when payment_method is 'credit_card'", "/orders")
+
+        assert constraint.constraint_type == ConstraintType.CONDITIONAL_REQUIREMENT
+        rule = constraint.conditional_rule
+        assert (rule.condition_field, rule.condition_value, rule.required_field) == \
+            ("payment_method", "credit_card", "billing_address")
+
+    def test_mutual_exclusivity(self):
+        constraint = classify_failure("Cannot specify both email and phone. Please provide only one contact method.", "/users")
+
+        assert constraint.constraint_type == ConstraintType.MUTUAL_EXCLUSIVITY
+        assert constraint.exclusivity_rule.exclusive_fields == ["email", "phone"]
+
+    def test_business_rule_minimum(self):
+        constraint = classify_failure("age must be at least 18 for account creation", "/users")
+
+        assert constraint.constraint_type == ConstraintType.BUSINESS_RULE
+        assert constraint.business_rule.rule_type == "min_value"
+        assert constraint.business_rule.constraint_value == 18
+
+    def test_rate_limit_windows(self):
+        per_seconds = classify_failure("Rate limit exceeded: maximum 10 requests per 30 seconds for user creation", "/users")
+        per_minute = classify_failure("Rate limit exceeded: maximum 10 orders per minute", "/orders")
+
+        assert per_seconds.rate_limit_rule.max_requests == 10
+        assert per_seconds.rate_limit_rule.time_window_seconds == 30
+        assert per_minute.rate_limit_rule.time_window_seconds == 60
+
+    def test_unrecognized_messages_fall_through_to_the_llm(self):
+        assert classify_failure("Request body is required", "/users") is None
+        assert classify_failure("Something unexpected happened", "/users") is None
+        assert classify_failure("", "/users") is None
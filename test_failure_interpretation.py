@@ -0,0 +1,107 @@
+import json
+import unittest.mock as mock
+from constraint_model import APIConstraintModel, ConstraintType
+from execution_capture import ExecutionRecord, HttpExchange, AssertionOutcome
+from interpreter import interpret_failures
+from main import _upsert_constraints
+
+BASE = 'http://127.0.0.1:5000'
+
+UNKNOWN_RULES = [
+    {
+        "rule_description": "Express delivery cannot ship to PO boxes",
+        "constraint_type": "conditional_requirement",
+        "affected_parameter": "shipping_address",
+        "endpoint_path": "/orders",
+        "formal_constraint": {"not_po_box_when": {"delivery": "express"}},
+        "confidence": 0.8
+    },
+    None,
+]
+
+
+def _exchange(method, path, status, error, test_name):
+    return HttpExchange(method=method, url=f"{BASE}{path}", status_code=status,
+                        response_json={'error': error} if error else {}, test_name=test_name)
+
+
+class TestFailureInterpretation:
+    def setup_method(self):
+        self.record = ExecutionRecord(
+            exchanges=[
+                _exchange('POST', '/users', 400, 'Cannot specify both email and phone', 'test_contact'),
+                _exchange('POST', '/users', 400, 'Cannot specify both email and phone', 'test_contact'),
+                _exchange('POST', '/users', 422, 'age must be at least 18', 'test_age'),
+                _exchange('POST', '/orders', 400, 'PO boxes are not served by express delivery', 'test_order'),
+                _exchange('GET', '/orders/7', 409, 'Order is locked by another session', 'test_lock'),
+                _exchange('GET', '/products', 500, 'Internal error', 'test_products'),
+                _exchange('GET', '/users', 200, None, 'test_list'),
+            ],
+            assertions=[
+                AssertionOutcome('test_contact', 'failed', 'Expected 201, got 400'),
+                AssertionOutcome('test_products', 'failed', 'Expected 200, got 500'),
+                AssertionOutcome('test_list', 'failed', 'list was empty'),
+                AssertionOutcome('test_ok', 'passed'),
+            ]
+        )
+
+    def test_every_distinct_failure_is_collected(self):
+        failures = self.record.all_failure_details()
+
+        assert [(f.http_method, f.endpoint_path, f.status_code) for f in failures] == [
+            ('POST', '/users', '400'), ('POST', '/users', '422'), ('POST', '/orders', '400'),
+            ('GET', '/orders/7', '409'), ('GET', '/products', '500'), ('GET', '/users', '200'),
+        ]
+        assert failures[-1].error_message == 'list was empty'
+
+    def test_known_failures_stay_local_and_the_rest_share_one_llm_call(self):
+        with mock.patch('interpreter.get_model'), \
+                mock.patch('interpreter.llm_call', return_value=json.dumps(UNKNOWN_RULES)) as mock_llm:
+            constraints = interpret_failures('Create orders', '', {}, None, execution=self.record)
+
+        assert mock_llm.call_count == 1
+        prompt = mock_llm.call_args[0][0]
+        assert 'PO boxes' in prompt and 'locked by another session' in prompt
+        assert '**FAILURE 2:**' in prompt and '**FAILURE 3:**' not in prompt
+        assert 'Internal error' not in prompt
+
+        assert [c.constraint_type for c in constraints] == [
+            ConstraintType.MUTUAL_EXCLUSIVITY, ConstraintType.BUSINESS_RULE, ConstraintType.CONDITIONAL_REQUIREMENT,
+        ]
+
+    def test_all_constraints_of_a_run_are_merged(self):
+        model = APIConstraintModel({'paths': {}})
+        with mock.patch('interpreter.get_model'), \
+                mock.patch('interpreter.llm_call', return_value=json.dumps(UNKNOWN_RULES)):
+            constraints = interpret_failures('Create orders', '', {}, None, execution=self.record)
+
+        learned, reinforced = _upsert_constraints(model, constraints)
+        assert len(learned) == 3 and reinforced == []
+
+        learned, reinforced = _upsert_constraints(model, constraints[:2] * 2)
+        assert learned == [] and len(reinforced) == 2
+
+    def test_batched_array_is_found_in_prose_with_nested_brackets(self):
+        response = f"Here is the analysis [see below]:\n```json\n{json.dumps(UNKNOWN_RULES, indent=2)}\n```\nDone [1]."
+        with mock.patch('interpreter.get_model'), \
+                mock.patch('interpreter.llm_call', return_value=response) as mock_llm:
+            constraints = interpret_failures('Create orders', '', {}, None, execution=self.record)
+
+        assert mock_llm.call_count == 1
+        prompt = mock_llm.call_args[0][0]
+        assert 'Return ONLY a JSON array' in prompt and 'Return a JSON object' not in prompt
+        assert constraints[-1].constraint_type == ConstraintType.CONDITIONAL_REQUIREMENT
+
+    def test_mismatched_batch_falls_back_to_one_call_per_failure(self):
+        responses = [json.dumps(UNKNOWN_RULES[:1]), json.dumps(UNKNOWN_RULES[0]), 'no rule here']
+        with mock.patch('interpreter.get_model'), \
+                mock.patch('interpreter.llm_call', side_effect=responses) as mock_llm:
+            constraints = interpret_failures('Create orders', '', {}, None, execution=self.record)
+
+        assert mock_llm.call_count == 3
+        single_prompts = [call[0][0] for call in mock_llm.call_args_list[1:]]
+        assert 'PO boxes' in single_prompts[0] and 'locked by another session' in single_prompts[1]
+        assert all('Return a JSON object' in prompt for prompt in single_prompts)
+        assert [c.constraint_type for c in constraints] == [
+            ConstraintType.MUTUAL_EXCLUSIVITY, ConstraintType.BUSINESS_RULE, ConstraintType.CONDITIONAL_REQUIREMENT,
+        ]
@@ -0,0 +1,69 @@
+import time
+from failure_parser import parse_failure_output
+
+
+SCRIPT = '''import requests
+
+def test_create_order(api_base_url):
+    payload = {"item": "book", "quantity": 0}
+    response = requests.post(f"{api_base_url}/orders", json=payload)
+    assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
+'''
+
+OUTPUT = '''=== PYTEST EXECUTION RESULTS ===
+Return code: 1
+
+=== STDOUT ===
+>       assert response.status_code == 201, f"Expected 201, got {response.status_code}: {response.text}"
+E       AssertionError: Expected 201, got 400: {"error": "quantity must be at least 1", "code": 17}
+E       assert 400 == 201
+
+=== STDERR ===
+
+=== END RESULTS ===
+'''
+
+
+class TestFailureParser:
+    def test_structured_record(self):
+        details = parse_failure_output(OUTPUT, SCRIPT)
+
+        assert details.http_method == 'POST'
+        assert details.url == '{api_base_url}/orders'
+        assert details.endpoint_path == '/orders'
+        assert details.status_code == '400'
+        assert details.error_message == 'quantity must be at least 1'
+        assert details.error_json == {'error': 'quantity must be at least 1', 'code': 17}
+        assert details.assertion_message.startswith('Expected 201, got 400')
+
+    def test_matches_legacy_tuple_shape(self):
+        assert parse_failure_output(OUTPUT, SCRIPT).as_tuple() == (
+            'POST', '/orders', '400', 'quantity must be at least 1'
+        )
+
+    def test_python_dict_repr_and_response_status(self):
+        output = "E   assert <Response [422]> ...\nE   {'error': 'email must be a valid email'}\n"
+        details = parse_failure_output(output, 'requests.put("http://localhost:8000/users/1")')
+
+        assert details.http_method == 'PUT'
+        assert details.endpoint_path == '/users/1'
+        assert details.status_code == '422'
+        assert details.error_json == {'error': 'email must be a valid email'}
+
+    def test_assertion_message_used_without_error_json(self):
+        output = "E   AssertionError: Missing required field: email\n"
+        details = parse_failure_output(output, '')
+
+        assert (details.http_method, details.endpoint_path) == ('POST', '/users')
+        assert details.status_code is None
+        assert details.error_message == 'Missing required field: email'
+
+    def test_large_output_stays_linear(self):
+        noise = 'status_code ' + '1' * 2 + ' x' * 200 + '\n'
+        output = noise * 20000 + OUTPUT
+
+        start = time.perf_counter()
+        details = parse_failure_output(output, SCRIPT)
+
+        assert time.perf_counter() - start < 5
+        assert details.status_code == '400'
@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest.mock as mock
+from llm_cache import LLMResponseCache
+
+
+class TestLLMResponseCache:
+    def setup_method(self):
+        """Each test gets an isolated cache directory"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = LLMResponseCache(cache_dir=self.temp_dir, max_entries=10, ttl_seconds=3600, enabled=True)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_key_depends_on_model_prompt_and_params(self):
+        base = LLMResponseCache.make_key('gemini-1.5-flash', 'prompt', {'temperature': 0.1})
+
+        assert base == LLMResponseCache.make_key('gemini-1.5-flash', 'prompt', {'temperature': 0.1})
+        assert base != LLMResponseCache.make_key('gemini-1.5-pro', 'prompt', {'temperature': 0.1})
+        assert base != LLMResponseCache.make_key('gemini-1.5-flash', 'prompt 2', {'temperature': 0.1})
+        assert base != LLMResponseCache.make_key('gemini-1.5-flash', 'prompt', {'temperature': 0.2})
+
+    def test_get_or_generate_calls_llm_once(self):
+        """A repeated prompt is served from disk without calling the LLM"""
+        generate = mock.Mock(return_value="```python\nprint('hi')\n```")
+
+        first = self.cache.get_or_generate('model', 'same prompt', None, generate)
+        second = self.cache.get_or_generate('model', 'same prompt', None, generate)
+
+        assert first == second
+        assert generate.call_count == 1
+        assert self.cache.hits == 1
+
+    def test_expired_entries_are_misses(self):
+        self.cache.put('model', 'prompt', None, 'old response')
+
+        with mock.patch('llm_cache.time.time', return_value=time.time() + 7200):
+            assert self.cache.get('model', 'prompt') is None
+
+        assert self.cache.get_statistics()['entries'] == 0
+
+    def test_lru_eviction_keeps_recently_used(self):
+        """Entries read recently survive when the cache is over its size bound"""
+        cache = LLMResponseCache(cache_dir=self.temp_dir, max_entries=2, ttl_seconds=3600, enabled=True)
+        cache.put('model', 'first', None, 'one')
+        cache.put('model', 'second', None, 'two')
+        old = time.time() - 100
+        for name in os.listdir(self.temp_dir):
+            if name.endswith('.json'):
+                os.utime(os.path.join(self.temp_dir, name), (old, old))
+
+        assert cache.get('model', 'first') == 'one'
+        cache.put('model', 'third', None, 'three')
+
+        assert cache.get('model', 'first') == 'one'
+        assert cache.get('model', 'second') is None
+        assert cache.get('model', 'third') == 'three'
+
+    def test_delete_and_clear_remove_entries(self):
+        self.cache.put('model', 'first', None, 'one')
+        self.cache.put('model', 'second', None, 'two')
+
+        self.cache.delete('model', 'first')
+        assert self.cache.get('model', 'first') is None
+        assert self.cache.get('model', 'second') == 'two'
+
+        self.cache.clear()
+        assert self.cache.get_statistics() == {'entries': 0, 'hits': 1, 'misses': 1, 'bytes': 0}
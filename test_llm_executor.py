@@ -0,0 +1,108 @@
+import threading
+import time
+import unittest.mock as mock
+import pytest
+from llm_executor import LLMCallExecutor, is_retryable_error
+
+
+class ResourceExhausted(Exception):
+    """Stands in for google.api_core.exceptions.ResourceExhausted"""
+
+
+class TestLLMCallExecutor:
+    def setup_method(self):
+        self.executor = LLMCallExecutor(max_concurrency=2, max_retries=2, backoff_base=0.01, backoff_max=0.02)
+
+    def teardown_method(self):
+        self.executor.shutdown(wait=False)
+
+    def test_in_flight_calls_are_bounded(self):
+        """No more than max_concurrency calls run at once"""
+        peak = [0]
+        lock = threading.Lock()
+
+        def slow_call(remaining):
+            with lock:
+                peak[0] = max(peak[0], self.executor.in_flight)
+            time.sleep(0.05)
+            return "ok"
+
+        threads = [threading.Thread(target=self.executor.call, args=(slow_call, 5)) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] <= 2
+        stats = self.executor.get_statistics()
+        assert stats['completed'] == 6
+        assert stats['in_flight'] == 0
+        assert stats['queue_depth'] == 0
+
+    def test_timeout_cancels_queued_calls(self):
+        """Calls stuck behind busy workers are cancelled rather than left to run"""
+        release = threading.Event()
+        blockers = [threading.Thread(target=self.executor.call, args=(lambda remaining: release.wait(5), 10))
+                    for _ in range(2)]
+        for thread in blockers:
+            thread.start()
+        time.sleep(0.05)
+
+        with pytest.raises(TimeoutError):
+            self.executor.call(lambda remaining: "never runs", 0.1)
+
+        assert self.executor.get_statistics()['cancelled'] == 1
+        assert self.executor.queue_depth == 0
+        release.set()
+        for thread in blockers:
+            thread.join()
+
+    def test_running_call_receives_remaining_deadline(self):
+        received = []
+        self.executor.call(lambda remaining: received.append(remaining), 3)
+
+        assert 0 < received[0] <= 3
+
+    def test_queue_wait_counts_against_the_deadline(self):
+        blockers = [threading.Thread(target=self.executor.call, args=(lambda remaining: time.sleep(0.3), 5))
+                    for _ in range(2)]
+        for thread in blockers:
+            thread.start()
+        time.sleep(0.05)
+
+        received = []
+        self.executor.call(lambda remaining: received.append(remaining), 2)
+        for thread in blockers:
+            thread.join()
+
+        assert 0 < received[0] < 1.9
+
+    def test_retryable_errors_back_off_and_retry(self):
+        attempts = []
+
+        def flaky(remaining):
+            attempts.append(remaining)
+            if len(attempts) < 3:
+                raise ResourceExhausted("429 quota exceeded")
+            return "recovered"
+
+        with mock.patch('llm_executor.time.sleep') as mock_sleep:
+            assert self.executor.call(flaky, 10) == "recovered"
+
+        assert len(attempts) == 3
+        assert mock_sleep.call_count == 2
+        assert self.executor.get_statistics()['retries'] == 2
+
+    def test_non_retryable_errors_raise_immediately(self):
+        calls = []
+
+        def broken(remaining):
+            calls.append(remaining)
+            raise ValueError("bad prompt")
+
+        with pytest.raises(ValueError):
+            self.executor.call(broken, 10)
+
+        assert len(calls) == 1
+        assert not is_retryable_error(ValueError("bad prompt"))
+        assert is_retryable_error(ConnectionError("reset"))
@@ -0,0 +1,97 @@
+import gc
+import glob
+import os
+import shutil
+import tempfile
+import unittest.mock as mock
+from executor import execute_test_script, release_execution_result
+from output_capture import CapturedOutput, BoundedCapture, bound_text, read_bounded, SPILL_PREFIX
+
+
+class TestCapturedOutput:
+    def test_small_output_stays_in_memory(self):
+        output = CapturedOutput("short", spool_threshold=100)
+
+        assert not output.spilled
+        assert output.read() == "short"
+
+    def test_large_output_spills_and_cleanup_removes_file(self):
+        output = CapturedOutput("x" * 200, spool_threshold=100)
+        path = output.path
+
+        assert output.spilled
+        assert os.path.exists(path)
+        assert output.read() == "x" * 200
+
+        output.cleanup()
+        assert not os.path.exists(path)
+
+    def test_spilled_file_removed_when_collected(self):
+        output = CapturedOutput("y" * 200, spool_threshold=100)
+        path = output.path
+
+        del output
+        gc.collect()
+        assert not os.path.exists(path)
+
+    def test_runaway_output_keeps_head_and_tail(self):
+        text = "HEAD" + "-" * 10000 + "TAIL"
+        bounded = bound_text(text, max_chars=100)
+
+        assert bounded.startswith("HEAD") and bounded.endswith("TAIL")
+        assert "[9908 characters truncated]" in bounded
+        assert len(CapturedOutput(text, max_chars=100)) == len(bounded)
+
+    def test_output_is_bounded_while_it_is_written(self):
+        text = "HEAD" + "-" * 10000 + "TAIL"
+        stream = BoundedCapture(max_chars=100)
+        for start in range(0, len(text), 7):
+            stream.write(text[start:start + 7])
+        stream.write("")
+
+        assert stream.getvalue() == bound_text(text, max_chars=100)
+        assert sum(len(chunk) for chunk in stream._head + list(stream._tail)) <= 2 * 100
+
+        with tempfile.TemporaryFile() as f:
+            f.write(text.encode('utf-8'))
+            bounded = read_bounded(f, max_chars=100)
+        assert bounded.startswith("HEAD") and bounded.endswith("TAIL")
+        assert "[9908 bytes truncated]" in bounded
+
+
+class TestExecutorLifecycle:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.temp_dir, 'generated_test_lifecycle.py')
+        with open(self.script, 'w', encoding='utf-8') as f:
+            f.write("def test_fails():\n    assert 400 == 201, 'Expected 201, got 400'\n")
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _spill_files(self):
+        return set(glob.glob(os.path.join(tempfile.gettempdir(), SPILL_PREFIX + '*')))
+
+    def test_execution_leaves_no_temp_files(self):
+        before = self._spill_files()
+        result = execute_test_script(self.script, backend='subprocess')
+
+        assert result['output_file'] is None
+        assert 'Expected 201, got 400' in result['output'].read()
+        assert self._spill_files() == before
+
+        release_execution_result(result)
+        assert self._spill_files() == before
+
+    def test_result_keeps_only_a_tail_of_runaway_output(self):
+        with open(self.script, 'w', encoding='utf-8') as f:
+            f.write("def test_noisy():\n    print('x' * 100000)\n    assert False, 'noisy failure'\n")
+
+        with mock.patch('output_capture.OUTPUT_MAX_CHARS', 20000), \
+                mock.patch('output_capture.OUTPUT_TAIL_CHARS', 500):
+            result = execute_test_script(self.script, backend='subprocess')
+
+        assert len(result['stdout']) == 500 and '1 failed' in result['stdout']
+        assert 'bytes truncated' in result['output'].read()
+        assert len(result['output']) < 21000
+        release_execution_result(result)
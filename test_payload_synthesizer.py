@@ -0,0 +1,84 @@
+import ast
+import unittest.mock as mock
+from constraint_model import APIConstraintModel
+from constraint_validator import ConstraintValidator
+from failure_classifier import classify_failure
+from payload_synthesizer import PayloadSynthesizer, synthesize_test_script, endpoints_are_stable
+from scribe import generate_test_script
+from spec_cache import load_spec
+
+LEARNED = [
+    ("Cannot specify both email and phone", '/users'),
+    ("age must be at least 18", '/users'),
+    ("Valid email format required when contact_type is 'email'", '/users'),
+    ("billing_address is required when payment_method is 'credit_card'", '/orders'),
+    ("total_amount must be greater than 0", '/orders'),
+]
+
+
+class TestPayloadSynthesizer:
+    def setup_method(self):
+        self.spec = load_spec('specs/spec_enhanced_flawed.yaml', use_cache=False)
+        self.model = APIConstraintModel(self.spec)
+        for message, endpoint_path in LEARNED:
+            self.model.upsert_constraint(classify_failure(message, endpoint_path))
+        self.synthesizer = PayloadSynthesizer(self.spec, self.model)
+        self.validator = ConstraintValidator(self.model)
+
+    def test_valid_bodies_satisfy_schema_and_rules(self):
+        users, violations = self.synthesizer.valid_body('/users')
+
+        assert violations == []
+        assert {'name', 'username'} <= set(users)
+        assert ('email' in users) != ('phone' in users)
+
+        orders, violations = self.synthesizer.valid_body('/orders')
+        assert violations == []
+        assert orders['total_amount'] > 0
+        assert orders['payment_method'] in ('cash', 'credit_card', 'debit_card')
+
+    def test_each_invalid_body_breaks_only_its_rule(self):
+        cases = self.synthesizer.invalid_bodies('/users') + self.synthesizer.invalid_bodies('/orders')
+
+        assert {case.field for case in cases} >= {'email', 'age', 'billing_address', 'total_amount'}
+        for case in cases:
+            endpoint_path = '/orders' if case.constraint_id.startswith('/orders') else '/users'
+            assert [v.constraint_id for v in self.validator.validate(endpoint_path, case.body)] == [case.constraint_id]
+
+    def test_script_covers_every_operation(self):
+        script = synthesize_test_script(self.spec, self.model)
+        test_names = [node.name for node in ast.parse(script).body if isinstance(node, ast.FunctionDef)]
+
+        assert 'test_post_users_valid' in test_names
+        assert 'test_post_orders_valid' in test_names
+        assert any(name.startswith('test_post_users_rejects_age') for name in test_names)
+        assert 'requests.post(f"{api_base_url}/orders", json=payload)' in script
+
+    def test_script_sticks_to_the_methods_the_prompt_asks_for(self):
+        spec = dict(self.spec, paths=dict(self.spec['paths'], **{'/users/{id}': {
+            'get': {'summary': 'Get user'}, 'put': {'summary': 'Update user'}, 'delete': {'summary': 'Delete user'}
+        }}))
+
+        def test_names(user_prompt):
+            script = synthesize_test_script(spec, self.model, ['/users', '/users/{id}'], user_prompt=user_prompt)
+            return {node.name for node in ast.parse(script).body if isinstance(node, ast.FunctionDef)}
+
+        assert {name for name in test_names('Create a new user') if name.endswith('_valid')} == {'test_post_users_valid'}
+        assert test_names('Remove a user') == {'test_delete_users_id_valid'}
+
+        unspecific = test_names('Users endpoints behave')
+        assert 'test_put_users_id_valid' in unspecific and 'test_get_users_id_valid' in unspecific
+        assert 'test_delete_users_id_valid' not in unspecific
+
+    def test_stable_endpoints_skip_the_llm(self):
+        assert endpoints_are_stable(self.model, ['/users', '/orders'])
+        assert not endpoints_are_stable(self.model, ['/products'])
+
+        with mock.patch('scribe.LOCAL_SYNTHESIS', True), \
+                mock.patch('scribe.get_cached_script', return_value=None), \
+                mock.patch('scribe.llm_call') as mock_llm:
+            result = generate_test_script(self.spec, 'Create a new user', self.model)
+
+        assert mock_llm.call_count == 0
+        assert result['completion_status'] == 'synthesized'
+        assert 'def test_post_users_valid' in result['script']
@@ -0,0 +1,58 @@
+from prompt_context import build_prompt_context, resolve_target_operations
+
+
+def make_spec(extra_paths=0):
+    spec = {
+        'openapi': '3.0.0',
+        'info': {'title': 'Shop API', 'version': '1.0.0'},
+        'paths': {
+            '/users': {
+                'get': {'summary': 'List users'},
+                'post': {
+                    'summary': 'Create a user',
+                    'requestBody': {'content': {'application/json': {'schema': {'$ref': '#/components/schemas/User'}}}}
+                }
+            },
+            '/orders/{orderId}': {
+                'parameters': [{'name': 'orderId', 'in': 'path', 'required': True}],
+                'delete': {'summary': 'Cancel an order'}
+            }
+        },
+        'components': {
+            'schemas': {
+                'User': {'type': 'object', 'properties': {'address': {'$ref': '#/components/schemas/Address'}}},
+                'Address': {'type': 'object', 'properties': {'city': {'type': 'string'}}},
+                'Order': {'type': 'object'}
+            }
+        }
+    }
+    for i in range(extra_paths):
+        spec['paths'][f'/widgets{i}'] = {'get': {'summary': 'A widget endpoint ' + 'x' * 200}}
+    return spec
+
+
+class TestPromptContext:
+    def test_prompt_verb_and_resource_pick_the_operation(self):
+        ranked = resolve_target_operations(make_spec(), "Create a new user with valid data")
+
+        assert ranked[0] == ('/users', 'post')
+        assert ('/orders/{orderId}', 'delete') not in ranked
+
+    def test_slice_includes_transitive_schema_refs_only(self):
+        context = build_prompt_context(make_spec(), "Create a new user with valid data")
+
+        assert context.endpoints == ['/users']
+        assert set(context.spec['components']['schemas']) == {'User', 'Address'}
+        assert context.spec['info']['title'] == 'Shop API'
+
+    def test_path_level_parameters_are_kept(self):
+        context = build_prompt_context(make_spec(), "Delete an order")
+
+        assert context.spec['paths']['/orders/{orderId}']['parameters'][0]['name'] == 'orderId'
+
+    def test_token_budget_limits_unmatched_prompts(self):
+        """With no match every operation is a candidate, but the budget still applies"""
+        context = build_prompt_context(make_spec(extra_paths=300), "zzz", token_budget=1000)
+
+        assert 0 < len(context.spec['paths']) < 20
+        assert context.estimated_tokens <= 1000
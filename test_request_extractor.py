@@ -0,0 +1,92 @@
+import unittest.mock as mock
+from main import _extract_request_details_from_script
+from request_extractor import extract_requests
+
+SCRIPT = '''import requests
+import pytest
+
+BASE_USER = {"name": "Ann", "address": {"city": "Oslo", "geo": {"lat": 59.9}}}
+
+def test_create_and_update(api_base_url):
+    payload = {**BASE_USER, "tags": ["a", "b"], "age": 30}
+    response = requests.post(f"{api_base_url}/users", json=payload, headers={"X-Trace": "1"})
+    assert response.status_code == 201, response.text
+    user_id = response.json()["id"]
+
+    update = {"address": {"city": "Bergen"}}
+    requests.put(f"{api_base_url}/users/{user_id}", json=update, params={"notify": True})
+
+def test_missing_name_rejected(api_base_url):
+    payload = dict(BASE_USER)
+    del payload["name"]
+    payload["age"] = 17
+    session = requests.Session()
+    response = session.request("POST", "http://localhost:5000/users?dry_run=1", json=payload)
+    assert response.status_code in (400, 422)
+'''
+
+
+class TestRequestExtractor:
+    def test_resolves_nested_bodies_and_urls(self):
+        first, second, third = extract_requests(SCRIPT)
+
+        assert (first.http_method, first.endpoint_path, first.test_name) == ('POST', '/users', 'test_create_and_update')
+        assert first.json_body == {'name': 'Ann', 'address': {'city': 'Oslo', 'geo': {'lat': 59.9}},
+                                   'tags': ['a', 'b'], 'age': 30}
+        assert first.headers == {'X-Trace': '1'}
+        assert first.expects_success
+
+        assert second.url == '{api_base_url}/users/{user_id}'
+        assert second.endpoint_path == '/users/{user_id}'
+        assert second.json_body == {'address': {'city': 'Bergen'}}
+        assert second.params == {'notify': True}
+
+        assert (third.http_method, third.endpoint_path) == ('POST', '/users')
+        assert third.json_body == {'address': {'city': 'Oslo', 'geo': {'lat': 59.9}}, 'age': 17}
+        assert third.expected_status == 400 and not third.expects_success
+
+    def test_unresolvable_values_keep_their_source(self):
+        script = '''import requests
+
+payload = {"name": "module level"}
+
+def test_dynamic(api_base_url):
+    payload = build_payload()
+    requests.post(f"{api_base_url}/users", json={"name": payload, "when": time.time()})
+'''
+        (request,) = extract_requests(script)
+
+        assert request.json_body == {'name': 'payload', 'when': 'time.time()'}
+
+    def test_script_is_never_executed(self):
+        script = 'import requests\nrequests.post("/users", json={"a": __import__("os").system("exit 1")})\n'
+
+        with mock.patch('os.system') as mock_system:
+            (request,) = extract_requests(script)
+
+        assert mock_system.call_count == 0
+        assert request.json_body == {'a': '__import__(\'os\').system(\'exit 1\')'}
+        assert extract_requests("def broken(:\n") == []
+
+    def test_later_edits_do_not_rewrite_earlier_requests(self):
+        script = '''import requests
+
+def test_resend(api_base_url):
+    payload = {"name": "Ann"}
+    requests.post(f"{api_base_url}/users", json=payload)
+    payload["age"] = 17
+    payload.pop("name")
+    requests.post(f"{api_base_url}/users", json=payload)
+'''
+        first, second = extract_requests(script)
+
+        assert first.json_body == {'name': 'Ann'}
+        assert second.json_body == {'age': 17}
+
+    def test_main_request_details_list_every_call(self):
+        details = _extract_request_details_from_script(SCRIPT)
+
+        assert details['http_method'] == 'POST'
+        assert details['endpoint_path'] == '/users'
+        assert details['request_body']['address']['geo'] == {'lat': 59.9}
+        assert [request['http_method'] for request in details['requests']] == ['POST', 'PUT', 'POST']
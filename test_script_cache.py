@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest.mock as mock
+from constraint_model import APIConstraintModel, LearnedConstraint, ConstraintType
+from llm_cache import LLMResponseCache
+from scribe import generate_test_script, _plan_generation
+from main import run_learning_session
+from script_cache import script_fingerprint, get_cached_script
+
+SPEC = {
+    'openapi': '3.0.0',
+    'paths': {
+        '/users': {'post': {'summary': 'Create user', 'requestBody': {'content': {'application/json': {
+            'schema': {'type': 'object', 'properties': {'name': {'type': 'string'}}}
+        }}}}},
+        '/orders': {'get': {'summary': 'List orders'}}
+    }
+}
+
+SCRIPT = '''import requests
+import pytest
+
+def test_create_user(api_base_url):
+    response = requests.post(f"{api_base_url}/users", json={"name": "Ann"})
+    assert response.status_code == 201, response.text
+'''
+
+
+def _constraint(parameter, confidence=0.9):
+    return LearnedConstraint(
+        constraint_type=ConstraintType.REQUIRED_FIELD,
+        affected_parameter=parameter,
+        endpoint_path='/users',
+        rule_description=f"{parameter} is required",
+        formal_constraint={'required': True},
+        confidence_score=confidence
+    )
+
+
+class TestScriptCache:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = LLMResponseCache(cache_dir=self.temp_dir, enabled=True)
+        self.model = APIConstraintModel(SPEC)
+        self.model.upsert_constraint(_constraint('name'))
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_fingerprint_ignores_order_and_tracks_inputs(self):
+        base = script_fingerprint(SPEC, 'create a user', ['a', 'b'])
+
+        assert base == script_fingerprint(SPEC, 'create a user ', ['b', 'a'])
+        assert base != script_fingerprint(SPEC, 'create a user', ['a'])
+        assert base != script_fingerprint(SPEC, 'create an order', ['a', 'b'])
+        assert base != script_fingerprint({'paths': {}}, 'create a user', ['a', 'b'])
+
+    def test_unchanged_model_replays_without_llm(self):
+        with mock.patch('script_cache.script_cache', self.cache), \
+                mock.patch.dict(os.environ, {'GOOGLE_API_KEY': 'test-key'}), \
+                mock.patch('scribe.llm_call', return_value=f"```python\n{SCRIPT}```") as mock_llm:
+            first = generate_test_script(SPEC, 'create a user', self.model)
+
+            # A confidence change alone does not change the active rule set
+            constraint_id = next(iter(self.model.learned_constraints))
+            self.model.update_confidence(constraint_id, True)
+            second = generate_test_script(SPEC, 'create a user', self.model)
+
+            self.model.upsert_constraint(_constraint('username'))
+            third = generate_test_script(SPEC, 'create a user', self.model)
+
+        assert first['script'] == second['script'] == SCRIPT.strip()
+        assert second['completion_status'] == 'cached'
+        assert third['completion_status'] == 'complete'
+        assert mock_llm.call_count == 2
+
+    def test_failing_scripts_are_not_replayed(self):
+        """Every attempt after a failing run asks the model again, below llm_call's response cache"""
+        failed = {'success': False, 'output': None, 'output_file': None}
+        response_cache = LLMResponseCache(cache_dir=os.path.join(self.temp_dir, 'responses'), enabled=True)
+        with mock.patch('script_cache.script_cache', self.cache), \
+                mock.patch('llm_client.response_cache', response_cache), \
+                mock.patch.dict(os.environ, {'GOOGLE_API_KEY': 'test-key'}), \
+                mock.patch('llm_client.get_model'), \
+                mock.patch('llm_client._generate',
+                           return_value=mock.Mock(text=f"```python\n{SCRIPT}```")) as mock_generate, \
+                mock.patch('main.execute_test_script_with_error_handling', return_value=failed), \
+                mock.patch('main.interpret_failures_with_error_handling', return_value=[]):
+            # Generated scripts are written to the working directory
+            cwd = os.getcwd()
+            os.chdir(self.temp_dir)
+            try:
+                session = run_learning_session(SPEC, 'create a user', max_attempts=3, constraint_model=self.model)
+            finally:
+                os.chdir(cwd)
+
+            assert get_cached_script(_plan_generation(SPEC, 'create a user', self.model)['fingerprint']) is None
+
+        assert len(session.learning_attempts) == 3
+        assert mock_generate.call_count == 3
+        assert response_cache.hits == 0
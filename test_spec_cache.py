@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest.mock as mock
+import pytest
+import yaml
+from spec_cache import load_spec, spec_content_hash
+
+
+SPEC = """openapi: 3.0.0
+info:
+  title: Users API
+  version: 1.0.0
+paths:
+  /users:
+    post:
+      responses:
+        '201':
+          description: Created
+"""
+
+
+class TestSpecCache:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.spec_path = os.path.join(self.temp_dir, 'spec.yaml')
+        with open(self.spec_path, 'w') as f:
+            f.write(SPEC)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_second_load_skips_parsing(self):
+        """The pickled form written next to the YAML is reused"""
+        first = load_spec(self.spec_path, use_cache=True)
+
+        assert os.path.exists(self.spec_path + '.cache')
+        with mock.patch('spec_cache.parse_spec') as mock_parse:
+            second = load_spec(self.spec_path, use_cache=True)
+
+        assert mock_parse.call_count == 0
+        assert first == second
+        assert second['paths']['/users']['post']['responses']['201']['description'] == 'Created'
+
+    def test_touched_file_with_same_content_hits_by_hash(self):
+        load_spec(self.spec_path, use_cache=True)
+        stat = os.stat(self.spec_path)
+        os.utime(self.spec_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with mock.patch('spec_cache.parse_spec') as mock_parse:
+            load_spec(self.spec_path, use_cache=True)
+
+        assert mock_parse.call_count == 0
+
+    def test_edited_spec_is_reparsed(self):
+        load_spec(self.spec_path, use_cache=True)
+        with open(self.spec_path, 'w') as f:
+            f.write(SPEC.replace('Users API', 'Accounts API'))
+
+        assert load_spec(self.spec_path, use_cache=True)['info']['title'] == 'Accounts API'
+
+    def test_errors_match_direct_parsing(self):
+        with pytest.raises(FileNotFoundError):
+            load_spec(os.path.join(self.temp_dir, 'missing.yaml'), use_cache=True)
+
+        with open(self.spec_path, 'w') as f:
+            f.write("paths: [unclosed")
+        with pytest.raises(yaml.YAMLError):
+            load_spec(self.spec_path, use_cache=True)
+
+    def test_content_hash_ignores_formatting(self):
+        reformatted = yaml.safe_load(SPEC)
+        reformatted['info'] = dict(reversed(list(reformatted['info'].items())))
+
+        assert spec_content_hash(load_spec(self.spec_path, use_cache=False)) == spec_content_hash(reformatted)
+        reformatted['info']['version'] = '2.0.0'
+        assert spec_content_hash(load_spec(self.spec_path, use_cache=False)) != spec_content_hash(reformatted)
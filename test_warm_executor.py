@@ -0,0 +1,211 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest.mock as mock
+import pytest
+from executor import execute_test_script
+from warm_executor import WarmWorker, ExecutorPool, get_executor_pool, run_script_in_worker
+
+CONFTEST = '''import pytest
+
+@pytest.fixture
+def api_base_url():
+    return "http://api.test:8080"
+'''
+
+PASSING_SCRIPT = '''import pytest
+
+def test_base_url(api_base_url):
+    print("checking base url")
+    assert api_base_url.startswith("http")
+'''
+
+FAILING_SCRIPT = '''import pytest
+
+def test_create_user(api_base_url):
+    status_code = 400
+    assert status_code == 201, f'Expected 201, got {status_code}: {{"error": "name field is required"}}'
+
+def test_passes():
+    assert True
+'''
+
+HANGING_SCRIPT = '''import time
+
+def test_hangs():
+    time.sleep(60)
+'''
+
+EXITING_SCRIPT = '''import sys
+
+sys.exit(4)
+'''
+
+CONFTEST_URL_SCRIPT = '''def test_conftest_url(api_base_url):
+    assert api_base_url == "http://api.test:8080"
+'''
+
+COMPARISON_SCRIPT = '''def test_status(api_base_url):
+    status_code = 400
+    assert status_code == 201, f"Expected 201, got {status_code}"
+
+def test_length():
+    values = [1, 2]
+    assert len(values) == 3
+'''
+
+PARAMETRIZED_SCRIPT = '''import pytest
+
+@pytest.mark.parametrize("value", [1, 2])
+def test_values(value):
+    assert value > 0
+'''
+
+
+class TestWarmExecutor:
+    def setup_method(self):
+        """Create a scratch directory for generated scripts, with its own conftest"""
+        self.temp_dir = tempfile.mkdtemp()
+        self._write('conftest.py', CONFTEST)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, name, source):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        return path
+
+    def test_direct_run_reports_pass(self):
+        """Simple scripts run without pytest collection"""
+        result = run_script_in_worker(self._write('generated_test_1.py', PASSING_SCRIPT))
+
+        assert result['return_code'] == 0
+        assert 'generated_test_1.py::test_base_url PASSED' in result['stdout']
+
+    def test_direct_run_reports_failure_like_pytest(self):
+        """Failures expose the assertion message the interpreter parses"""
+        result = run_script_in_worker(self._write('generated_test_2.py', FAILING_SCRIPT))
+
+        assert result['return_code'] == 1
+        assert 'test_create_user FAILED' in result['stdout']
+        assert 'test_passes PASSED' in result['stdout']
+        assert 'AssertionError: Expected 201, got 400' in result['stdout']
+        assert '"error": "name field is required"' in result['stdout']
+
+    def test_syntax_error_is_collection_error(self):
+        result = run_script_in_worker(self._write('generated_test_3.py', 'def test_broken(:\n'), None)
+
+        assert result['return_code'] == 2
+        assert 'SyntaxError' in result['stdout']
+
+    def test_marked_tests_fall_back_to_pytest(self):
+        """Scripts using pytest marks are run through pytest.main"""
+        result = run_script_in_worker(self._write('generated_test_4.py', PARAMETRIZED_SCRIPT))
+
+        assert result['return_code'] == 0
+        assert '2 passed' in result['stdout']
+
+    def test_fixtures_come_from_the_scripts_conftest(self):
+        """api_base_url resolves as pytest would, nearer conftests overriding outer ones"""
+        result = run_script_in_worker(self._write('generated_test_5.py', CONFTEST_URL_SCRIPT))
+
+        assert result['return_code'] == 0
+        assert '(warm worker)' in result['stdout']
+
+        # A fixture with teardown cannot be called directly, so pytest runs the script
+        os.mkdir(os.path.join(self.temp_dir, 'nested'))
+        self._write(os.path.join('nested', 'conftest.py'), CONFTEST.replace('return', 'yield'))
+        result = run_script_in_worker(self._write(os.path.join('nested', 'generated_test_6.py'), CONFTEST_URL_SCRIPT))
+
+        assert result['return_code'] == 0
+        assert '(warm worker)' not in result['stdout']
+        assert '1 passed' in result['stdout']
+
+    def test_assertion_failures_read_as_under_pytest(self):
+        """The warm backend reports failed asserts with the same values as the subprocess backend"""
+        def failure_lines(text):
+            return [line for line in text.splitlines() if line.startswith('E   ')]
+
+        path = self._write('generated_test_compare.py', COMPARISON_SCRIPT)
+        expected = execute_test_script(path, backend='subprocess')['output'].read()
+        worker = WarmWorker(timeout=10)
+        try:
+            result = worker.run(path)
+        finally:
+            worker.close()
+
+        assert 'E   assert 400 == 201' in expected
+        assert failure_lines(result['stdout']) == failure_lines(expected)
+
+    def test_script_exit_is_reported_as_a_failure(self):
+        """sys.exit() in a script fails that script and leaves the worker serving"""
+        worker = WarmWorker(timeout=10)
+        try:
+            result = worker.run(self._write('generated_test_exit.py', EXITING_SCRIPT))
+            assert result['return_code'] == 3
+            assert 'SystemExit' in result['stderr']
+
+            assert worker.run(self._write('generated_test_next.py', PASSING_SCRIPT))['return_code'] == 0
+        finally:
+            worker.close()
+
+    def test_worker_reuse_and_timeout_restart(self):
+        """The worker survives many scripts and is replaced after a timeout"""
+        worker = WarmWorker(timeout=10)
+        try:
+            for i in range(3):
+                result = worker.run(self._write(f'generated_test_{i}.py', PASSING_SCRIPT))
+                assert result['return_code'] == 0
+
+            with pytest.raises(subprocess.TimeoutExpired):
+                worker.run(self._write('generated_test_hang.py', HANGING_SCRIPT), timeout=1)
+            assert not worker.is_alive()
+
+            result = worker.run(self._write('generated_test_after.py', PASSING_SCRIPT))
+            assert result['return_code'] == 0
+        finally:
+            worker.close()
+
+
+class TestExecutorPool:
+    def setup_method(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, 'conftest.py'), 'w', encoding='utf-8') as f:
+            f.write(CONFTEST)
+
+    def teardown_method(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pool_runs_paths_and_sources_concurrently(self):
+        """Futures come back for both script paths and raw source strings"""
+        pool = ExecutorPool(workers=2, timeout=10)
+        try:
+            path = os.path.join(self.temp_dir, 'generated_test_pool.py')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(PASSING_SCRIPT)
+
+            futures = [pool.submit(path), pool.submit(source=FAILING_SCRIPT), pool.submit(source=PARAMETRIZED_SCRIPT)]
+            results = [future.result(timeout=30) for future in futures]
+
+            assert [result['return_code'] for result in results] == [0, 1, 0]
+        finally:
+            pool.shutdown()
+
+    def test_shared_pool_follows_the_requested_size(self):
+        """A different worker count replaces the shared pool; no count reuses it"""
+        def fake_pool(workers, timeout):
+            return mock.Mock(size=workers or 3, timeout=timeout)
+
+        with mock.patch('warm_executor._default_pool', None), \
+                mock.patch('warm_executor.atexit'), \
+                mock.patch('warm_executor.ExecutorPool', side_effect=fake_pool):
+            first = get_executor_pool(workers=2, timeout=10)
+            assert get_executor_pool(workers=2, timeout=10) is first
+            assert get_executor_pool(timeout=20) is first and first.timeout == 20
+
+            second = get_executor_pool(workers=4, default_workers=2)
+            first.shutdown.assert_called_once_with()
+            assert second.size == 4 and get_executor_pool(default_workers=2) is second
@@ -0,0 +1,493 @@
+import ast
+import atexit
+import inspect
+import multiprocessing
+import os
+import subprocess
+import queue
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import types
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import redirect_stdout, redirect_stderr
+from typing import Dict, Any, Optional, List, Callable
+
+from execution_capture import CapturePlugin, RequestRecorder, encode_record
+from output_capture import BoundedCapture
+
+# Modules every generated script needs; importing them once per worker is the
+# whole point of keeping the worker warm.
+PRELOAD_MODULES = ['pytest', 'requests']
+
+
+class _UnsupportedScript(Exception):
+    """Raised when a script needs pytest features the direct runner does not emulate"""
+
+
+def _preload_modules():
+    """Import heavy dependencies once so every later script starts warm"""
+    for module_name in PRELOAD_MODULES:
+        try:
+            __import__(module_name)
+        except ImportError:
+            pass
+
+
+def _conftest_files(script_file: str) -> List[str]:
+    """conftest.py files pytest would load for the script, outermost first"""
+    directory = os.path.dirname(os.path.abspath(script_file))
+    found = []
+    while True:
+        candidate = os.path.join(directory, 'conftest.py')
+        if os.path.isfile(candidate):
+            found.append(candidate)
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return list(reversed(found))
+        directory = parent
+
+
+def _fixture_function(obj: Any) -> Optional[tuple]:
+    """(marker, plain function) for a pytest fixture object, None for anything else"""
+    marker = getattr(obj, '_fixture_function_marker', None) or getattr(obj, '_pytestfixturefunction', None)
+    if marker is None:
+        return None
+    if hasattr(obj, '_get_wrapped_function'):
+        return marker, obj._get_wrapped_function()
+    return marker, getattr(obj, '__wrapped__', obj)
+
+
+def _conftest_fixtures(script_file: str) -> Dict[str, Optional[Callable[[], Any]]]:
+    """
+    Fixtures the script's conftest.py files provide, nearer files overriding
+    outer ones as in pytest. Fixtures the direct runner cannot emulate (with
+    arguments, params or teardown) map to None so tests using them fall back
+    to pytest; hooks and autouse fixtures make the whole script fall back.
+    """
+    fixtures: Dict[str, Optional[Callable[[], Any]]] = {}
+    for conftest_file in _conftest_files(script_file):
+        module = types.ModuleType('conftest')
+        module.__file__ = conftest_file
+        try:
+            with open(conftest_file, 'r', encoding='utf-8') as f:
+                exec(compile(f.read(), conftest_file, 'exec'), module.__dict__)
+        except Exception as e:
+            raise _UnsupportedScript(f"conftest {conftest_file} failed to load: {e}")
+
+        for name, obj in vars(module).items():
+            if name.startswith('pytest_') and callable(obj):
+                raise _UnsupportedScript(f"conftest hook {name}")
+            definition = _fixture_function(obj)
+            if definition is None:
+                continue
+            marker, func = definition
+            if getattr(marker, 'autouse', False):
+                raise _UnsupportedScript(f"autouse fixture {name}")
+            simple = (not getattr(marker, 'params', None)
+                      and not inspect.signature(func).parameters
+                      and not inspect.isgeneratorfunction(func))
+            fixtures[getattr(marker, 'name', None) or name] = func if simple else None
+    return fixtures
+
+
+def _collect_tests(module: types.ModuleType, fixtures: Dict[str, Optional[Callable[[], Any]]]) -> List[tuple]:
+    """Collect test_* functions, refusing anything that needs real pytest collection"""
+    tests = []
+    for name, obj in list(vars(module).items()):
+        if name.startswith('Test') and inspect.isclass(obj):
+            raise _UnsupportedScript(f"test class {name}")
+        if not name.startswith('test') or not inspect.isfunction(obj):
+            continue
+        if obj.__module__ != module.__name__:
+            continue
+        if getattr(obj, 'pytestmark', None):
+            raise _UnsupportedScript(f"marked test {name}")
+        params = list(inspect.signature(obj).parameters)
+        missing = [param for param in params if fixtures.get(param) is None]
+        if missing:
+            raise _UnsupportedScript(f"unknown fixtures {missing} in {name}")
+        tests.append((name, obj, params))
+    return tests
+
+
+def _compile_script(source: str, script_file: str) -> types.CodeType:
+    """
+    Compile a script with pytest's assertion rewriting, so a failed assert
+    reports its values ("assert 400 == 201") exactly as under pytest.main
+    """
+    tree = ast.parse(source, filename=script_file)
+    try:
+        from _pytest.assertion.rewrite import rewrite_asserts
+    except ImportError:
+        return compile(tree, script_file, 'exec')
+    rewrite_asserts(tree, source.encode('utf-8'), script_file)
+    return compile(tree, script_file, 'exec')
+
+
+def _exception_text(error: BaseException) -> str:
+    """The failure text pytest shows after "E   ", bare "assert ..." explanations included"""
+    text = ''.join(traceback.format_exception_only(type(error), error)).strip()
+    prefix = 'AssertionError: '
+    if isinstance(error, AssertionError) and text.startswith(prefix + 'assert '):
+        return text[len(prefix):]
+    return text or type(error).__name__
+
+
+def _run_tests_directly(source: str, script_file: str) -> Dict[str, Any]:
+    """Compile the script once and call its test functions with pytest-like reporting"""
+    import pytest
+
+    script_name = os.path.basename(script_file)
+    module_name = os.path.splitext(script_name)[0]
+    start_time = time.time()
+
+    try:
+        code = _compile_script(source, script_file)
+    except SyntaxError as e:
+        return {
+            'return_code': 2,
+            'stdout': f"ERROR collecting {script_name}\nE   SyntaxError: {e}\n",
+            'stderr': ''
+        }
+
+    module = types.ModuleType(module_name)
+    module.__file__ = os.path.abspath(script_file)
+    fixtures = _conftest_fixtures(script_file)
+
+    import_output = BoundedCapture()
+    try:
+        with redirect_stdout(import_output), redirect_stderr(import_output):
+            exec(code, module.__dict__)
+    except Exception:
+        return {
+            'return_code': 2,
+            'stdout': f"ERROR collecting {script_name}\n{traceback.format_exc()}{import_output.getvalue()}",
+            'stderr': ''
+        }
+
+    tests = _collect_tests(module, fixtures)
+
+    lines = [
+        "=== test session starts (warm worker) ===",
+        f"collected {len(tests)} items",
+        ""
+    ]
+    failures = []
+    summary = {'passed': 0, 'failed': 0, 'skipped': 0}
+
+    recorder = RequestRecorder()
+    with recorder:
+        for name, test_func, params in tests:
+            captured = BoundedCapture()
+            outcome = 'PASSED'
+            exception_line = None
+            recorder.current_test = name
+            test_start = time.perf_counter()
+            try:
+                kwargs = {param: fixtures[param]() for param in params}
+                with redirect_stdout(captured), redirect_stderr(captured):
+                    test_func(**kwargs)
+            except pytest.skip.Exception:
+                outcome = 'SKIPPED'
+            except (Exception, pytest.fail.Exception) as e:
+                outcome = 'FAILED'
+                tb_lines = traceback.format_exception(type(e), e, e.__traceback__)
+                # Drop the runner's own frame, as pytest's --tb=short would
+                failure_text = ''.join(tb_lines[:1] + tb_lines[2:-1])
+                exception_line = _exception_text(e)
+                failures.append((name, failure_text, exception_line, captured.getvalue()))
+
+            summary[outcome.lower()] += 1
+            lines.append(f"{script_name}::{name} {outcome}")
+            recorder.add_outcome(name, outcome.lower(), exception_line,
+                                 (time.perf_counter() - test_start) * 1000)
+
+    if failures:
+        lines.extend(["", "=== FAILURES ==="])
+        for name, failure_text, exception_line, output in failures:
+            lines.append(f"___ {name} ___")
+            lines.append(failure_text.rstrip())
+            lines.extend(f"E   {line}" for line in exception_line.splitlines())
+            if output:
+                lines.append("--- Captured stdout call ---")
+                lines.append(output.rstrip())
+        lines.extend(["", "=== short test summary info ==="])
+        for name, _, exception_line, _ in failures:
+            lines.append(f"FAILED {script_name}::{name} - {exception_line.splitlines()[0]}")
+
+    counts = ', '.join(f"{count} {label}" for label, count in summary.items() if count)
+    lines.append(f"=== {counts or 'no tests ran'} in {time.time() - start_time:.2f}s ===")
+    lines.append(encode_record(recorder.record))
+
+    if not tests:
+        return_code = 5
+    else:
+        return_code = 1 if summary['failed'] else 0
+
+    return {
+        'return_code': return_code,
+        'stdout': '\n'.join(lines) + '\n' + import_output.getvalue(),
+        'stderr': ''
+    }
+
+
+def _run_with_pytest(script_file: str) -> Dict[str, Any]:
+    """Run the script through pytest.main inside the already-warm worker"""
+    import pytest
+
+    stdout = BoundedCapture()
+    stderr = BoundedCapture()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        return_code = pytest.main([script_file, '-v', '--tb=short', '-p', 'no:cacheprovider'],
+                                  plugins=[CapturePlugin()])
+
+    return {
+        'return_code': int(return_code),
+        'stdout': stdout.getvalue(),
+        'stderr': stderr.getvalue()
+    }
+
+
+def run_script_in_worker(script_file: str, source: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Execute one generated script inside the current (worker) process.
+
+    Project-local modules imported by the script (conftest, the test module
+    itself) are dropped afterwards so consecutive scripts do not see each
+    other's state; library modules stay loaded to keep the worker warm.
+    """
+    modules_before = set(sys.modules)
+    cwd_before = os.getcwd()
+    local_root = os.path.abspath(cwd_before)
+    try:
+        if source is None:
+            with open(script_file, 'r', encoding='utf-8') as f:
+                source = f.read()
+        try:
+            return _run_tests_directly(source, script_file)
+        except _UnsupportedScript:
+            if os.path.exists(script_file):
+                return _run_with_pytest(script_file)
+            # Source-only job: pytest needs a real file to collect
+            with tempfile.TemporaryDirectory() as temp_dir:
+                temp_script = os.path.join(temp_dir, os.path.basename(script_file))
+                with open(temp_script, 'w', encoding='utf-8') as f:
+                    f.write(source)
+                return _run_with_pytest(temp_script)
+    finally:
+        for module_name in set(sys.modules) - modules_before:
+            module_file = getattr(sys.modules[module_name], '__file__', None) or ''
+            if module_file and os.path.abspath(module_file).startswith(local_root) and 'site-packages' not in module_file:
+                sys.modules.pop(module_name, None)
+        os.chdir(cwd_before)
+
+
+def _worker_main(conn, working_dir: str):
+    """Worker loop: receive jobs over the pipe until told to stop"""
+    os.chdir(working_dir)
+    if working_dir not in sys.path:
+        sys.path.insert(0, working_dir)
+    _preload_modules()
+    conn.send({'ready': True})
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if job is None:
+            break
+        try:
+            result = run_script_in_worker(job['script_file'], job.get('source'))
+        except KeyboardInterrupt:
+            raise
+        except BaseException as e:
+            # sys.exit() or similar in a script is that script's failure, not the worker's end
+            result = {'return_code': 3, 'stdout': '', 'stderr': f"Worker error: {type(e).__name__}: {e}"}
+        conn.send(result)
+
+
+class _WorkerJobCounter:
+    """Hands out unique script names for source-only jobs"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next = 0
+
+    def next_name(self) -> str:
+        with self._lock:
+            self._next += 1
+            return f"generated_test_pool_{self._next}.py"
+
+
+class WarmWorker:
+    """A long-lived process that has already imported pytest and requests"""
+
+    def __init__(self, timeout: int = 30, working_dir: Optional[str] = None):
+        self.timeout = timeout
+        self.working_dir = working_dir or os.getcwd()
+        self._context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the worker process and wait until its imports are done"""
+        parent_conn, child_conn = self._context.Pipe()
+        self._process = self._context.Process(
+            target=_worker_main, args=(child_conn, self.working_dir), daemon=True
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._conn.recv()
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def run(self, script_file: str, source: Optional[str] = None, timeout: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run a script in the worker and return return_code, stdout and stderr.
+
+        A hung script is handled like a hung subprocess: the worker is killed,
+        subprocess.TimeoutExpired is raised and a fresh worker starts on next use.
+        """
+        timeout = timeout or self.timeout
+        with self._lock:
+            if not self.is_alive():
+                self.start()
+            self._conn.send({'script_file': script_file, 'source': source})
+
+            if not self._conn.poll(timeout):
+                self._kill()
+                raise subprocess.TimeoutExpired(['warm-worker', script_file], timeout)
+
+            try:
+                return self._conn.recv()
+            except EOFError:
+                self._kill()
+                raise RuntimeError("Warm worker exited unexpectedly")
+
+    def _kill(self):
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def close(self):
+        """Ask the worker to exit, killing it if it does not"""
+        with self._lock:
+            if self.is_alive():
+                try:
+                    self._conn.send(None)
+                    self._process.join(timeout=5)
+                except (OSError, EOFError):
+                    pass
+            self._kill()
+
+
+_default_worker: Optional[WarmWorker] = None
+_default_worker_lock = threading.Lock()
+
+
+def get_warm_worker(timeout: int = 30) -> WarmWorker:
+    """Return the process-wide warm worker, creating it on first use"""
+    global _default_worker
+    with _default_worker_lock:
+        if _default_worker is None:
+            _default_worker = WarmWorker(timeout=timeout)
+            atexit.register(_default_worker.close)
+        return _default_worker
+
+
+def _pool_size(workers: Optional[int]) -> int:
+    return max(1, workers or os.cpu_count() or 1)
+
+
+class ExecutorPool:
+    """
+    A fixed set of pre-started warm workers fed from a shared queue.
+
+    submit() accepts a script path or a source string and returns a Future
+    resolving to the worker result (return_code, stdout, stderr), so a batch
+    of generated scripts runs across all workers at once.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: int = 30):
+        self.size = _pool_size(workers)
+        self.timeout = timeout
+        self._workers = [WarmWorker(timeout=timeout) for _ in range(self.size)]
+        self._idle: "queue.Queue[WarmWorker]" = queue.Queue()
+        self._names = _WorkerJobCounter()
+        self._dispatcher = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix='warm-executor')
+
+        # Start every worker concurrently; each one blocks until its imports finish
+        list(self._dispatcher.map(lambda worker: worker.start(), self._workers))
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    def run(self, script_file: Optional[str] = None, source: Optional[str] = None,
+            timeout: Optional[int] = None) -> Dict[str, Any]:
+        """Run one script on the next idle worker, blocking until it finishes"""
+        if script_file is None:
+            if source is None:
+                raise ValueError("Either script_file or source is required")
+            script_file = self._names.next_name()
+
+        worker = self._idle.get()
+        try:
+            return worker.run(script_file, source=source, timeout=timeout or self.timeout)
+        finally:
+            self._idle.put(worker)
+
+    def submit(self, script_file: Optional[str] = None, source: Optional[str] = None,
+               timeout: Optional[int] = None) -> Future:
+        """Queue a script for execution and return a Future for its result"""
+        return self._dispatcher.submit(self.run, script_file, source, timeout)
+
+    def map(self, script_files: List[str], timeout: Optional[int] = None) -> List[Future]:
+        """Submit several script paths at once, preserving their order"""
+        return [self.submit(script_file, timeout=timeout) for script_file in script_files]
+
+    def shutdown(self):
+        """Stop accepting work and close every worker"""
+        self._dispatcher.shutdown(wait=True)
+        for worker in self._workers:
+            worker.close()
+
+
+_default_pool: Optional[ExecutorPool] = None
+
+
+def get_executor_pool(workers: Optional[int] = None, timeout: int = 30,
+                      default_workers: Optional[int] = None) -> ExecutorPool:
+    """
+    Return the process-wide executor pool, creating it on first use.
+
+    Asking for a different number of workers replaces the pool once the old
+    one has finished its queued scripts; workers=None takes the current pool
+    whatever its size, or starts default_workers when there is none yet. A
+    different timeout applies to the running pool from its next script on.
+    """
+    global _default_pool
+    with _default_worker_lock:
+        previous = _default_pool
+        if previous is not None and workers is not None and _pool_size(workers) != previous.size:
+            _default_pool = None
+        if _default_pool is None:
+            _default_pool = ExecutorPool(workers=workers or default_workers, timeout=timeout)
+            atexit.register(_default_pool.shutdown)
+        else:
+            _default_pool.timeout = timeout
+        pool = _default_pool
+
+    if previous is not None and previous is not pool:
+        atexit.unregister(previous.shutdown)
+        previous.shutdown()
+    return pool